@@ -0,0 +1,278 @@
+"""
+Local stand-in for the Open-Meteo archive API, for load and integration tests without upstream.
+
+Answers `GET /v1/archive` in the flatbuffers format `openmeteo_requests` and
+`AsyncOpenMeteoAdapter` parse: one size-prefixed `WeatherApiResponse` per requested location.
+Hourly series are synthetic but deterministic, a function of grid cell, variable and hour only,
+so any window split returns the same values. Latency, upstream errors and rate limiting (429)
+are injected as configured; random draws are seeded.
+
+Usage (from `backend/`):
+    python -m benchmarks.fake_open_meteo --port 8099 [--latency 0.2] [--error-rate 0.01] \\
+        [--rate-limit-rate 0.01] [--calls-per-minute 600]
+    OPEN_METEO_URL=http://127.0.0.1:8099/v1/archive gunicorn ...
+
+Needs no database or redis, only the application's dependencies.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+
+import flatbuffers
+import numpy as np
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from openmeteo_sdk.Model import Model
+from openmeteo_sdk.Unit import Unit
+from openmeteo_sdk.Variable import Variable
+
+from src.domain.entities.weather import WeatherCoordinate
+from src.domain.services.grid import archive_grid
+
+
+HOUR = 3600
+
+# vtable slots of the tables in openmeteo_sdk's schema, see WeatherApiResponse.py and friends
+RESPONSE_FIELDS = 15
+RESPONSE_LATITUDE, RESPONSE_LONGITUDE, RESPONSE_ELEVATION, RESPONSE_GENERATION_TIME = 0, 1, 2, 3
+RESPONSE_MODEL, RESPONSE_UTC_OFFSET, RESPONSE_TIMEZONE, RESPONSE_TIMEZONE_ABBREVIATION = 5, 6, 7, 8
+RESPONSE_HOURLY = 11
+TIME_FIELDS = 4
+TIME_START, TIME_END, TIME_INTERVAL, TIME_VARIABLES = 0, 1, 2, 3
+VALUES_FIELDS = 13
+VALUES_VARIABLE, VALUES_UNIT, VALUES_VALUES, VALUES_ALTITUDE = 0, 1, 3, 5
+
+
+def _noise(hours: np.ndarray, cell: WeatherCoordinate, salt: float) -> np.ndarray:
+    """Deterministic noise in [-1, 1) per hour and cell."""
+    phase = hours * 12.9898 + cell.latitude * 78.233 + cell.longitude * 37.719 + salt
+    return 2 * (np.sin(phase) * 43758.5453 % 1.0) - 1
+
+
+def _temperature(hours: np.ndarray, cell: WeatherCoordinate) -> np.ndarray:
+    day_of_year = hours / 24 % 365.25
+    season = -np.cos(2 * np.pi * (day_of_year - 15) / 365.25) * np.sign(cell.latitude or 1)
+    solar_hour = (hours % 24 + cell.longitude / 15) % 24
+    day = np.sin(2 * np.pi * (solar_hour - 9) / 24)
+    mean = 27 - 0.45 * abs(cell.latitude)
+    return mean + 0.25 * abs(cell.latitude) * season + 4 * day + 1.5 * _noise(hours, cell, 0.0)
+
+
+def _relative_humidity(hours: np.ndarray, cell: WeatherCoordinate) -> np.ndarray:
+    return np.clip(
+        70 - 2 * (_temperature(hours, cell) - 10) + 10 * _noise(hours, cell, 1.0), 5, 100
+    )
+
+
+def _precipitation(hours: np.ndarray, cell: WeatherCoordinate) -> np.ndarray:
+    return np.maximum(_noise(hours, cell, 2.0) - 0.8, 0) * 10
+
+
+def _wind_speed(hours: np.ndarray, cell: WeatherCoordinate) -> np.ndarray:
+    return 12 + 8 * _noise(hours, cell, 3.0)
+
+
+@dataclass(frozen=True)
+class SyntheticVariable:
+    variable: int
+    unit: int
+    generate: Callable[[np.ndarray, WeatherCoordinate], np.ndarray]
+    altitude: int = 0
+
+
+VARIABLES = {
+    "temperature_2m": SyntheticVariable(Variable.temperature, Unit.celsius, _temperature, 2),
+    "relative_humidity_2m": SyntheticVariable(
+        Variable.relative_humidity, Unit.percentage, _relative_humidity, 2
+    ),
+    "precipitation": SyntheticVariable(Variable.precipitation, Unit.millimetre, _precipitation),
+    "wind_speed_10m": SyntheticVariable(
+        Variable.wind_speed, Unit.kilometres_per_hour, _wind_speed, 10
+    ),
+}
+
+
+def hourly_values(name: str, cell: WeatherCoordinate, start: date, end: date) -> np.ndarray:
+    """The series served for `name` from start through end, whole days in UTC."""
+    first = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+    hours = np.arange(
+        first // HOUR, first // HOUR + ((end - start).days + 1) * 24, dtype=np.float64
+    )
+    return VARIABLES[name].generate(hours, cell).astype(np.float32)
+
+
+def encode_location(cell: WeatherCoordinate, start: date, end: date, names: list[str]) -> bytes:
+    """One size-prefixed WeatherApiResponse with the hourly series of `names`."""
+    started = time.perf_counter()
+    builder = flatbuffers.Builder(1024 + 4 * 24 * ((end - start).days + 1) * len(names))
+
+    variables = []
+    for name in names:
+        synthetic = VARIABLES[name]
+        values = builder.CreateNumpyVector(hourly_values(name, cell, start, end))
+        builder.StartObject(VALUES_FIELDS)
+        builder.PrependUint8Slot(VALUES_VARIABLE, synthetic.variable, 0)
+        builder.PrependUint8Slot(VALUES_UNIT, synthetic.unit, 0)
+        builder.PrependUOffsetTRelativeSlot(VALUES_VALUES, values, 0)
+        builder.PrependInt16Slot(VALUES_ALTITUDE, synthetic.altitude, 0)
+        variables.append(builder.EndObject())
+
+    builder.StartVector(4, len(variables), 4)
+    for variable in reversed(variables):
+        builder.PrependUOffsetTRelative(variable)
+    variables_vector = builder.EndVector()
+
+    first = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+    builder.StartObject(TIME_FIELDS)
+    builder.PrependInt64Slot(TIME_START, first, 0)
+    builder.PrependInt64Slot(TIME_END, first + ((end - start).days + 1) * 24 * HOUR, 0)
+    builder.PrependInt32Slot(TIME_INTERVAL, HOUR, 0)
+    builder.PrependUOffsetTRelativeSlot(TIME_VARIABLES, variables_vector, 0)
+    hourly = builder.EndObject()
+
+    timezone_name = builder.CreateString("GMT")
+    timezone_abbreviation = builder.CreateString("GMT")
+    builder.StartObject(RESPONSE_FIELDS)
+    builder.PrependFloat32Slot(RESPONSE_LATITUDE, cell.latitude, 0.0)
+    builder.PrependFloat32Slot(RESPONSE_LONGITUDE, cell.longitude, 0.0)
+    builder.PrependFloat32Slot(RESPONSE_ELEVATION, 0.0, 0.0)
+    builder.PrependFloat32Slot(
+        RESPONSE_GENERATION_TIME, (time.perf_counter() - started) * 1000, 0.0
+    )
+    builder.PrependUint8Slot(RESPONSE_MODEL, Model.era5_land, 0)
+    builder.PrependInt32Slot(RESPONSE_UTC_OFFSET, 0, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_TIMEZONE, timezone_name, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_TIMEZONE_ABBREVIATION, timezone_abbreviation, 0)
+    builder.PrependUOffsetTRelativeSlot(RESPONSE_HOURLY, hourly, 0)
+    builder.FinishSizePrefixed(builder.EndObject())
+    return bytes(builder.Output())
+
+
+@dataclass(frozen=True)
+class FakeArchiveConfig:
+    """
+    `latency` (+ up to `jitter`) seconds per response; `error_rate` of the calls fail with 502,
+    `rate_limit_rate` with 429. With `calls_per_minute` calls beyond that weighted count per
+    minute get 429 as well. `retry_after` adds the header to 429 responses.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    calls_per_minute: Optional[float] = None
+    retry_after: Optional[int] = None
+    seed: int = 0
+
+
+class _MinuteWindow:
+    """Weighted calls per calendar minute; only touched from the event loop."""
+
+    def __init__(self) -> None:
+        self._minute = 0
+        self._used = 0.0
+
+    def take(self, cost: float, limit: float) -> bool:
+        minute = int(time.time() // 60)
+        if minute != self._minute:
+            self._minute, self._used = minute, 0.0
+        if self._used + cost > limit:
+            return False
+        self._used += cost
+        return True
+
+
+def _error(status: int, reason: str, headers: Optional[dict[str, str]] = None) -> Response:
+    return JSONResponse({"error": True, "reason": reason}, status_code=status, headers=headers)
+
+
+def create_app(config: FakeArchiveConfig = FakeArchiveConfig()) -> FastAPI:
+    app = FastAPI(title="fake open-meteo archive")
+    draws = random.Random(config.seed)
+    window = _MinuteWindow()
+    app.state.calls = 0
+
+    @app.get("/v1/archive")
+    async def archive(request: Request) -> Response:
+        app.state.calls += 1
+        query = request.query_params
+        names = [name for value in query.getlist("hourly") for name in value.split(",") if name]
+        try:
+            latitudes = [float(value) for value in query["latitude"].split(",")]
+            longitudes = [float(value) for value in query["longitude"].split(",")]
+            start = date.fromisoformat(query["start_date"])
+            end = date.fromisoformat(query["end_date"])
+        except (KeyError, ValueError) as exc:
+            return _error(400, f"Invalid parameters: {exc}")
+        if len(latitudes) != len(longitudes):
+            return _error(
+                400, "Parameter 'latitude' and 'longitude' must have the same number of elements"
+            )
+        if end < start:
+            return _error(400, "Parameter 'start_date' must be before 'end_date'")
+        if unknown := [name for name in names if name not in VARIABLES]:
+            return _error(
+                400, f"Cannot initialize WeatherVariable from invalid String value {unknown[0]}"
+            )
+        if query.get("format") != "flatbuffers":
+            return _error(400, "The fake archive only serves format=flatbuffers")
+
+        # counted like upstream does, see OpenMeteoAdapter._cost
+        days = (end - start).days + 1
+        cost = len(latitudes) * max(1.0, days / 14) * max(1.0, len(names) / 10)
+        if draws.random() < config.rate_limit_rate or (
+            config.calls_per_minute is not None and not window.take(cost, config.calls_per_minute)
+        ):
+            headers = {"Retry-After": str(config.retry_after)} if config.retry_after else None
+            return _error(
+                429, "Minutely API request limit exceeded. Please try again in one minute.", headers
+            )
+        if config.latency or config.jitter:
+            await asyncio.sleep(config.latency + draws.random() * config.jitter)
+        if draws.random() < config.error_rate:
+            return _error(502, "Injected upstream error")
+
+        cells = [
+            archive_grid.snap(WeatherCoordinate(latitude=latitude, longitude=longitude))
+            for latitude, longitude in zip(latitudes, longitudes, strict=True)
+        ]
+        body = b"".join(encode_location(cell, start, end, names) for cell in cells)
+        return Response(body, media_type="application/octet-stream")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--calls-per-minute", type=float, default=None)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeArchiveConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        calls_per_minute=args.calls_per_minute,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
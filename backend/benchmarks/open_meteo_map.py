@@ -0,0 +1,104 @@
+"""
+Benchmark the Open-Meteo response -> WeatherData mapping.
+
+Compares the previous `iterrows()` based mapping with the vectorized path of
+`OpenMeteoAdapter` on synthetic hourly series, encoded as the archive API would answer by
+`benchmarks.fake_open_meteo`.
+
+Usage (from `backend/`):
+    python -m benchmarks.open_meteo_map [--years 1 10 50] [--repeat 3]
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+import pandas as pd
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from benchmarks.fake_open_meteo import encode_location
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherDataPoint,
+    WeatherQueryOptions,
+)
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+from src.infrastructure.services.open_meteo import OpenMeteoAdapter
+
+
+DAYS_PER_YEAR = 365
+
+
+def legacy_get(location: WeatherApiResponse, options: WeatherQueryOptions) -> WeatherData:
+    """Mapping as it was before vectorization: date_range frame walked with iterrows()."""
+    hourly = location.Hourly()
+    frame = pd.DataFrame(
+        data={
+            "date": pd.date_range(
+                start=pd.to_datetime(hourly.Time(), unit="s"),
+                end=pd.to_datetime(hourly.TimeEnd(), unit="s"),
+                freq=pd.Timedelta(seconds=hourly.Interval()),
+                inclusive="left",
+            ),
+            "temperature_2m": hourly.Variables(0).ValuesAsNumpy(),
+        }
+    )
+    return WeatherData(
+        coordinate=options.coordinate,
+        data=[
+            WeatherDataPoint(temperature=row["temperature_2m"], timestamp=row["date"])
+            for _, row in frame.iterrows()
+        ],
+    )
+
+
+def vectorized_get(location: WeatherApiResponse, options: WeatherQueryOptions) -> WeatherData:
+    return OpenMeteoAdapter.map(OpenMeteoAdapter._to_frame(location), options)
+
+
+def best_of(
+    repeat: int,
+    func: Callable[[WeatherApiResponse, WeatherQueryOptions], WeatherData],
+    location: WeatherApiResponse,
+    options: WeatherQueryOptions,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(location, options)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=52.52, longitude=13.41),
+        start=date(1970, 1, 1),
+        end=date(1970, 1, 1),
+    )
+    print(f"{'years':>5} {'points':>9} {'iterrows [s]':>13} {'vectorized [s]':>15} {'speedup':>8}")
+    for years in args.years:
+        end = options.start + timedelta(days=years * DAYS_PER_YEAR - 1)
+        content = encode_location(options.coordinate, options.start, end, ["temperature_2m"])
+        location = AsyncOpenMeteoAdapter._parse(content)[0]
+        points = location.Hourly().Variables(0).ValuesLength()
+
+        legacy = best_of(args.repeat, legacy_get, location, options)
+        vectorized = best_of(args.repeat, vectorized_get, location, options)
+        print(
+            f"{years:>5} {points:>9} {legacy:>13.3f} {vectorized:>15.3f} "
+            f"{legacy / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
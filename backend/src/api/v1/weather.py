@@ -1,22 +1,46 @@
 import datetime
 import logging
-from typing import Optional
+import math
+from dataclasses import asdict
+from typing import Any, Literal, Optional, Sequence
 
-from fastapi import APIRouter, Depends, Path, Query
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import JSONResponse, Response
 
-from src.application.services.weather_service import WeatherService
-from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
-from src.infrastructure.di.weather_container import weather_service
-from src.models.weather import WeatherDataPoint, WeatherResponse
+from src.application.services.weather_service import AsyncWeatherService
+from src.core.exceptions import UpstreamBudgetExhausted
+from src.domain.entities.weather import (
+    DAILY_VARIABLES,
+    DEFAULT_VARIABLES,
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.domain.services.grid import archive_grid
+from src.infrastructure.di.weather_container import async_weather_service
+from src.models.weather import WeatherResponse
 
 
 router = APIRouter()
 
+# WEATHER_VARIABLES and DAILY_VARIABLES, spelled out for the OpenAPI schema
+HourlyVariable = Literal["temperature", "relative_humidity", "precipitation", "wind_speed"]
+DailyVariable = Literal[
+    "temperature_max",
+    "temperature_min",
+    "temperature_mean",
+    "relative_humidity_mean",
+    "precipitation_sum",
+    "wind_speed_max",
+]
+
 logger = logging.getLogger(__name__)
 
 
-@router.get("/weather/{lat}/{lon}", tags=["weather"])
-def weather(
+@router.get("/weather/{lat}/{lon}", tags=["weather"], response_model=WeatherResponse)
+async def weather(
     lat: float = Path(..., ge=-90, le=90, description="Latitude"),
     lon: float = Path(..., ge=-180, le=180, description="Longitude"),
     start: Optional[datetime.datetime] = Query(
@@ -25,20 +49,63 @@ def weather(
     end: Optional[datetime.datetime] = Query(
         datetime.date(2020, 1, 2), description="End date (YYYY-MM-DD)"
     ),
-    service: WeatherService = Depends(weather_service),
-) -> WeatherResponse:
+    variables: list[HourlyVariable] = Query(
+        list(DEFAULT_VARIABLES), description="Hourly variables, fetched together"
+    ),
+    daily: list[DailyVariable] = Query(
+        [], description="Daily aggregates per UTC day, computed from the hourly variables"
+    ),
+    service: AsyncWeatherService = Depends(async_weather_service),
+) -> Response:
     # TODO: Naming, in = query, out = response
+    # daily aggregates need their hourly source, fetched and cached alongside the rest
+    sources = [DAILY_VARIABLES[name][0] for name in daily]
     options = WeatherQueryOptions(
         coordinate=WeatherCoordinate(latitude=lat, longitude=lon),
         start=start,
         end=end,
+        variables=tuple(dict.fromkeys([*variables, *sources])),
     )
-    weather_data = service.weather_for_location(options)
+    try:
+        weather_data = await service.weather_for_location(options)
+    except UpstreamBudgetExhausted as exc:
+        # not the caller's rate limit but ours towards upstream: unavailable for now
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        ) from exc
     logger.debug(f"weather_data: {weather_data}")
-    return WeatherResponse(
-        coordinate=options.coordinate,
-        data=[
-            WeatherDataPoint(timestamp=data.timestamp, temperature=data.temperature)
-            for data in weather_data.data
-        ],
-    )
+    return JSONResponse(to_response(weather_data, variables, daily, options.coordinate))
+
+
+def _records(series: WeatherSeries) -> list[dict[str, Any]]:
+    """Rows of the series; NaN, upstream's missing value, becomes null."""
+    columns = {"timestamp": np.datetime_as_string(series.timestamps, unit="s").tolist()}
+    for name, column in series.values.items():
+        values = column.astype(object)
+        values[np.isnan(column)] = None
+        columns[name] = values.tolist()
+    return [dict(zip(columns, row, strict=True)) for row in zip(*columns.values(), strict=True)]
+
+
+def to_response(
+    weather_data: WeatherData,
+    variables: Sequence[str] = DEFAULT_VARIABLES,
+    daily: Sequence[str] = (),
+    coordinate: Optional[WeatherCoordinate] = None,
+) -> dict[str, Any]:
+    """
+    Serialize the columnar series straight to the WeatherResponse JSON shape. `coordinate` is
+    the requested one, the data is that of the grid cell containing it.
+    """
+    series = weather_data.series
+    coordinate = coordinate or weather_data.coordinate
+    response = {
+        "coordinate": asdict(coordinate),
+        "grid_coordinate": asdict(archive_grid.snap(coordinate)),
+        "data": _records(series.select(variables)),
+    }
+    if daily:
+        response["daily"] = _records(series.daily(daily))
+    return response
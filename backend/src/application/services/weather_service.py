@@ -1,13 +1,43 @@
-from src.domain.entities.weather import WeatherData, WeatherQueryOptions
-from src.domain.ports.weather_api_port import WeatherApiPort
-from src.domain.ports.weather_command_port import WeatherCommandPort
-from src.domain.ports.weather_query_port import WeatherQueryPort
+import asyncio
+from typing import Optional
+
+from src.domain.entities.weather import WeatherData, WeatherQueryOptions, WeatherSeries
+from src.domain.ports.single_flight_port import AsyncSingleFlightPort, SingleFlightPort
+from src.domain.ports.weather_api_port import AsyncWeatherApiPort, WeatherApiPort
+from src.domain.ports.weather_command_port import (
+    AsyncWeatherCommandPort,
+    WeatherCommandPort,
+)
+from src.domain.ports.weather_query_port import AsyncWeatherQueryPort, WeatherQueryPort
+from src.domain.services.grid import archive_grid
+
+
+def _owners(missing: list[list[WeatherQueryOptions]]) -> list[int]:
+    """Index of the requested option each missing range belongs to, in flattened order."""
+    return [index for index, ranges in enumerate(missing) for _ in ranges]
+
+
+def _flight_key(options: WeatherQueryOptions) -> str:
+    variables = ",".join(options.variables)
+    return f"{archive_grid.key(options.coordinate)}:{options.start}:{options.end}:{variables}"
+
+
+def _merge(cached: WeatherData, fetched: list[WeatherData]) -> WeatherData:
+    return WeatherData(
+        coordinate=cached.coordinate,
+        series=WeatherSeries.overlay([cached.series, *(part.series for part in fetched)]),
+    )
 
 
 class WeatherService:
     """
 
     Manager, pulling it all together
+    Requests are normalized to their upstream grid cell and whole days first, so every tier
+    sees the same keys. Only days and variables missing from the cache go upstream; they are
+    overlaid on the cached ones.
+    With a `single_flight`, concurrent misses of the same location and range are fetched once:
+    the others wait and are then served by the repeated lookup.
     """
 
     def __init__(
@@ -15,24 +45,115 @@ class WeatherService:
         query_port: WeatherQueryPort,
         command_port: WeatherCommandPort,
         api_port: WeatherApiPort,
+        single_flight: Optional[SingleFlightPort] = None,
     ):
         self._query_port = query_port
         self._command_port = command_port
         self._api_port = api_port
+        self._single_flight = single_flight
 
     def weather_for_location(
         self,
         options: WeatherQueryOptions,
     ) -> WeatherData:
-        cached = self._query_port.get(options)
-        if cached.data:
+        if self._single_flight is None:
+            return self.weather_for_locations([options])[0]
+
+        option = archive_grid.normalize(options)
+        cached, missing = self._query_port.lookup(option)
+        if not missing:
+            return cached
+        # looked up again inside the flight, another caller may have just filled the gaps
+        return self._single_flight.do(
+            _flight_key(option), lambda: self.weather_for_locations([option])[0]
+        )
+
+    def weather_for_locations(
+        self,
+        options: list[WeatherQueryOptions],
+    ) -> list[WeatherData]:
+        """Batch variant: all cache misses are fetched together in as few upstream calls as possible."""
+        options = [archive_grid.normalize(option) for option in options]
+        lookups = [self._query_port.lookup(option) for option in options]
+        missing = [ranges for _, ranges in lookups]
+        results = [cached for cached, _ in lookups]
+        if not any(missing):
+            return results
+
+        ranges = [option for option_ranges in missing for option in option_ranges]
+        fetched: list[list[WeatherData]] = [[] for _ in options]
+        for index, option, weather_data in zip(
+            _owners(missing), ranges, self._api_port.get_many(ranges), strict=True
+        ):
+            # Cache for quick access, before persisting which may only be queued
+            self._query_port.cache(weather_data, option)
+            self._command_port.cache(weather_data)
+            fetched[index].append(weather_data)
+
+        return [
+            _merge(cached, parts) if parts else cached
+            for cached, parts in zip(results, fetched, strict=True)
+        ]
+
+
+class AsyncWeatherService:
+    """
+
+    Non-blocking counterpart of WeatherService, for async endpoints
+    """
+
+    def __init__(
+        self,
+        query_port: AsyncWeatherQueryPort,
+        command_port: AsyncWeatherCommandPort,
+        api_port: AsyncWeatherApiPort,
+        single_flight: Optional[AsyncSingleFlightPort] = None,
+    ):
+        self._query_port = query_port
+        self._command_port = command_port
+        self._api_port = api_port
+        self._single_flight = single_flight
+
+    async def weather_for_location(
+        self,
+        options: WeatherQueryOptions,
+    ) -> WeatherData:
+        if self._single_flight is None:
+            return (await self.weather_for_locations([options]))[0]
+
+        option = archive_grid.normalize(options)
+        cached, missing = await self._query_port.lookup(option)
+        if not missing:
             return cached
 
-        weather_data = self._api_port.get(options)
+        async def fetch() -> WeatherData:
+            return (await self.weather_for_locations([option]))[0]
 
-        self._command_port.cache(weather_data)
+        return await self._single_flight.do(_flight_key(option), fetch)
+
+    async def weather_for_locations(
+        self,
+        options: list[WeatherQueryOptions],
+    ) -> list[WeatherData]:
+        """Batch variant: all cache misses are fetched together in as few upstream calls as possible."""
+        options = [archive_grid.normalize(option) for option in options]
+        lookups = await asyncio.gather(*(self._query_port.lookup(option) for option in options))
+        missing = [ranges for _, ranges in lookups]
+        results = [cached for cached, _ in lookups]
+        if not any(missing):
+            return results
 
-        # Cache for quick access
-        self._query_port.cache(weather_data, options)
+        ranges = [option for option_ranges in missing for option in option_ranges]
+        fetched: list[list[WeatherData]] = [[] for _ in options]
+        for index, option, weather_data in zip(
+            _owners(missing), ranges, await self._api_port.get_many(ranges), strict=True
+        ):
+            # Cache for quick access, before persisting which may only be queued
+            await self._query_port.cache(weather_data, option)
+            await self._command_port.cache(weather_data)
+            fetched[index].append(weather_data)
 
-        return weather_data
+        return [
+            _merge(cached, parts) if parts else cached
+            for cached, parts in zip(results, fetched, strict=True)
+        ]
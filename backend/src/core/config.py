@@ -25,10 +25,40 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = Field(default="")
     POSTGRES_DB: str = Field(default="")
     POSTGRES_URL: Union[Optional[PostgresDsn], Optional[str]] = None
+    # replica for the query side; unset, reads use the primary in read-only transactions
+    POSTGRES_READ_URL: Optional[str] = None
+    # DB_POOL_SIZE is the budget of all workers, POOL_SIZE the share of one worker process
     DB_POOL_SIZE: int = Field(default=83)
     WEB_CONCURRENCY: int = Field(default=9)
     MAX_OVERFLOW: int = Field(default=64)
-    POOL_SIZE: Optional[int] = None
+    POOL_SIZE: Optional[int] = Field(default=None, validate_default=True)
+    # share of POOL_SIZE and MAX_OVERFLOW for the async engines, the API's stack; the sync
+    # engines get the rest, at least one connection
+    DB_ASYNC_POOL_SHARE: float = Field(default=0.8)
+    DB_POOL_TIMEOUT: float = Field(default=30.0)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    # milliseconds, 0 disables
+    DB_STATEMENT_TIMEOUT: int = Field(default=30_000)
+    DB_ECHO: bool = Field(default=False)
+    # point at benchmarks/fake_open_meteo.py to run without upstream
+    OPEN_METEO_URL: str = Field(default="https://archive-api.open-meteo.com/v1/archive")
+    # Open-Meteo's limits, shared by all workers; calls are weighted by locations, days and
+    # variables
+    OPEN_METEO_CALLS_PER_MINUTE: int = Field(default=600)
+    OPEN_METEO_CALLS_PER_HOUR: int = Field(default=5_000)
+    OPEN_METEO_CALLS_PER_DAY: int = Field(default=10_000)
+    # share of every limit backfills leave to interactive requests
+    OPEN_METEO_BACKFILL_RESERVE: float = Field(default=0.2)
+    # cell size of the upstream grid in degrees, 0.1 for ERA5-Land behind the archive's hourly
+    # temperature; rows stored on another grid are not found after changing it
+    ARCHIVE_GRID_DEGREES: float = Field(default=0.1)
+    # days the archive lags behind; younger days are cached but not persisted as final
+    OPEN_METEO_ARCHIVE_DELAY_DAYS: int = Field(default=5)
+    # one row per location, day and variable (weather_days) instead of one per hour
+    WEATHER_PACKED_STORAGE: bool = Field(default=False)
+    # persist fetched series from a background queue, responses only wait for the cache write
+    WEATHER_WRITE_BEHIND: bool = Field(default=False)
 
     @field_validator("POOL_SIZE", mode="before")
     @classmethod
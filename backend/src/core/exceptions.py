@@ -4,3 +4,9 @@ class ChangingweatherException(Exception):
 
 class ObjectNotFound(ChangingweatherException):
     pass
+
+
+class UpstreamBudgetExhausted(ChangingweatherException):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,126 @@
+"""
+Engine factory: pool sizing, timeouts and logging from Settings, plus pool metrics.
+
+Pools live per worker process, so they are sized with `POOL_SIZE` (the share of one gunicorn
+worker in `DB_POOL_SIZE`) and `MAX_OVERFLOW`. A worker holds a sync and an async engine per
+database; `DB_ASYNC_POOL_SHARE` splits that budget between them instead of giving each all of
+it. Every engine counts its checkouts and the time spent waiting for a free connection, see
+`pool_status`.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Union
+
+from pydantic import PostgresDsn
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from src.core.config import Settings, settings
+from src.core.exceptions import ChangingweatherException
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+class _MeteredPool:
+    """Times `_do_get`, the only place a checkout blocks on a busy pool."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+def _metered(pool_class: type[Pool]) -> type[Pool]:
+    # metrics live on the class: `engine.dispose()` recreates the pool from its class
+    return type(
+        f"Metered{pool_class.__name__}", (_MeteredPool, pool_class), {"metrics": PoolMetrics()}
+    )
+
+
+def engine_options(config: Settings = settings, share: float = 1.0) -> dict[str, Any]:
+    """Engine arguments, with `share` of the worker's pool budget."""
+    options: dict[str, Any] = {
+        "echo": config.DB_ECHO,
+        "pool_size": max(round(config.POOL_SIZE * share), 1),  # type: ignore
+        "max_overflow": round(config.MAX_OVERFLOW * share),
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if config.DB_STATEMENT_TIMEOUT:
+        # set at connect time, no extra round trip per checkout
+        options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT}"}
+    return options
+
+
+def database_url(url: Union[PostgresDsn, str, None], name: str = "POSTGRES_URL") -> str:
+    """The configured URL as a string, refusing to start without one."""
+    if not url:
+        raise ChangingweatherException(f"{name} is not configured")
+    return str(url)
+
+
+def create_db_engine(url: str, config: Settings = settings) -> Engine:
+    return create_engine(
+        url,
+        poolclass=_metered(QueuePool),
+        **engine_options(config, share=1 - config.DB_ASYNC_POOL_SHARE),
+    )
+
+
+def create_async_db_engine(url: str, config: Settings = settings) -> AsyncEngine:
+    # psycopg 3 serves both engines, the async one needs the driver named explicitly
+    return create_async_engine(
+        make_url(url).set(drivername="postgresql+psycopg"),
+        poolclass=_metered(AsyncAdaptedQueuePool),
+        **engine_options(config, share=config.DB_ASYNC_POOL_SHARE),
+    )
+
+
+def read_only(engine: Union[Engine, AsyncEngine]) -> Any:
+    """The same engine and pool, with every transaction opened READ ONLY."""
+    return engine.execution_options(postgresql_readonly=True)
+
+
+def pool_status(engine: Union[Engine, AsyncEngine]) -> dict[str, Union[int, float]]:
+    """Pool occupancy and checkout metrics, e.g. for a metrics endpoint."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    pool = engine.pool
+    metrics: PoolMetrics = pool.metrics  # type: ignore
+    return {
+        "size": pool.size(),  # type: ignore
+        "checked_out": pool.checkedout(),  # type: ignore
+        "overflow": pool.overflow(),  # type: ignore
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "wait_seconds": metrics.wait_seconds,
+        "max_wait_seconds": metrics.max_wait_seconds,
+    }
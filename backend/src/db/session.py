@@ -1,17 +1,36 @@
 from typing import Generator
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.core.config import settings
+from src.db.engine import (
+    create_async_db_engine,
+    create_db_engine,
+    database_url,
+    read_only,
+)
 
 
-engine = create_engine(
-    settings.POSTGRES_URL,
-    echo=settings.DEBUG,
-)
+url = database_url(settings.POSTGRES_URL)
+engine = create_db_engine(url)
+async_engine = create_async_db_engine(url)
+
+# the query side reads from a replica when one is configured, else from the primary's pool
+if settings.POSTGRES_READ_URL:
+    read_engine = create_db_engine(settings.POSTGRES_READ_URL)
+    async_read_engine = create_async_db_engine(settings.POSTGRES_READ_URL)
+else:
+    read_engine, async_read_engine = engine, async_engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_only(read_engine))
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    read_only(async_read_engine), autoflush=False, expire_on_commit=False
+)
 
 
 def add_postgresql_extension() -> None:
@@ -1,5 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from typing import Optional, Sequence, Union, overload
+
+import numpy as np
+
+
+# hourly variables a series can carry; "temperature" is the one every tier started out with
+WEATHER_VARIABLES = ("temperature", "relative_humidity", "precipitation", "wind_speed")
+DEFAULT_VARIABLES = ("temperature",)
+
+# daily column -> (hourly column, aggregate), aggregated per UTC day
+DAILY_VARIABLES = {
+    "temperature_max": ("temperature", "max"),
+    "temperature_min": ("temperature", "min"),
+    "temperature_mean": ("temperature", "mean"),
+    "relative_humidity_mean": ("relative_humidity", "mean"),
+    "precipitation_sum": ("precipitation", "sum"),
+    "wind_speed_max": ("wind_speed", "max"),
+}
+
+_AGGREGATES = {"max": np.maximum, "min": np.minimum, "sum": np.add, "mean": np.add}
 
 
 @dataclass
@@ -14,11 +34,203 @@ class WeatherDataPoint:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(frozen=True, eq=False)
+class WeatherSeries:
+    """
+    Columnar hourly series: one timestamp array plus one numeric array per variable.
+
+    Timestamps are naive UTC `datetime64[s]`, sorted ascending. Slicing returns views,
+    per-point access only exists for compatibility with `WeatherDataPoint` consumers.
+    """
+
+    timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="datetime64[s]"))
+    values: dict[str, np.ndarray] = field(
+        default_factory=lambda: {"temperature": np.empty(0, dtype=np.float64)}
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "timestamps", np.asarray(self.timestamps, dtype="datetime64[s]"))
+        for name, column in self.values.items():
+            if len(column) != len(self.timestamps):
+                raise ValueError(
+                    f"column {name} has {len(column)} values for {len(self.timestamps)} timestamps"
+                )
+
+    @classmethod
+    def empty(cls, variables: Sequence[str] = DEFAULT_VARIABLES) -> "WeatherSeries":
+        return cls(values={name: np.empty(0, dtype=np.float64) for name in variables})
+
+    @classmethod
+    def from_points(cls, points: list[WeatherDataPoint]) -> "WeatherSeries":
+        return cls(
+            timestamps=np.array([point.timestamp for point in points], dtype="datetime64[s]"),
+            values={
+                "temperature": np.array([point.temperature for point in points], dtype=np.float64)
+            },
+        )
+
+    @classmethod
+    def concat(cls, series: list["WeatherSeries"]) -> "WeatherSeries":
+        """
+        Concatenate in the given order; callers pass non-overlapping, ordered parts carrying the
+        same columns. Without points the result carries the columns of the parts.
+        """
+        names = list(dict.fromkeys(name for part in series for name in part.values))
+        series = [part for part in series if len(part)]
+        if not series:
+            return cls.empty(names)
+        if len(series) == 1:
+            return series[0]
+
+        return cls(
+            timestamps=np.concatenate([part.timestamps for part in series]),
+            values={
+                name: np.concatenate([part.values[name] for part in series])
+                for name in series[0].values
+            },
+        )
+
+    @classmethod
+    def merge(cls, series: list["WeatherSeries"]) -> "WeatherSeries":
+        """Combine non-overlapping parts given in any order into one ordered series."""
+        merged = cls.concat(series)
+        if np.all(merged.timestamps[1:] >= merged.timestamps[:-1]):
+            return merged
+
+        order = np.argsort(merged.timestamps, kind="stable")
+        return cls(
+            timestamps=merged.timestamps[order],
+            values={name: column[order] for name, column in merged.values.items()},
+        )
+
+    @classmethod
+    def overlay(cls, series: list["WeatherSeries"]) -> "WeatherSeries":
+        """
+        Combine parts that may share timestamps and carry different columns. Later parts win
+        for the columns they carry, values no part has are NaN.
+        """
+        names = dict.fromkeys(name for part in series for name in part.values)
+        series = [part for part in series if len(part)]
+        if not series:
+            return cls.empty(list(names))
+        if all(part.values.keys() == names.keys() for part in series):
+            merged = cls.merge(series)
+            if np.all(merged.timestamps[1:] > merged.timestamps[:-1]):
+                return merged
+
+        timestamps = np.unique(np.concatenate([part.timestamps for part in series]))
+        names = dict.fromkeys(name for part in series for name in part.values)
+        values = {name: np.full(len(timestamps), np.nan) for name in names}
+        for part in series:
+            rows = np.searchsorted(timestamps, part.timestamps)
+            for name, column in part.values.items():
+                values[name][rows] = column
+        return cls(timestamps=timestamps, values=values)
+
+    @property
+    def temperature(self) -> np.ndarray:
+        return self.values["temperature"]
+
+    def between(self, start: datetime, end: datetime) -> "WeatherSeries":
+        """Points with start <= timestamp < end."""
+        lower, upper = np.searchsorted(
+            self.timestamps, np.array([start, end], dtype="datetime64[s]"), side="left"
+        )
+        return self[lower:upper]
+
+    def days(self) -> list[tuple[date, "WeatherSeries"]]:
+        """Split into one view per calendar day (UTC) that has points."""
+        day_of_point = self.timestamps.astype("datetime64[D]")
+        bounds = np.flatnonzero(day_of_point[1:] != day_of_point[:-1]) + 1
+        starts = [0, *bounds.tolist()]
+        ends = [*bounds.tolist(), len(self)]
+        return [
+            (day_of_point[start].item(), self[start:end])
+            for start, end in zip(starts, ends, strict=True)
+            if end > start
+        ]
+
+    def select(self, variables: Sequence[str]) -> "WeatherSeries":
+        """View on the given columns, in that order."""
+        return WeatherSeries(
+            timestamps=self.timestamps, values={name: self.values[name] for name in variables}
+        )
+
+    def daily(self, variables: Sequence[str]) -> "WeatherSeries":
+        """One point per UTC day at midnight, with the `DAILY_VARIABLES` aggregates asked for."""
+        if not len(self):
+            return WeatherSeries.empty(variables)
+
+        day_of_point = self.timestamps.astype("datetime64[D]")
+        starts = np.flatnonzero(np.append(True, day_of_point[1:] != day_of_point[:-1]))
+        values = {}
+        for name in variables:
+            source, aggregate = DAILY_VARIABLES[name]
+            column = _AGGREGATES[aggregate].reduceat(self.values[source], starts)
+            if aggregate == "mean":
+                column = column / np.diff(np.append(starts, len(self)))
+            values[name] = column
+        return WeatherSeries(timestamps=day_of_point[starts], values=values)
+
+    def points(self) -> list[WeatherDataPoint]:
+        """Per-point view; the temperature is NaN for a series without that column."""
+        timestamps = self.timestamps.astype("datetime64[us]").tolist()
+        temperatures = self.values.get("temperature", np.full(len(self), np.nan))
+        return list(map(WeatherDataPoint, temperatures.tolist(), timestamps))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @overload
+    def __getitem__(self, index: int) -> WeatherDataPoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "WeatherSeries": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[WeatherDataPoint, "WeatherSeries"]:
+        if isinstance(index, slice):
+            return WeatherSeries(
+                timestamps=self.timestamps[index],
+                values={name: column[index] for name, column in self.values.items()},
+            )
+
+        temperature = self.values.get("temperature")
+        return WeatherDataPoint(
+            temperature=float(temperature[index]) if temperature is not None else float("nan"),
+            timestamp=self.timestamps[index].astype("datetime64[us]").item(),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WeatherSeries):
+            return NotImplemented
+        return (
+            np.array_equal(self.timestamps, other.timestamps)
+            and self.values.keys() == other.values.keys()
+            and all(
+                np.array_equal(column, other.values[name]) for name, column in self.values.items()
+            )
+        )
+
+
+@dataclass(init=False)
 class WeatherData:
     # Todo: coordinate as part of WeatherData when persisting
     coordinate: WeatherCoordinate
-    data: list[WeatherDataPoint]
+    series: WeatherSeries
+
+    def __init__(
+        self,
+        coordinate: WeatherCoordinate,
+        data: Optional[list[WeatherDataPoint]] = None,
+        series: Optional[WeatherSeries] = None,
+    ):
+        self.coordinate = coordinate
+        self.series = series if series is not None else WeatherSeries.from_points(data or [])
+
+    @property
+    def data(self) -> list[WeatherDataPoint]:
+        """Per-point view for compatibility, prefer `series`."""
+        return self.series.points()
 
 
 @dataclass
@@ -26,3 +238,5 @@ class WeatherQueryOptions:
     coordinate: WeatherCoordinate
     start: date
     end: date
+    # hourly columns to fetch, from WEATHER_VARIABLES; all of them are fetched in one call
+    variables: tuple[str, ...] = DEFAULT_VARIABLES
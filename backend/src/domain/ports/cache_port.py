@@ -1,4 +1,4 @@
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Union
 
 
 class CachePort(Protocol):
@@ -6,6 +6,37 @@ class CachePort(Protocol):
 
     def get(self, key: str) -> Optional[str]: ...
 
-    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None: ...
+    def get_bytes(self, key: str) -> Optional[bytes]: ...
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]: ...
+
+    # values with their remaining ttl in seconds, None for entries that don't expire
+    def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> list[tuple[Optional[bytes], Optional[float]]]: ...
+
+    def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None: ...
+
+    def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None: ...
 
     def delete(self, key: str) -> None: ...
+
+
+class AsyncCachePort(Protocol):
+    """Port for non-blocking caching operations."""
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def get_bytes(self, key: str) -> Optional[bytes]: ...
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]: ...
+
+    async def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> list[tuple[Optional[bytes], Optional[float]]]: ...
+
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None: ...
+
+    async def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
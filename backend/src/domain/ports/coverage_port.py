@@ -0,0 +1,46 @@
+from datetime import date
+from typing import Optional, Protocol
+
+from src.domain.entities.weather import WeatherCoordinate
+
+
+class CoveragePort(Protocol):
+    """
+    Index of the days persisted per location and variable.
+
+    `covered` answers None when the location is not indexed yet; the caller then `load`s it
+    from the persistence layer, which stays the source of truth. `mark` only extends locations
+    that are already indexed. `clear` drops every variable of the location.
+    """
+
+    def covered(
+        self, coordinate: WeatherCoordinate, start: date, end: date, variable: str = "temperature"
+    ) -> Optional[list[bool]]: ...
+
+    def load(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None: ...
+
+    def mark(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None: ...
+
+    def clear(self, coordinate: WeatherCoordinate) -> None: ...
+
+
+class AsyncCoveragePort(Protocol):
+    """Non-blocking variant of CoveragePort."""
+
+    async def covered(
+        self, coordinate: WeatherCoordinate, start: date, end: date, variable: str = "temperature"
+    ) -> Optional[list[bool]]: ...
+
+    async def load(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None: ...
+
+    async def mark(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None: ...
+
+    async def clear(self, coordinate: WeatherCoordinate) -> None: ...
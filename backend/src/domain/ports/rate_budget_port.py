@@ -0,0 +1,25 @@
+from typing import Optional, Protocol
+
+from src.domain.services.priority import Priority
+
+
+class RateBudgetPort(Protocol):
+    """
+    Budget of upstream calls shared by all workers.
+
+    `acquire` blocks until `cost` calls fit into the budget, or raises
+    UpstreamBudgetExhausted when that takes too long for `priority`. `throttle` reports a
+    rate-limited response, after which every worker backs off.
+    """
+
+    def acquire(self, cost: float, priority: Priority) -> None: ...
+
+    def throttle(self, retry_after: Optional[float] = None) -> None: ...
+
+
+class AsyncRateBudgetPort(Protocol):
+    """Non-blocking variant of RateBudgetPort."""
+
+    async def acquire(self, cost: float, priority: Priority) -> None: ...
+
+    async def throttle(self, retry_after: Optional[float] = None) -> None: ...
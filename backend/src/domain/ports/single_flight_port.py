@@ -0,0 +1,22 @@
+from typing import Awaitable, Callable, Protocol, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlightPort(Protocol):
+    """
+    Coalesces concurrent calls for the same key.
+
+    One caller runs `call`, concurrent callers in the same process share its result. Callers in
+    other processes wait until it finished and then run `call` themselves, which is expected to
+    find the result cached by then.
+    """
+
+    def do(self, key: str, call: Callable[[], T]) -> T: ...
+
+
+class AsyncSingleFlightPort(Protocol):
+    """Non-blocking variant of SingleFlightPort."""
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T: ...
@@ -14,3 +14,18 @@ class WeatherApiPort(Protocol):
     def fetch(self, options: WeatherQueryOptions) -> pd.DataFrame: ...
     def map(self, data: pd.DataFrame, options: WeatherQueryOptions) -> WeatherData: ...
     def get(self, options: WeatherQueryOptions) -> WeatherData: ...
+    def fetch_many(self, options: list[WeatherQueryOptions]) -> list[pd.DataFrame]: ...
+    def get_many(self, options: list[WeatherQueryOptions]) -> list[WeatherData]: ...
+
+
+class AsyncWeatherApiPort(Protocol):
+    """
+
+    Non-blocking variant of WeatherApiPort
+    """
+
+    async def fetch(self, options: WeatherQueryOptions) -> pd.DataFrame: ...
+    def map(self, data: pd.DataFrame, options: WeatherQueryOptions) -> WeatherData: ...
+    async def get(self, options: WeatherQueryOptions) -> WeatherData: ...
+    async def fetch_many(self, options: list[WeatherQueryOptions]) -> list[pd.DataFrame]: ...
+    async def get_many(self, options: list[WeatherQueryOptions]) -> list[WeatherData]: ...
@@ -14,3 +14,13 @@ class WeatherCommandPort(Protocol):
     def invalidate_cache(self, coordinate: WeatherCoordinate) -> None: ...
 
     # TODO: Log fetch, e.g., metadata, rate limis
+
+
+class AsyncWeatherCommandPort(Protocol):
+    """
+
+    Non-blocking variant of WeatherCommandPort
+    """
+
+    async def cache(self, data: WeatherData) -> None: ...
+    async def invalidate_cache(self, coordinate: WeatherCoordinate) -> None: ...
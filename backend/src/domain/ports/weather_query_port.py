@@ -1,11 +1,7 @@
 from typing import Protocol
 
-from src.domain.entities.weather import (
-    WeatherData,
-    WeatherDataPoint,
-    WeatherQueryOptions,
-)
-from src.domain.ports.cache_port import CachePort
+from src.domain.entities.weather import WeatherData, WeatherQueryOptions, WeatherSeries
+from src.domain.ports.cache_port import AsyncCachePort, CachePort
 
 
 class WeatherQueryPort(Protocol):
@@ -17,10 +13,31 @@ class WeatherQueryPort(Protocol):
 
     def __init__(self, cache: CachePort): ...
 
-    def map_to_model(
-        self, data: list[WeatherDataPoint], options: WeatherQueryOptions
-    ) -> WeatherData: ...
+    def map_to_model(self, data: WeatherSeries, options: WeatherQueryOptions) -> WeatherData: ...
 
     def get(self, options: WeatherQueryOptions) -> WeatherData: ...
 
+    def lookup(
+        self, options: WeatherQueryOptions
+    ) -> tuple[WeatherData, list[WeatherQueryOptions]]: ...
+
     def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None: ...
+
+
+class AsyncWeatherQueryPort(Protocol):
+    """
+
+    Non-blocking variant of WeatherQueryPort
+    """
+
+    def __init__(self, cache: AsyncCachePort): ...
+
+    def map_to_model(self, data: WeatherSeries, options: WeatherQueryOptions) -> WeatherData: ...
+
+    async def get(self, options: WeatherQueryOptions) -> WeatherData: ...
+
+    async def lookup(
+        self, options: WeatherQueryOptions
+    ) -> tuple[WeatherData, list[WeatherQueryOptions]]: ...
+
+    async def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None: ...
@@ -0,0 +1,46 @@
+"""
+Which fetched days are final.
+
+The archive publishes with a delay: its most recent days come back short of hours or as NaN and
+are filled in later. Only final days are persisted and counted as stored; the others are served
+from the cache until their entry expires and are then fetched again.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
+from src.domain.entities.weather import WeatherSeries
+
+
+HOURS_PER_DAY = 24
+# Open-Meteo's archive lags about five days behind, see its historical weather API docs
+ARCHIVE_DELAY_DAYS = 5
+
+
+@dataclass(frozen=True)
+class Archive:
+    delay_days: int = ARCHIVE_DELAY_DAYS
+
+    def last_final_day(self, today: Optional[date] = None) -> date:
+        today = today or datetime.now(timezone.utc).date()
+        return today - timedelta(days=self.delay_days)
+
+    def final(self, series: WeatherSeries, today: Optional[date] = None) -> WeatherSeries:
+        """The days of `series` outside the delay with every hour set in every column."""
+        last = self.last_final_day(today)
+        days = [
+            part
+            for day, part in series.days()
+            if day <= last
+            and len(part) == HOURS_PER_DAY
+            and not any(np.isnan(column).any() for column in part.values.values())
+        ]
+        if not days:
+            return WeatherSeries.empty(list(series.values))
+        return WeatherSeries.concat(days)
+
+
+archive = Archive()
@@ -0,0 +1,58 @@
+"""
+Canonical grid cells and cache/storage keys for coordinates and query options.
+
+Upstream serves gridded model data: every coordinate inside one cell gets the values of the
+same grid point. Snapping to the cell centre before any lookup lets nearby requests share cache
+entries, database rows and upstream calls.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from src.core.config import settings
+from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
+
+
+@dataclass(frozen=True)
+class Grid:
+    resolution: float
+
+    def _centre(self, value: float) -> float:
+        # round first so 52.35 / 0.1 = 523.4999.. still lands in the cell it is printed in
+        index = math.floor(round(value / self.resolution, 6) + 0.5)
+        # + 0.0 turns -0.0 into 0.0, both would otherwise end up in keys
+        return round(index * self.resolution, 6) + 0.0
+
+    def snap(self, coordinate: WeatherCoordinate) -> WeatherCoordinate:
+        """Centre of the cell the coordinate lies in, longitudes wrapped into [-180, 180)."""
+        longitude = self._centre(coordinate.longitude)
+        if longitude >= 180:
+            longitude -= 360
+        return WeatherCoordinate(latitude=self._centre(coordinate.latitude), longitude=longitude)
+
+    def key(self, coordinate: WeatherCoordinate) -> str:
+        snapped = self.snap(coordinate)
+        return f"{snapped.latitude:g}:{snapped.longitude:g}"
+
+    def normalize(self, options: WeatherQueryOptions) -> WeatherQueryOptions:
+        """Snapped coordinate, whole days and distinct variables, the form every tier uses."""
+        return WeatherQueryOptions(
+            coordinate=self.snap(options.coordinate),
+            start=as_date(options.start),
+            end=as_date(options.end),
+            variables=tuple(dict.fromkeys(options.variables)),
+        )
+
+
+def variable_key(key: str, variable: str) -> str:
+    """Key of one variable; temperature keeps the key it had before there were others."""
+    return key if variable == "temperature" else f"{key}:{variable}"
+
+
+def as_date(value: date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+# the grid upstream serves, see ARCHIVE_GRID_DEGREES
+archive_grid = Grid(settings.ARCHIVE_GRID_DEGREES)
@@ -0,0 +1,33 @@
+"""
+Priority of upstream calls, carried through the layers in a context variable.
+
+Request handlers run at INTERACTIVE by default; bulk jobs wrap their work in `backfill()` so the
+rate budget serves them only from what interactive traffic leaves over.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKFILL = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@contextmanager
+def backfill() -> Iterator[None]:
+    """Upstream calls made inside, including from tasks started inside, rank behind requests."""
+    token = _priority.set(Priority.BACKFILL)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
@@ -0,0 +1,83 @@
+from typing import Optional, Union
+
+import redis
+import redis.asyncio
+
+from src.infrastructure.adapters.redis_cache import as_bytes, remaining
+
+
+class AsyncRedisCache:
+    """redis.asyncio implementation of AsyncCachePort."""
+
+    def __init__(self, redis_client: redis.asyncio.Redis):
+        self._redis = redis_client
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            cached_data = as_bytes(await self._redis.get(key))
+            return cached_data.decode("utf-8") if cached_data else None
+        except redis.RedisError:
+            return None
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Raw value, for binary payloads."""
+        try:
+            return as_bytes(await self._redis.get(key))
+        except redis.RedisError:
+            return None
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Raw values in key order, one MGET round trip."""
+        if not keys:
+            return []
+        try:
+            return [as_bytes(value) for value in await self._redis.mget(keys)]
+        except redis.RedisError:
+            return [None] * len(keys)
+
+    async def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> list[tuple[Optional[bytes], Optional[float]]]:
+        """Raw values and their remaining ttls in key order, MGET and PTTLs in one round trip."""
+        if not keys:
+            return []
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.mget(keys)
+            for key in keys:
+                pipeline.pttl(key)
+            values, *ttls = await pipeline.execute()
+        except redis.RedisError:
+            return [(None, None)] * len(keys)
+        return list(zip(map(as_bytes, values), map(remaining, ttls), strict=True))
+
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        try:
+            if ttl:
+                await self._redis.setex(key, ttl, value)
+            else:
+                await self._redis.set(key, value)
+        except redis.RedisError:
+            pass
+
+    async def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        """Store all items in one pipelined round trip."""
+        if not items:
+            return
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for key, value in items.items():
+                if ttl:
+                    pipeline.setex(key, ttl, value)
+                else:
+                    pipeline.set(key, value)
+            await pipeline.execute()
+        except redis.RedisError:
+            pass
+
+    async def delete(self, key: str) -> None:
+        """Delete value from cache by key."""
+        try:
+            await self._redis.delete(key)
+        except redis.RedisError:
+            pass
@@ -0,0 +1,62 @@
+from datetime import date
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from src.domain.entities.weather import WeatherCoordinate
+from src.infrastructure.adapters.redis_coverage_index import (
+    MARK_SCRIPT,
+    CoverageIndexBase,
+)
+
+
+class AsyncRedisCoverageIndex(CoverageIndexBase):
+    """redis.asyncio implementation of AsyncCoveragePort, same layout as self."""
+
+    def __init__(self, redis_client: redis.asyncio.Redis):
+        self._redis = redis_client
+        self._mark = redis_client.register_script(MARK_SCRIPT)
+
+    async def covered(
+        self, coordinate: WeatherCoordinate, start: date, end: date, variable: str = "temperature"
+    ) -> Optional[list[bool]]:
+        key = self.key(coordinate, variable)
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.exists(key)
+            pipeline.getrange(key, *self._byte_range(start, end))
+            exists, data = await pipeline.execute()
+        except redis.RedisError:
+            return None
+        return self._decode(data, start, end) if exists else None
+
+    async def load(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None:
+        key = self.key(coordinate, variable)
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.append(key, b"")
+            for offset in self._offsets(days):
+                pipeline.setbit(key, offset, 1)
+            await pipeline.execute()
+        except redis.RedisError:
+            pass
+
+    async def mark(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None:
+        offsets = self._offsets(days)
+        if not offsets:
+            return
+        try:
+            await self._mark(keys=[self.key(coordinate, variable)], args=offsets)
+        except redis.RedisError:
+            pass
+
+    async def clear(self, coordinate: WeatherCoordinate) -> None:
+        try:
+            await self._redis.delete(*self._location_keys(coordinate))
+        except redis.RedisError:
+            pass
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from src.domain.services.priority import Priority
+from src.infrastructure.adapters.redis_rate_budget import (
+    ACQUIRE_SCRIPT,
+    THROTTLE_SCRIPT,
+    RateBudgetPolicy,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisRateBudget:
+    """redis.asyncio implementation of AsyncRateBudgetPort, same buckets as RedisRateBudget."""
+
+    def __init__(
+        self, redis_client: redis.asyncio.Redis, policy: RateBudgetPolicy = RateBudgetPolicy()
+    ):
+        self._policy = policy
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._throttle = redis_client.register_script(THROTTLE_SCRIPT)
+
+    async def acquire(self, cost: float, priority: Priority = Priority.INTERACTIVE) -> None:
+        keys, args = self._policy.acquire_args(cost, priority)
+        deadline = self._policy.deadline(priority)
+        while True:
+            try:
+                wait_ms = await self._acquire(keys=keys, args=args)
+            except redis.RedisError as exc:
+                logger.warning(f"rate budget unavailable, not holding back: {exc}")
+                return
+            if not wait_ms:
+                return
+            await asyncio.sleep(self._policy.delay(wait_ms, deadline))
+
+    async def throttle(self, retry_after: Optional[float] = None) -> None:
+        keys, args = self._policy.throttle_args(retry_after)
+        try:
+            pause_ms = await self._throttle(keys=keys, args=args)
+        except redis.RedisError as exc:
+            logger.warning(f"rate budget unavailable, cannot back off: {exc}")
+            return
+        logger.warning(f"upstream rate limit hit, pausing all workers for {pause_ms / 1000:.1f}s")
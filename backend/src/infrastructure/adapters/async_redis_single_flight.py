@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, TypeVar
+
+import redis
+import redis.asyncio
+from redis.asyncio.client import PubSub
+
+from src.infrastructure.adapters.redis_single_flight import (
+    EXTEND_SCRIPT,
+    RELEASE_SCRIPT,
+    RedisSingleFlight,
+)
+
+
+T = TypeVar("T")
+
+
+async def _aclose(pubsub: PubSub) -> None:
+    """`pubsub.aclose()`, which redis-py leaves unannotated."""
+    aclose: Callable[[], Awaitable[None]] = pubsub.aclose
+    await aclose()
+
+
+class AsyncRedisSingleFlight:
+    """
+    redis.asyncio implementation of AsyncSingleFlightPort, same protocol as RedisSingleFlight.
+
+    Tasks of one event loop share a future per key. When the leading task is cancelled, the
+    tasks waiting for it start over instead of being cancelled along. The lock is extended from
+    a watchdog task while `call` runs.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis,
+        lock_ttl: float = 30.0,
+        poll_interval: float = 1.0,
+    ):
+        self._redis = redis_client
+        self._lock_ttl = lock_ttl
+        self._poll_interval = poll_interval
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._extend = redis_client.register_script(EXTEND_SCRIPT)
+        self._flights: dict[str, asyncio.Future[Any]] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        while (flight := self._flights.get(key)) is not None:
+            try:
+                # shielded, a cancelled waiter must not cancel the flight
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._across_workers(key, call)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            flight.exception()  # retrieved, even if nobody was waiting
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    async def _across_workers(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        lock, channel = RedisSingleFlight.keys(key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._redis.set(lock, token, nx=True, px=int(self._lock_ttl * 1000))
+        except redis.RedisError:
+            return await call()
+
+        if not acquired:
+            await self._wait(lock, channel)
+            return await call()
+        watchdog = asyncio.create_task(self._hold(lock, token))
+        try:
+            return await call()
+        finally:
+            watchdog.cancel()
+            try:
+                await self._release(keys=[lock, channel], args=[token])
+            except redis.RedisError:
+                pass
+
+    async def _hold(self, lock: str, token: str) -> None:
+        """Extends the lock every third of `lock_ttl` until cancelled or the lock is lost."""
+        while True:
+            await asyncio.sleep(self._lock_ttl / 3)
+            try:
+                if not await self._extend(keys=[lock], args=[token, int(self._lock_ttl * 1000)]):
+                    return
+            except redis.RedisError:
+                return
+
+    async def _wait(self, lock: str, channel: str) -> None:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            while await self._redis.exists(lock):
+                if await pubsub.get_message(timeout=self._poll_interval) is not None:
+                    return
+        except redis.RedisError:
+            pass
+        finally:
+            await _aclose(pubsub)
@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from src.domain.ports.cache_port import AsyncCachePort, CachePort
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class MemoryCache:
+    """
+    In-process LRU implementation of CachePort, optionally stacked in front of another CachePort.
+
+    Entries are bounded by a byte budget (keys plus values); the least recently used ones are
+    evicted first. A local entry never outlives the ttl it was written with, nor the remaining
+    ttl the backend reported when it was read through, and is kept for at most `local_ttl`
+    seconds. Writes and deletes go to both tiers.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CachePort] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        local_ttl: int = 300,
+    ):
+        self._backend = backend
+        self._max_bytes = max_bytes
+        self._local_ttl = local_ttl
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit, miss and eviction counters of the local tier."""
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions)
+
+    @property
+    def size(self) -> int:
+        """Bytes currently held."""
+        return self._size
+
+    def _lookup(self, key: str) -> tuple[Optional[bytes], Optional[float]]:
+        """The local value and its remaining ttl."""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return None, None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0], entry[1] - now
+
+    def _store(self, key: str, value: Union[str, bytes], ttl: Optional[float]) -> None:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        entry_size = len(key) + len(value)
+        ttl = min(ttl, self._local_ttl) if ttl else self._local_ttl
+
+        with self._lock:
+            self._remove(key)
+            if entry_size > self._max_bytes:
+                return
+
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._size += entry_size
+            while self._size > self._max_bytes:
+                evicted, (evicted_value, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted) + len(evicted_value)
+                self._stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Drop a local entry; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(key) + len(entry[0])
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.get_bytes(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def fill(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        """Keep a value read from another tier locally, for at most its remaining `ttl`."""
+        if ttl is None or ttl > 0:
+            self._store(key, value, ttl)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        return [value for value, _ in self.get_many_with_ttl(keys)]
+
+    def get_many_with_ttl(self, keys: list[str]) -> list[tuple[Optional[bytes], Optional[float]]]:
+        """Local hits first, the rest with a single backend round trip."""
+        entries = [self._lookup(key) for key in keys]
+        missing = [index for index, (value, _) in enumerate(entries) if value is None]
+        if missing and self._backend is not None:
+            fetched = self._backend.get_many_with_ttl([keys[index] for index in missing])
+            for index, (value, ttl) in zip(missing, fetched, strict=True):
+                if value is not None:
+                    self.fill(keys[index], value, ttl)
+                    entries[index] = value, ttl
+        return entries
+
+    def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        self._store(key, value, ttl)
+        if self._backend is not None:
+            self._backend.set(key, value, ttl)
+
+    def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        for key, value in items.items():
+            self._store(key, value, ttl)
+        if self._backend is not None:
+            self._backend.set_many(items, ttl)
+
+    def delete(self, key: str) -> None:
+        self._discard(key)
+        if self._backend is not None:
+            self._backend.delete(key)
+
+
+class AsyncMemoryCache:
+    """In-process LRU tier in front of an AsyncCachePort, same policy as MemoryCache."""
+
+    def __init__(
+        self,
+        backend: AsyncCachePort,
+        max_bytes: int = 64 * 1024 * 1024,
+        local_ttl: int = 300,
+    ):
+        self._backend = backend
+        self._local = MemoryCache(max_bytes=max_bytes, local_ttl=local_ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._local.stats
+
+    @property
+    def size(self) -> int:
+        return self._local.size
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.get_bytes(key)
+        return value.decode("utf-8") if value is not None else None
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        return [value for value, _ in await self.get_many_with_ttl(keys)]
+
+    async def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> list[tuple[Optional[bytes], Optional[float]]]:
+        entries = self._local.get_many_with_ttl(keys)
+        missing = [index for index, (value, _) in enumerate(entries) if value is None]
+        if missing:
+            fetched = await self._backend.get_many_with_ttl([keys[index] for index in missing])
+            for index, (value, ttl) in zip(missing, fetched, strict=True):
+                if value is not None:
+                    self._local.fill(keys[index], value, ttl)
+                    entries[index] = value, ttl
+        return entries
+
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        self._local.set(key, value, ttl)
+        await self._backend.set(key, value, ttl)
+
+    async def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        self._local.set_many(items, ttl)
+        await self._backend.set_many(items, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._local.delete(key)
+        await self._backend.delete(key)
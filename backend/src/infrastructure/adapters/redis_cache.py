@@ -1,8 +1,20 @@
-from typing import Optional
+from typing import Optional, Union
 
 import redis
 
 
+def remaining(pttl: int) -> Optional[float]:
+    """Seconds left from a PTTL reply: None without expiry, 0 once the key is gone."""
+    if pttl == -1:
+        return None
+    return max(pttl, 0) / 1000
+
+
+def as_bytes(value: Union[bytes, str, None]) -> Optional[bytes]:
+    """A GET reply as bytes; clients created with decode_responses hand back str."""
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
 class RedisCache:
     """Redis implementation of CachePort."""
 
@@ -11,12 +23,42 @@ class RedisCache:
 
     def get(self, key: str) -> Optional[str]:
         try:
-            cached_data = self._redis.get(key)
+            cached_data = as_bytes(self._redis.get(key))
             return cached_data.decode("utf-8") if cached_data else None
         except redis.RedisError:
             return None
 
-    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Raw value, for binary payloads."""
+        try:
+            return as_bytes(self._redis.get(key))
+        except redis.RedisError:
+            return None
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Raw values in key order, one MGET round trip."""
+        if not keys:
+            return []
+        try:
+            return [as_bytes(value) for value in self._redis.mget(keys)]
+        except redis.RedisError:
+            return [None] * len(keys)
+
+    def get_many_with_ttl(self, keys: list[str]) -> list[tuple[Optional[bytes], Optional[float]]]:
+        """Raw values and their remaining ttls in key order, MGET and PTTLs in one round trip."""
+        if not keys:
+            return []
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.mget(keys)
+            for key in keys:
+                pipeline.pttl(key)
+            values, *ttls = pipeline.execute()
+        except redis.RedisError:
+            return [(None, None)] * len(keys)
+        return list(zip(map(as_bytes, values), map(remaining, ttls), strict=True))
+
+    def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
         try:
             if ttl:
                 self._redis.setex(key, ttl, value)
@@ -25,6 +67,21 @@ class RedisCache:
         except redis.RedisError:
             pass
 
+    def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        """Store all items in one pipelined round trip."""
+        if not items:
+            return
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for key, value in items.items():
+                if ttl:
+                    pipeline.setex(key, ttl, value)
+                else:
+                    pipeline.set(key, value)
+            pipeline.execute()
+        except redis.RedisError:
+            pass
+
     def delete(self, key: str) -> None:
         """Delete value from cache by key."""
         try:
@@ -0,0 +1,117 @@
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import redis
+
+from src.domain.entities.weather import WEATHER_VARIABLES, WeatherCoordinate
+from src.domain.services.grid import archive_grid, variable_key
+
+
+# first day of the archive, bit 0 of every bitmap
+ARCHIVE_EPOCH = date(1940, 1, 1)
+
+# bumped whenever stored locations move, so bitmaps of the old layout are never read again:
+# v2 since migration 5f0f73f109d1 merged locations into archive grid cells
+COVERAGE_PREFIX = "coverage:v2"
+
+# extends indexed locations only, a partial bitmap must never look like a loaded one
+MARK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    for _, offset in ipairs(ARGV) do
+        redis.call('SETBIT', KEYS[1], offset, 1)
+    end
+end
+"""
+
+
+class CoverageIndexBase:
+    """Key layout and bitmap decoding, shared by RedisCoverageIndex and AsyncRedisCoverageIndex."""
+
+    @staticmethod
+    def key(coordinate: WeatherCoordinate, variable: str = "temperature") -> str:
+        return variable_key(f"{COVERAGE_PREFIX}:{archive_grid.key(coordinate)}", variable)
+
+    @classmethod
+    def _location_keys(cls, coordinate: WeatherCoordinate) -> list[str]:
+        return [cls.key(coordinate, variable) for variable in WEATHER_VARIABLES]
+
+    @staticmethod
+    def _offsets(days: list[date]) -> list[int]:
+        return [(day - ARCHIVE_EPOCH).days for day in days if day >= ARCHIVE_EPOCH]
+
+    @staticmethod
+    def _byte_range(start: date, end: date) -> tuple[int, int]:
+        first = max((start - ARCHIVE_EPOCH).days, 0)
+        last = max((end - ARCHIVE_EPOCH).days, 0)
+        return first // 8, last // 8
+
+    @classmethod
+    def _decode(cls, data: bytes, start: date, end: date) -> list[bool]:
+        """Bits of [start, end] from the bytes GETRANGE returned for `_byte_range`."""
+        first, last = (start - ARCHIVE_EPOCH).days, (end - ARCHIVE_EPOCH).days
+        before_epoch = min(max(-first, 0), last - first + 1)
+        lower = max(first, 0)
+        # Redis numbers bits from the most significant one, as unpackbits does
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))[lower % 8 :]
+        covered = np.zeros(max(last - lower + 1, 0), dtype=bool)
+        # bitmaps end at their highest set bit, anything after is not covered
+        covered[: min(len(bits), len(covered))] = bits[: len(covered)]
+        return [False] * before_epoch + covered.tolist()
+
+
+class RedisCoverageIndex(CoverageIndexBase):
+    """
+    Redis implementation of CoveragePort.
+
+    One bitmap per grid cell and variable, bit n set when day n after ARCHIVE_EPOCH is
+    persisted; 30 years take about 1.4kB. A range is answered from one GETRANGE. Redis errors
+    report the location as not indexed, callers then fall back to the database.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self._redis = redis_client
+        self._mark = redis_client.register_script(MARK_SCRIPT)
+
+    def covered(
+        self, coordinate: WeatherCoordinate, start: date, end: date, variable: str = "temperature"
+    ) -> Optional[list[bool]]:
+        key = self.key(coordinate, variable)
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.exists(key)
+            pipeline.getrange(key, *self._byte_range(start, end))
+            exists, data = pipeline.execute()
+        except redis.RedisError:
+            return None
+        return self._decode(data, start, end) if exists else None
+
+    def load(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None:
+        key = self.key(coordinate, variable)
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.append(key, b"")  # an indexed location without days still exists
+            for offset in self._offsets(days):
+                pipeline.setbit(key, offset, 1)
+            pipeline.execute()
+        except redis.RedisError:
+            pass
+
+    def mark(
+        self, coordinate: WeatherCoordinate, days: list[date], variable: str = "temperature"
+    ) -> None:
+        offsets = self._offsets(days)
+        if not offsets:
+            return
+        try:
+            self._mark(keys=[self.key(coordinate, variable)], args=offsets)
+        except redis.RedisError:
+            pass
+
+    def clear(self, coordinate: WeatherCoordinate) -> None:
+        try:
+            self._redis.delete(*self._location_keys(coordinate))
+        except redis.RedisError:
+            pass
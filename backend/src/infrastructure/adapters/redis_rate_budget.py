@@ -0,0 +1,181 @@
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import redis
+
+from src.core.config import Settings, settings
+from src.core.exceptions import UpstreamBudgetExhausted
+from src.domain.services.priority import Priority
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    calls: float
+    seconds: float
+
+
+# Open-Meteo's free tier, see https://open-meteo.com/en/terms
+OPEN_METEO_LIMITS = (RateLimit(600, 60), RateLimit(5_000, 3_600), RateLimit(10_000, 86_400))
+
+# One token bucket per limit, refilled continuously; all are charged or none. Calls dearer than
+# a whole bucket go through once it is full and leave a debt. Answers 0 when granted, else the
+# milliseconds to wait. KEYS: pause, bucket per limit. ARGV: cost, reserve, (calls, ms) per limit
+ACQUIRE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local paused = tonumber(redis.call('GET', KEYS[1]) or '0')
+if paused > now then
+    return paused - now
+end
+
+local cost, reserve = tonumber(ARGV[1]), tonumber(ARGV[2])
+local levels, wait = {}, 0
+for i = 2, #KEYS do
+    local capacity, period = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'at')
+    local tokens = tonumber(state[1]) or capacity
+    local at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - at) * capacity / period)
+    levels[i] = tokens
+    local needed = math.min(cost + reserve * capacity, capacity)
+    if tokens < needed then
+        wait = math.max(wait, math.ceil((needed - tokens) * period / capacity))
+    end
+end
+if wait > 0 then
+    return wait
+end
+
+for i = 2, #KEYS do
+    redis.call('HSET', KEYS[i], 'tokens', tostring(levels[i] - cost), 'at', now)
+    redis.call('PEXPIRE', KEYS[i], ARGV[2 * i])
+end
+return 0
+"""
+
+# Pauses every worker, doubling with each rate-limited response until none came for
+# `strike_memory`. Responses of calls sent before the pause do not escalate it.
+# KEYS: pause, strikes. ARGV: base ms, max ms, retry-after ms, strike memory ms
+THROTTLE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local paused = tonumber(redis.call('GET', KEYS[1]) or '0')
+if paused > now then
+    return paused - now
+end
+
+local strikes = redis.call('INCR', KEYS[2])
+redis.call('PEXPIRE', KEYS[2], ARGV[4])
+local pause = math.min(tonumber(ARGV[1]) * 2 ^ (strikes - 1), tonumber(ARGV[2]))
+pause = math.floor(math.max(pause, tonumber(ARGV[3])))
+redis.call('SET', KEYS[1], tostring(now + pause), 'PX', pause)
+return pause
+"""
+
+
+@dataclass(frozen=True)
+class RateBudgetPolicy:
+    """
+    Limits and back-off of one upstream, shared by all workers through `name`.
+
+    Backfills leave a `reserve` share of each bucket to interactive calls and wait as long as
+    it takes; interactive calls give up after `interactive_wait` seconds. Rate-limited responses
+    pause all workers, from `base_pause` doubling up to `max_pause` seconds, or for as long as
+    upstream asks.
+    """
+
+    limits: tuple[RateLimit, ...] = OPEN_METEO_LIMITS
+    name: str = "open-meteo"
+    reserve: float = 0.2
+    interactive_wait: float = 10.0
+    base_pause: float = 1.0
+    max_pause: float = 300.0
+    strike_memory: float = 600.0
+
+    @property
+    def pause_key(self) -> str:
+        return f"budget:{self.name}:pause"
+
+    def acquire_args(self, cost: float, priority: Priority) -> tuple[list[str], list[float]]:
+        reserve = self.reserve if priority is Priority.BACKFILL else 0.0
+        keys, args = [self.pause_key], [cost, reserve]
+        for limit in self.limits:
+            keys.append(f"budget:{self.name}:{limit.seconds:g}s")
+            # PEXPIRE only takes whole milliseconds
+            args.extend([limit.calls, int(limit.seconds * 1000)])
+        return keys, args
+
+    def throttle_args(self, retry_after: Optional[float]) -> tuple[list[str], list[int]]:
+        return [self.pause_key, f"budget:{self.name}:strikes"], [
+            int(self.base_pause * 1000),
+            int(self.max_pause * 1000),
+            int((retry_after or 0) * 1000),
+            int(self.strike_memory * 1000),
+        ]
+
+    def deadline(self, priority: Priority) -> float:
+        if priority is Priority.BACKFILL:
+            return float("inf")
+        return time.monotonic() + self.interactive_wait
+
+    @staticmethod
+    def delay(wait_ms: int, deadline: float) -> float:
+        """Seconds to sleep before asking again; jittered so waiting workers don't line up."""
+        delay = wait_ms / 1000 * random.uniform(1.0, 1.1)
+        if time.monotonic() + delay > deadline:
+            raise UpstreamBudgetExhausted(
+                f"upstream budget frees up in {wait_ms / 1000:.1f}s", retry_after=wait_ms / 1000
+            )
+        return delay
+
+
+def open_meteo_policy(config: Settings = settings) -> RateBudgetPolicy:
+    return RateBudgetPolicy(
+        limits=(
+            RateLimit(config.OPEN_METEO_CALLS_PER_MINUTE, 60),
+            RateLimit(config.OPEN_METEO_CALLS_PER_HOUR, 3_600),
+            RateLimit(config.OPEN_METEO_CALLS_PER_DAY, 86_400),
+        ),
+        reserve=config.OPEN_METEO_BACKFILL_RESERVE,
+    )
+
+
+class RedisRateBudget:
+    """
+    Implements RateBudgetPort
+    Token buckets in redis, one per limit of the policy, so every worker draws from the same
+    budget. Without redis calls are not held back.
+    """
+
+    def __init__(self, redis_client: redis.Redis, policy: RateBudgetPolicy = RateBudgetPolicy()):
+        self._policy = policy
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._throttle = redis_client.register_script(THROTTLE_SCRIPT)
+
+    def acquire(self, cost: float, priority: Priority = Priority.INTERACTIVE) -> None:
+        keys, args = self._policy.acquire_args(cost, priority)
+        deadline = self._policy.deadline(priority)
+        while True:
+            try:
+                wait_ms = self._acquire(keys=keys, args=args)
+            except redis.RedisError as exc:
+                logger.warning(f"rate budget unavailable, not holding back: {exc}")
+                return
+            if not wait_ms:
+                return
+            time.sleep(self._policy.delay(wait_ms, deadline))
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        keys, args = self._policy.throttle_args(retry_after)
+        try:
+            pause_ms = self._throttle(keys=keys, args=args)
+        except redis.RedisError as exc:
+            logger.warning(f"rate budget unavailable, cannot back off: {exc}")
+            return
+        logger.warning(f"upstream rate limit hit, pausing all workers for {pause_ms / 1000:.1f}s")
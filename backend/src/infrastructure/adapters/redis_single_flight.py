@@ -0,0 +1,134 @@
+import threading
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+import redis
+from redis.client import PubSub
+
+
+T = TypeVar("T")
+
+# deletes the lock only while still holding it, then wakes the waiting workers
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+redis.call('PUBLISH', KEYS[2], ARGV[1])
+"""
+
+# extends the lock only while still holding it, 0 once it expired or was taken over
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _pubsub(client: redis.Redis) -> PubSub:
+    """A PubSub skipping subscribe confirmations; redis-py leaves `pubsub()` unannotated."""
+    pubsub: Callable[..., PubSub] = client.pubsub
+    return pubsub(ignore_subscribe_messages=True)
+
+
+class RedisSingleFlight:
+    """
+    Redis implementation of SingleFlightPort.
+
+    Threads of one process share a future per key. Its leader takes a redis lock
+    (`SET NX PX lock_ttl`) for all workers and extends it every third of `lock_ttl` while `call`
+    runs, so fetches of many chunks keep it. A leader that finds the lock taken subscribes to the
+    lock's channel and waits for the holder's release, polling every `poll_interval` whether the
+    lock expired because its holder died. Without redis every process runs `call` itself.
+    """
+
+    def __init__(
+        self, redis_client: redis.Redis, lock_ttl: float = 30.0, poll_interval: float = 1.0
+    ):
+        self._redis = redis_client
+        self._lock_ttl = lock_ttl
+        self._poll_interval = poll_interval
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._extend = redis_client.register_script(EXTEND_SCRIPT)
+        self._flights: dict[str, Future[Any]] = {}
+        self._flights_lock = threading.Lock()
+
+    @staticmethod
+    def keys(key: str) -> tuple[str, str]:
+        """The lock and the channel its release is announced on."""
+        return f"flight:{key}", f"flight:{key}:done"
+
+    def do(self, key: str, call: Callable[[], T]) -> T:
+        with self._flights_lock:
+            flight: Optional[Future[T]] = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            result = self._across_workers(key, call)
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+
+    def _across_workers(self, key: str, call: Callable[[], T]) -> T:
+        lock, channel = self.keys(key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = self._redis.set(lock, token, nx=True, px=int(self._lock_ttl * 1000))
+        except redis.RedisError:
+            return call()
+
+        if not acquired:
+            self._wait(lock, channel)
+            return call()
+        try:
+            with self._held(lock, token):
+                return call()
+        finally:
+            try:
+                self._release(keys=[lock, channel], args=[token])
+            except redis.RedisError:
+                pass  # the lock expires after lock_ttl, waiters poll for that
+
+    @contextmanager
+    def _held(self, lock: str, token: str) -> Iterator[None]:
+        """Keeps extending the lock from a watchdog thread until the block exits."""
+        done = threading.Event()
+
+        def extend() -> None:
+            while not done.wait(self._lock_ttl / 3):
+                try:
+                    if not self._extend(keys=[lock], args=[token, int(self._lock_ttl * 1000)]):
+                        return  # lost, another worker may be fetching by now
+                except redis.RedisError:
+                    return
+
+        threading.Thread(target=extend, name=f"{lock}:watchdog", daemon=True).start()
+        try:
+            yield
+        finally:
+            done.set()
+
+    def _wait(self, lock: str, channel: str) -> None:
+        pubsub = _pubsub(self._redis)
+        try:
+            pubsub.subscribe(channel)
+            # checked after subscribing, a release in between is not missed
+            while self._redis.exists(lock):
+                if pubsub.get_message(timeout=self._poll_interval) is not None:
+                    return
+        except redis.RedisError:
+            pass
+        finally:
+            pubsub.close()
@@ -1,6 +1,7 @@
 import os
 
 import redis
+import redis.asyncio
 
 
 class RedisConfig:
@@ -20,3 +21,14 @@ class RedisConfig:
             socket_timeout=5,
             socket_connect_timeout=5,
         )
+
+    def async_client(self) -> redis.asyncio.Redis:
+        return redis.asyncio.Redis(
+            host=self.host,
+            port=self.port,
+            db=self.db,
+            password=self.password,
+            decode_responses=False,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+        )
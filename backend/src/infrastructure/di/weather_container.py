@@ -1,23 +1,296 @@
-from src.application.services.weather_service import WeatherService
+import asyncio
+import logging
+import threading
+from typing import Optional, Union
+
+import httpx
+import redis
+import redis.asyncio
+from sqlalchemy import text
+
+from src.application.services.weather_service import AsyncWeatherService, WeatherService
+from src.core.config import settings
+from src.core.exceptions import ChangingweatherException
+from src.domain.ports.weather_command_port import (
+    AsyncWeatherCommandPort,
+    WeatherCommandPort,
+)
+from src.domain.services.archive import Archive
+from src.infrastructure.adapters.async_redis_cache import AsyncRedisCache
+from src.infrastructure.adapters.async_redis_coverage_index import (
+    AsyncRedisCoverageIndex,
+)
+from src.infrastructure.adapters.async_redis_rate_budget import AsyncRedisRateBudget
+from src.infrastructure.adapters.async_redis_single_flight import AsyncRedisSingleFlight
+from src.infrastructure.adapters.memory_cache import (
+    AsyncMemoryCache,
+    CacheStats,
+    MemoryCache,
+)
 from src.infrastructure.adapters.redis_cache import RedisCache
+from src.infrastructure.adapters.redis_coverage_index import RedisCoverageIndex
+from src.infrastructure.adapters.redis_rate_budget import (
+    RedisRateBudget,
+    open_meteo_policy,
+)
+from src.infrastructure.adapters.redis_single_flight import RedisSingleFlight
 from src.infrastructure.config.redis_config import RedisConfig
+from src.infrastructure.services.async_command_adapter import AsyncCommandAdapter
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+from src.infrastructure.services.async_packed_command_adapter import (
+    AsyncPackedCommandAdapter,
+)
+from src.infrastructure.services.async_packed_stored_query_adapter import (
+    AsyncPackedStoredQueryAdapter,
+)
+from src.infrastructure.services.async_query_adapter import AsyncQueryAdapter
+from src.infrastructure.services.async_stored_query_adapter import (
+    AsyncStoredQueryAdapter,
+)
+from src.infrastructure.services.async_write_behind_command_adapter import (
+    AsyncWriteBehindCommandAdapter,
+)
 from src.infrastructure.services.command_adapter import CommandAdapter
 from src.infrastructure.services.open_meteo import OpenMeteoAdapter
+from src.infrastructure.services.packed_command_adapter import PackedCommandAdapter
+from src.infrastructure.services.packed_stored_query_adapter import (
+    PackedStoredQueryAdapter,
+)
 from src.infrastructure.services.query_adapter import QueryAdapter
+from src.infrastructure.services.stored_query_adapter import StoredQueryAdapter
+from src.infrastructure.services.write_behind_command_adapter import (
+    WriteBehindCommandAdapter,
+)
 
 
-def weather_service() -> WeatherService:
-    from src.db.session import SessionLocal
+logger = logging.getLogger(__name__)
+
+
+class WeatherContainer:
+    """
+    Application-scoped clients and services.
+
+    Everything holding a connection pool (redis, httpx, SQLAlchemy engines) is created once in
+    `startup`, shared by all requests and closed in `shutdown`. The blocking `weather_service`
+    with its upstream thread pool and requests-cache session is only built on its first call.
+    Hot cache entries are kept in process memory in front of redis, up to `memory_cache_bytes`
+    per service; redis misses are answered from postgres, through the read-only engine, before
+    going upstream. A redis bitmap per location indexes the stored days, so postgres is only
+    queried for days it holds. Concurrent misses of the same location and range are fetched
+    once across all workers, coordinated through redis. Upstream calls of all workers draw from
+    one rate budget in redis, see `open_meteo_policy`.
+    With `packed_storage` series are persisted one row per location and day (`weather_days`)
+    instead of one row per hour. With `write_behind` they are persisted from a background
+    queue, responses only wait for the cache write; `shutdown` flushes the queue.
+    """
+
+    def __init__(
+        self,
+        redis_config: Optional[RedisConfig] = None,
+        memory_cache_bytes: int = 64 * 1024 * 1024,
+        packed_storage: bool = False,
+        write_behind: bool = False,
+    ):
+        self._redis_config = redis_config or RedisConfig()
+        self._memory_cache_bytes = memory_cache_bytes
+        self._packed_storage = packed_storage
+        self._write_behind = write_behind
+        self._archive = Archive(settings.OPEN_METEO_ARCHIVE_DELAY_DAYS)
+        self._started = False
+        self._sync_lock = threading.Lock()
+        self._command_port: Optional[WriteBehindCommandAdapter] = None
+        self._async_command_port: Optional[AsyncWriteBehindCommandAdapter] = None
+        self._memory_cache: Optional[MemoryCache] = None
+        self._async_memory_cache: Optional[AsyncMemoryCache] = None
+        self._redis_client: Optional[redis.Redis] = None
+        self._async_redis_client: Optional[redis.asyncio.Redis] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._api_adapter: Optional[OpenMeteoAdapter] = None
+        self._weather_service: Optional[WeatherService] = None
+        self._async_weather_service: Optional[AsyncWeatherService] = None
+
+    async def startup(self) -> None:
+        """Builds the async stack the API serves from; the sync one waits for its first use."""
+        from src.db.session import AsyncReadSessionLocal, AsyncSessionLocal
+
+        self._async_redis_client = async_redis_client = self._redis_config.async_client()
+        self._http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            transport=httpx.AsyncHTTPTransport(retries=3),
+        )
+        self._async_memory_cache = AsyncMemoryCache(
+            backend=AsyncRedisCache(async_redis_client), max_bytes=self._memory_cache_bytes
+        )
+
+        async_stored: type[AsyncStoredQueryAdapter]
+        async_command: type[AsyncCommandAdapter]
+        if self._packed_storage:
+            async_stored, async_command = AsyncPackedStoredQueryAdapter, AsyncPackedCommandAdapter
+        else:
+            async_stored, async_command = AsyncStoredQueryAdapter, AsyncCommandAdapter
+
+        async_coverage = AsyncRedisCoverageIndex(async_redis_client)
+        async_command_port: AsyncWeatherCommandPort = async_command(
+            session_factory=AsyncSessionLocal, coverage=async_coverage, archive=self._archive
+        )
+        if self._write_behind:
+            async_command_port = self._async_command_port = AsyncWriteBehindCommandAdapter(
+                async_command_port
+            )
+            self._async_command_port.start()
+
+        self._async_weather_service = AsyncWeatherService(
+            query_port=async_stored(
+                cache=AsyncQueryAdapter(cache=self._async_memory_cache),
+                session_factory=AsyncReadSessionLocal,
+                coverage=async_coverage,
+                archive=self._archive,
+            ),
+            command_port=async_command_port,
+            api_port=AsyncOpenMeteoAdapter(
+                client=self._http_client,
+                budget=AsyncRedisRateBudget(async_redis_client, open_meteo_policy()),
+            ),
+            single_flight=AsyncRedisSingleFlight(async_redis_client),
+        )
+        self._started = True
+
+        await self._warm_up(async_redis_client)
+
+    def _build_sync(self) -> WeatherService:
+        """
+        The blocking stack for callers outside the event loop: its own redis client, upstream
+        thread pool and requests-cache session, and a write-behind thread if enabled.
+        """
+        from src.db.session import ReadSessionLocal, SessionLocal
+
+        self._redis_client = redis_client = self._redis_config.client()
+        self._api_adapter = OpenMeteoAdapter(
+            budget=RedisRateBudget(redis_client, open_meteo_policy())
+        )
+        self._memory_cache = MemoryCache(
+            backend=RedisCache(redis_client), max_bytes=self._memory_cache_bytes
+        )
+
+        stored: type[StoredQueryAdapter]
+        command: type[CommandAdapter]
+        if self._packed_storage:
+            stored, command = PackedStoredQueryAdapter, PackedCommandAdapter
+        else:
+            stored, command = StoredQueryAdapter, CommandAdapter
 
-    redis_config = RedisConfig()
-    redis_client = redis_config.client()
-    cache = RedisCache(redis_client)
+        coverage = RedisCoverageIndex(redis_client)
+        command_port: WeatherCommandPort = command(
+            session_factory=SessionLocal, coverage=coverage, archive=self._archive
+        )
+        if self._write_behind:
+            command_port = self._command_port = WriteBehindCommandAdapter(command_port)
 
-    query_adapter = QueryAdapter(cache=cache)
-    command_adapter = CommandAdapter(session_factory=SessionLocal)
+        return WeatherService(
+            query_port=stored(
+                cache=QueryAdapter(cache=self._memory_cache),
+                session_factory=ReadSessionLocal,
+                coverage=coverage,
+                archive=self._archive,
+            ),
+            command_port=command_port,
+            api_port=self._api_adapter,
+            single_flight=RedisSingleFlight(redis_client),
+        )
+
+    @staticmethod
+    async def _warm_up(async_redis_client: redis.asyncio.Redis) -> None:
+        """Open one connection per pool so the first requests don't pay for the handshakes."""
+        from src.db.session import async_engine
+
+        try:
+            await async_redis_client.ping()
+        except redis.RedisError as exc:
+            # the cache is optional, requests fall through to upstream
+            logger.warning(f"redis warm-up failed: {exc}")
+
+        try:
+            async with async_engine.connect() as async_connection:
+                await async_connection.execute(text("SELECT 1"))
+        except Exception as exc:
+            logger.warning(f"database warm-up failed: {exc}")
+
+    async def shutdown(self) -> None:
+        from src.db.session import async_engine, async_read_engine, engine, read_engine
+
+        # pending writes go out before the engines are disposed
+        if self._async_command_port is not None:
+            await self._async_command_port.close()
+        if self._command_port is not None:
+            await asyncio.to_thread(self._command_port.close)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._async_redis_client is not None:
+            await self._async_redis_client.aclose()
+        if self._redis_client is not None:
+            self._redis_client.close()
+        if self._api_adapter is not None:
+            self._api_adapter.close()
+        await async_engine.dispose()
+        engine.dispose()
+        if read_engine is not engine:
+            await async_read_engine.dispose()
+            read_engine.dispose()
+
+        self._started = False
+        self._weather_service = None
+        self._async_weather_service = None
+        self._redis_client = None
+        self._api_adapter = None
+        self._memory_cache = None
+        self._async_memory_cache = None
+        self._command_port = None
+        self._async_command_port = None
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """Counters of the in-process cache tiers, e.g. for a metrics endpoint."""
+        stats = {}
+        if self._memory_cache is not None:
+            stats["sync"] = self._memory_cache.stats
+        if self._async_memory_cache is not None:
+            stats["async"] = self._async_memory_cache.stats
+        return stats
+
+    @staticmethod
+    def pool_stats() -> dict[str, dict[str, Union[int, float]]]:
+        """Occupancy and checkout wait metrics of the database pools."""
+        from src.db.engine import pool_status
+        from src.db.session import async_engine, async_read_engine, engine, read_engine
+
+        stats = {"sync": pool_status(engine), "async": pool_status(async_engine)}
+        if read_engine is not engine:
+            stats["sync_read"] = pool_status(read_engine)
+            stats["async_read"] = pool_status(async_read_engine)
+        return stats
+
+    def weather_service(self) -> WeatherService:
+        if not self._started:
+            raise ChangingweatherException("WeatherContainer has not been started")
+        with self._sync_lock:
+            if self._weather_service is None:
+                self._weather_service = self._build_sync()
+            return self._weather_service
+
+    def async_weather_service(self) -> AsyncWeatherService:
+        if self._async_weather_service is None:
+            raise ChangingweatherException("WeatherContainer has not been started")
+        return self._async_weather_service
+
+
+container = WeatherContainer(
+    packed_storage=settings.WEATHER_PACKED_STORAGE, write_behind=settings.WEATHER_WRITE_BEHIND
+)
+
+
+def weather_service() -> WeatherService:
+    return container.weather_service()
 
-    api_adapter = OpenMeteoAdapter()
 
-    return WeatherService(
-        query_port=query_adapter, command_port=command_adapter, api_port=api_adapter
-    )
+def async_weather_service() -> AsyncWeatherService:
+    return container.async_weather_service()
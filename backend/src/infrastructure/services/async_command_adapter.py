@@ -0,0 +1,97 @@
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.exceptions import ChangingweatherException
+from src.domain.entities.weather import WeatherCoordinate, WeatherData
+from src.domain.ports.coverage_port import AsyncCoveragePort
+from src.domain.services.archive import Archive, archive
+from src.infrastructure.services.command_adapter import CREATE_STAGING, CommandBase
+from src.models.weather_data import WeatherMeasurementRecord
+
+
+class AsyncCommandAdapter(CommandBase):
+    """
+    Implements AsyncWeatherCommandPort
+    Handles writing weather data to db through an async engine, with the same statements and
+    COPY / multi-row upsert paths as CommandAdapter
+
+    Subclasses storing another layout override the CommandBase helpers and `_write`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 5_000,
+        use_copy: bool = True,
+        coverage: Optional[AsyncCoveragePort] = None,
+        archive: Archive = archive,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._use_copy = use_copy
+        self._coverage = coverage
+        self._archive = archive
+        self._partition_years: set[int] = set()
+        self._location_ids: dict[tuple[int, int], int] = {}
+
+    async def _copy(self, session: AsyncSession, data: WeatherData, location_id: int) -> None:
+        await session.execute(text(CREATE_STAGING))
+        connection = await session.connection()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        if driver_connection is None:
+            raise ChangingweatherException("COPY needs an open psycopg connection")
+        async with driver_connection.cursor() as cursor:
+            async with cursor.copy(self._copy_sql()) as copy:
+                for row in self._tuples(data, location_id):
+                    await copy.write_row(row)
+        await session.execute(self._upsert_staged())
+
+    async def _insert(self, session: AsyncSession, data: WeatherData, location_id: int) -> None:
+        rows = self._rows(data, location_id)
+        for offset in range(0, len(rows), self._batch_size):
+            await session.execute(
+                self._upsert(
+                    insert(WeatherMeasurementRecord).values(
+                        rows[offset : offset + self._batch_size]
+                    )
+                )
+            )
+
+    async def _write(self, session: AsyncSession, data: WeatherData, location_id: int) -> None:
+        if self._use_copy and session.get_bind().dialect.driver == "psycopg":
+            await self._copy(session, data, location_id)
+        else:
+            await self._insert(session, data, location_id)
+
+    async def cache(self, data: WeatherData) -> None:
+        final = self._final(data, self._archive)
+        if final is None:
+            return
+
+        years = self._years(final)
+        cell = self._cell(final.coordinate)
+        async with self._session_factory() as session:
+            location_id = self._location_ids.get(cell)
+            if location_id is None:
+                result = await session.execute(self._upsert_location(final.coordinate))
+                location_id = result.scalar_one()
+            if not self._partition_years.issuperset(years):
+                await session.execute(self._ensure_partitions(years))
+            await self._write(session, final, location_id)
+            await session.commit()
+        self._location_ids[cell] = location_id
+        self._partition_years.update(years)
+        if self._coverage is not None:
+            days = [day for day, _ in final.series.days()]
+            for variable in final.series.values:
+                await self._coverage.mark(final.coordinate, days, variable)
+
+    async def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
+        async with self._session_factory() as session:
+            await session.execute(self._delete(coordinate))
+            await session.commit()
+        if self._coverage is not None:
+            await self._coverage.clear(coordinate)
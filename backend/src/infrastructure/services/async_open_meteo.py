@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+import httpx
+import pandas as pd
+from openmeteo_requests import OpenMeteoRequestsError
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from src.domain.entities.weather import (
+    DEFAULT_VARIABLES,
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+)
+from src.domain.ports.rate_budget_port import AsyncRateBudgetPort
+from src.domain.services.grid import archive_grid
+from src.domain.services.priority import current_priority
+from src.infrastructure.services.open_meteo import (
+    ChunkRequest,
+    OpenMeteoBase,
+    transient,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOpenMeteoAdapter(OpenMeteoBase):
+    """
+    Non-blocking adapter for OpenMeteo historical weather api
+    Implements AsyncWeatherApiPort
+
+    Uses a shared, pooled httpx.AsyncClient. Chunking, batching and mapping are shared with
+    OpenMeteoAdapter through OpenMeteoBase; chunks run concurrently, bounded by a semaphore.
+    With a `budget` calls are scheduled like OpenMeteoAdapter's, honouring Retry-After on 429
+    responses.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_concurrency: int = 4,
+        chunk_retries: int = 2,
+        batch_size: int = 100,
+        retry_backoff: float = 0.2,
+        budget: Optional[AsyncRateBudgetPort] = None,
+    ):
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._chunk_retries = chunk_retries
+        self._batch_size = batch_size
+        self._retry_backoff = retry_backoff
+        self._budget = budget
+
+    @staticmethod
+    def _parse(content: bytes) -> list[WeatherApiResponse]:
+        """Split the size-prefixed flatbuffers stream into one response per location."""
+        messages = []
+        position = 0
+        while position < len(content):
+            length = int.from_bytes(content[position : position + 4], byteorder="little")
+            # errors inside the stream start with "Unexpected"
+            if length == 0x78656E55:
+                raise OpenMeteoRequestsError(content[position:].decode("utf-8"))
+            messages.append(WeatherApiResponse.GetRootAs(content, position + 4))
+            position += length + 4
+        return messages
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    async def _fetch_chunk(
+        self,
+        coordinates: list[WeatherCoordinate],
+        start: date,
+        end: date,
+        variables: tuple[str, ...] = DEFAULT_VARIABLES,
+    ) -> list[pd.DataFrame]:
+        params = {
+            **self._params(coordinates, start, end, variables),
+            "format": "flatbuffers",
+        }
+        if self._budget is not None:
+            await self._budget.acquire(self._cost(params), current_priority())
+        async with self._semaphore:
+            response = await self._client.get(self.url, params=params)
+
+        if response.status_code == 429 and self._budget is not None:
+            await self._budget.throttle(self._retry_after(response))
+        if response.status_code in (400, 429):
+            raise OpenMeteoRequestsError(response.json())
+        response.raise_for_status()
+        return [self._to_frame(location, variables) for location in self._parse(response.content)]
+
+    async def _fetch_chunks(self, requests: list[ChunkRequest]) -> list[list[pd.DataFrame]]:
+        """Fetch all chunks concurrently, retrying only the ones that failed transiently."""
+        frames: dict[int, list[pd.DataFrame]] = {}
+        pending = list(range(len(requests)))
+
+        for attempt in range(self._chunk_retries + 1):
+            results = await asyncio.gather(
+                *(self._fetch_chunk(*requests[index]) for index in pending),
+                return_exceptions=True,
+            )
+            errors: dict[int, BaseException] = {}
+            for index, result in zip(pending, results, strict=True):
+                if isinstance(result, BaseException) and not transient(result):
+                    raise result
+                if isinstance(result, BaseException):
+                    _, start, end, _ = requests[index]
+                    logger.warning(f"chunk {start}:{end} failed (attempt {attempt + 1}): {result}")
+                    errors[index] = result
+                else:
+                    frames[index] = result
+
+            if not errors:
+                break
+            if attempt == self._chunk_retries:
+                raise next(iter(errors.values()))
+            pending = list(errors)
+            await asyncio.sleep(self._retry_backoff * 2**attempt)
+
+        return [frames[index] for index in range(len(requests))]
+
+    async def _fetch_windows(self, windows: list[ChunkRequest]) -> list[list[pd.DataFrame]]:
+        requests, layout = self._plan(windows, self._batch_size)
+        return self._assemble(layout, await self._fetch_chunks(requests))
+
+    async def fetch(self, options: WeatherQueryOptions) -> pd.DataFrame:
+        options = archive_grid.normalize(options)
+        windows = [([options.coordinate], options.start, options.end, options.variables)]
+        return (await self._fetch_windows(windows))[0][0]
+
+    async def fetch_many(self, options: list[WeatherQueryOptions]) -> list[pd.DataFrame]:
+        windows, indices = self._group_windows(options)
+        return self._ungroup(indices, await self._fetch_windows(windows))
+
+    async def get(self, options: WeatherQueryOptions) -> WeatherData:
+        return self.map(await self.fetch(options), options)
+
+    async def get_many(self, options: list[WeatherQueryOptions]) -> list[WeatherData]:
+        return [
+            self.map(frame, option)
+            for frame, option in zip(await self.fetch_many(options), options, strict=True)
+        ]
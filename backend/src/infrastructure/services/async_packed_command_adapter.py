@@ -0,0 +1,42 @@
+from typing import Callable, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.weather import WeatherData
+from src.domain.ports.coverage_port import AsyncCoveragePort
+from src.domain.services.archive import Archive, archive
+from src.infrastructure.services.async_command_adapter import AsyncCommandAdapter
+from src.infrastructure.services.packed_command_adapter import PackedCommandBase
+from src.models.weather_day import WeatherDayRecord
+
+
+class AsyncPackedCommandAdapter(PackedCommandBase, AsyncCommandAdapter):
+    """
+    Implements AsyncWeatherCommandPort
+    Non-blocking counterpart of PackedCommandAdapter
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 1_000,
+        coverage: Optional[AsyncCoveragePort] = None,
+        archive: Archive = archive,
+    ):
+        super().__init__(
+            session_factory=session_factory,
+            batch_size=batch_size,
+            use_copy=False,
+            coverage=coverage,
+            archive=archive,
+        )
+
+    async def _write(self, session: AsyncSession, data: WeatherData, location_id: int) -> None:
+        rows = self._day_rows(data, location_id)
+        for offset in range(0, len(rows), self._batch_size):
+            await session.execute(
+                self._upsert(
+                    insert(WeatherDayRecord).values(rows[offset : offset + self._batch_size])
+                )
+            )
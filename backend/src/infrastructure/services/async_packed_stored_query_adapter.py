@@ -0,0 +1,14 @@
+from src.infrastructure.services.async_stored_query_adapter import (
+    AsyncStoredQueryAdapter,
+)
+from src.infrastructure.services.packed_stored_query_adapter import (
+    PackedStoredQueryBase,
+)
+
+
+class AsyncPackedStoredQueryAdapter(PackedStoredQueryBase, AsyncStoredQueryAdapter):
+    """
+
+    Implements AsyncWeatherQueryPort
+    Non-blocking counterpart of PackedStoredQueryAdapter
+    """
@@ -0,0 +1,38 @@
+import logging
+
+from src.domain.entities.weather import WeatherData, WeatherQueryOptions, WeatherSeries
+from src.domain.ports.cache_port import AsyncCachePort
+from src.infrastructure.services.query_adapter import QueryAdapterBase, range_days
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncQueryAdapter(QueryAdapterBase):
+    """
+
+    Implements AsyncWeatherQueryPort
+    Same day segments and payload format as QueryAdapter, so both can share one cache.
+    """
+
+    def __init__(self, cache: AsyncCachePort, compress: bool = True):
+        super().__init__(compress=compress)
+        self._cache = cache
+
+    async def get(self, options: WeatherQueryOptions) -> WeatherData:
+        """Cached data if every day of the range is cached, empty otherwise."""
+        cached, missing = await self.lookup(options)
+        if missing:
+            return self.map_to_model(WeatherSeries.empty(options.variables), options)
+        return cached
+
+    async def lookup(
+        self, options: WeatherQueryOptions
+    ) -> tuple[WeatherData, list[WeatherQueryOptions]]:
+        """Cached part of the range plus the sub-ranges that are not cached."""
+        days = range_days(options)
+        keys = self._keys(options, days)
+        return self._assemble(options, days, keys, await self._cache.get_many(keys))
+
+    async def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None:
+        await self._cache.set_many(self._segments(data, options), self._cache_ttl)
@@ -0,0 +1,109 @@
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.domain.ports.coverage_port import AsyncCoveragePort
+from src.domain.ports.weather_query_port import AsyncWeatherQueryPort
+from src.domain.services.archive import Archive, archive
+from src.infrastructure.services.stored_query_adapter import StoredQueryBase
+
+
+class AsyncStoredQueryAdapter(StoredQueryBase):
+    """
+
+    Implements AsyncWeatherQueryPort
+    Non-blocking counterpart of StoredQueryAdapter, with the same statements and decoding
+    """
+
+    def __init__(
+        self,
+        cache: AsyncWeatherQueryPort,
+        session_factory: Callable[[], AsyncSession],
+        coverage: Optional[AsyncCoveragePort] = None,
+        archive: Archive = archive,
+    ):
+        self._cache = cache
+        self._session_factory = session_factory
+        self._coverage = coverage
+        self._archive = archive
+
+    async def get(self, options: WeatherQueryOptions) -> WeatherData:
+        """Available data if the whole range is cached or stored, empty otherwise."""
+        available, missing = await self.lookup(options)
+        if missing:
+            return self.map_to_model(WeatherSeries.empty(options.variables), options)
+        return available
+
+    async def lookup(
+        self, options: WeatherQueryOptions
+    ) -> tuple[WeatherData, list[WeatherQueryOptions]]:
+        cached, missing = await self._cache.lookup(options)
+        if not missing:
+            return cached, missing
+
+        found: list[WeatherSeries] = []
+        uncovered: dict[str, list[date]] = {}
+        async with self._session_factory() as session:
+            for variable, ranges in self._by_variable(missing).items():
+                candidates = (
+                    await self._stored_ranges(session, options.coordinate, ranges, variable)
+                    if self._stores(variable)
+                    else []
+                )
+                rows: Sequence[Any] = []
+                if candidates:
+                    result = await session.execute(
+                        self._statement(options.coordinate, candidates, variable)
+                    )
+                    rows = result.all()
+                stored, uncovered[variable] = self._split(
+                    ranges, self._series(rows, variable), self._archive
+                )
+                if len(stored):
+                    await self._cache.cache(self.map_to_model(stored, options), self._span(ranges))
+                    found.append(stored)
+
+        return (
+            self.map_to_model(WeatherSeries.overlay([cached.series, *found]), options),
+            self._regroup(options.coordinate, uncovered),
+        )
+
+    async def read(
+        self, coordinate: WeatherCoordinate, start: datetime, end: datetime
+    ) -> WeatherSeries:
+        """Stored points with start <= timestamp < end, bypassing the cache tier."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                self._statement(coordinate, self._window(coordinate, start, end))
+            )
+            rows = result.all()
+        return self._series(rows).between(start, end)
+
+    async def _stored_ranges(
+        self,
+        session: AsyncSession,
+        coordinate: WeatherCoordinate,
+        missing: list[WeatherQueryOptions],
+        variable: str = "temperature",
+    ) -> list[WeatherQueryOptions]:
+        if self._coverage is None:
+            return missing
+
+        start, end = missing[0].start, missing[-1].end
+        covered = await self._coverage.covered(coordinate, start, end, variable)
+        if covered is None:
+            result = await session.execute(self._days_statement(coordinate, variable))
+            stored_days = list(result.scalars())
+            await self._coverage.load(coordinate, stored_days, variable)
+            covered = self._covered_days(stored_days, start, end)
+        return self._covered_ranges(coordinate, missing, covered)
+
+    async def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None:
+        await self._cache.cache(data, options)
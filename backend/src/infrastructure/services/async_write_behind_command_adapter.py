@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from src.domain.entities.weather import WeatherCoordinate, WeatherData
+from src.domain.ports.weather_command_port import AsyncWeatherCommandPort
+from src.infrastructure.services.write_behind_command_adapter import coalesce
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWriteBehindCommandAdapter:
+    """
+    Implements AsyncWeatherCommandPort
+    Non-blocking counterpart of WriteBehindCommandAdapter, drained by a task on the running loop
+
+    The task starts with the first write, or explicitly with `start`.
+    """
+
+    def __init__(
+        self,
+        command_port: AsyncWeatherCommandPort,
+        max_pending: int = 1_000,
+        batch_size: int = 50,
+        put_timeout: float = 0.05,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+    ):
+        self._command_port = command_port
+        self._queue: asyncio.Queue[Optional[WeatherData]] = asyncio.Queue(maxsize=max_pending)
+        self._batch_size = batch_size
+        self._put_timeout = put_timeout
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._closed = False
+        self._worker: Optional[asyncio.Task[None]] = None
+        # items of the batch the worker is writing, lost if it is cancelled
+        self._in_flight = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain(), name="write-behind")
+
+    async def cache(self, data: WeatherData) -> None:
+        if not self._closed:
+            self.start()
+            try:
+                await asyncio.wait_for(self._queue.put(data), self._put_timeout)
+                return
+            except asyncio.TimeoutError:
+                logger.warning("write-behind queue full, writing through")
+        await self._command_port.cache(data)
+
+    async def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
+        # queued writes must not resurrect what is deleted here
+        await self.flush()
+        await self._command_port.invalidate_cache(coordinate)
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far is written or given up on."""
+        if self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._worker is None:
+            return
+        await self._queue.put(None)
+        done, _ = await asyncio.wait({self._worker}, timeout=timeout)
+        if not done:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            dropped = self._in_flight + self._discard_queued()
+            self.failed += dropped
+            logger.error(f"write-behind flush timed out, dropped {dropped} writes")
+            return
+        # writers that saw the queue open while it was closing
+        while not self._queue.empty():
+            data = self._queue.get_nowait()
+            if data is not None:
+                await self._write(data)
+
+    def _discard_queued(self) -> int:
+        discarded = 0
+        while not self._queue.empty():
+            discarded += self._queue.get_nowait() is not None
+            self._queue.task_done()
+        return discarded
+
+    async def _next_batch(self) -> tuple[list[WeatherData], bool]:
+        """Waits for the first item, then takes what is already queued up to `batch_size`."""
+        items = [await self._queue.get()]
+        while len(items) < self._batch_size:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        batch = [item for item in items if item is not None]
+        return batch, len(batch) < len(items)
+
+    async def _drain(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            self._in_flight = len(batch)
+            try:
+                for data in coalesce(batch):
+                    await self._write(data)
+                self._in_flight = 0
+            except Exception as exc:
+                self.failed += len(batch)
+                logger.error(f"dropping write-behind batch of {len(batch)}: {exc}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+
+    async def _write(self, data: WeatherData) -> None:
+        for attempt in range(self._retries + 1):
+            try:
+                await self._command_port.cache(data)
+                return
+            except Exception as exc:
+                if attempt == self._retries:
+                    self.failed += 1
+                    logger.error(f"giving up persisting {data.coordinate}: {exc}")
+                    return
+                logger.warning(
+                    f"persisting {data.coordinate} failed (attempt {attempt + 1}): {exc}"
+                )
+                await asyncio.sleep(self._retry_delay * 2**attempt)
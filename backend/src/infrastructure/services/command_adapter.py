@@ -1,39 +1,255 @@
-from typing import Callable
+from typing import Any, Callable, Iterator, Optional
 
+from sqlalchemy import (
+    Delete,
+    Integer,
+    Select,
+    column,
+    delete,
+    func,
+    or_,
+    select,
+    table,
+    text,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningInsert
+from sqlmodel import SQLModel, col
 
-from src.domain.entities.weather import WeatherCoordinate, WeatherData
-from src.models.weather_data import WeatherDataRecord
+from src.core.exceptions import ChangingweatherException
+from src.domain.entities.weather import (
+    WEATHER_VARIABLES,
+    WeatherCoordinate,
+    WeatherData,
+)
+from src.domain.ports.coverage_port import CoveragePort
+from src.domain.services.archive import Archive, archive
+from src.models.location import GRID_CELLS_PER_DEGREE, LocationRecord
+from src.models.weather_data import ENSURE_PARTITIONS, WeatherMeasurementRecord
 
 
-class CommandAdapter:
+COPY_COLUMNS = ("location_id", "timestamp", *WEATHER_VARIABLES)
+
+# COPY cannot resolve conflicts, rows land here first and are upserted in one statement
+STAGING_TABLE = "weather_measurements_staging"
+CREATE_STAGING = (
+    f"CREATE TEMPORARY TABLE {STAGING_TABLE} (location_id integer, timestamp timestamp, "
+    + ", ".join(f"{name} real" for name in WEATHER_VARIABLES)
+    + ") ON COMMIT DROP"
+)
+
+
+class CommandBase:
+    """Statements and row building, shared by CommandAdapter and AsyncCommandAdapter."""
+
+    _record: type[SQLModel] = WeatherMeasurementRecord
+
+    @staticmethod
+    def _variables(data: WeatherData) -> list[str]:
+        """The columns of `data` this layout stores."""
+        return [name for name in data.series.values if name in WEATHER_VARIABLES]
+
+    @classmethod
+    def _final(cls, data: WeatherData, archive: Archive) -> Optional[WeatherData]:
+        """The stored columns of the days final in all of them, None if there are none."""
+        variables = cls._variables(data)
+        if not len(data.series) or not variables:
+            return None
+        series = archive.final(data.series.select(variables))
+        return WeatherData(coordinate=data.coordinate, series=series) if len(series) else None
+
+    @staticmethod
+    def _tuples(data: WeatherData, location_id: int) -> Iterator[tuple[Any, ...]]:
+        """
+        Row values in COPY_COLUMNS order, converted once per column rather than per cell.
+        Variables the series doesn't carry are None, the upsert keeps what is stored for them.
+        """
+        series = data.series
+        timestamps = series.timestamps.astype("datetime64[us]").tolist()
+        columns = [
+            series.values[name].tolist() if name in series.values else [None] * len(series)
+            for name in WEATHER_VARIABLES
+        ]
+        for timestamp, *values in zip(timestamps, *columns, strict=True):
+            yield location_id, timestamp, *values
+
+    @classmethod
+    def _rows(cls, data: WeatherData, location_id: int) -> list[dict[str, Any]]:
+        """Plain parameter rows for multi-row inserts."""
+        return [dict(zip(COPY_COLUMNS, row, strict=True)) for row in cls._tuples(data, location_id)]
+
+    @staticmethod
+    def _cell(coordinate: WeatherCoordinate) -> tuple[int, int]:
+        return LocationRecord.cell_of(coordinate)
+
+    @classmethod
+    def _upsert_location(cls, coordinate: WeatherCoordinate) -> ReturningInsert[tuple[int]]:
+        cell_latitude, cell_longitude = cls._cell(coordinate)
+        statement = insert(LocationRecord).values(
+            cell_latitude=cell_latitude,
+            cell_longitude=cell_longitude,
+            latitude=cell_latitude / GRID_CELLS_PER_DEGREE,
+            longitude=cell_longitude / GRID_CELLS_PER_DEGREE,
+        )
+        # no-op update, so RETURNING also yields the id of an existing cell
+        return statement.on_conflict_do_update(
+            constraint="uq_locations_cell",
+            set_={"cell_latitude": statement.excluded.cell_latitude},
+        ).returning(
+            # the model's id is optional until inserted, a returned one is always set
+            type_coerce(LocationRecord.id, Integer)
+        )
+
+    @staticmethod
+    def _copy_sql() -> str:
+        return f"COPY {STAGING_TABLE} ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+
+    @staticmethod
+    def _upsert(statement: Insert) -> Insert:
+        stored = {name: WeatherMeasurementRecord.column_of(name) for name in WEATHER_VARIABLES}
+        return statement.on_conflict_do_update(
+            index_elements=["location_id", "timestamp"],
+            # a NULL variable was not written, the stored value stays
+            set_={
+                name: func.coalesce(statement.excluded[name], column)
+                for name, column in stored.items()
+            },
+            # unchanged rows are skipped instead of rewritten, no dead tuples for repeat fetches
+            where=or_(
+                *(
+                    statement.excluded[name].is_not(None)
+                    & column.is_distinct_from(statement.excluded[name])
+                    for name, column in stored.items()
+                )
+            ),
+        )
+
+    @classmethod
+    def _upsert_staged(cls) -> Insert:
+        staging = table(STAGING_TABLE, *(column(name) for name in COPY_COLUMNS))
+        return cls._upsert(
+            insert(WeatherMeasurementRecord).from_select(list(COPY_COLUMNS), select(staging))
+        )
+
+    @staticmethod
+    def _years(data: WeatherData) -> range:
+        first, last = data.series.timestamps[[0, -1]].astype("datetime64[Y]").astype(int) + 1970
+        return range(int(first), int(last) + 1)
+
+    @classmethod
+    def _ensure_partitions(cls, years: range) -> Select[Any]:
+        return select(
+            getattr(func, ENSURE_PARTITIONS)(cls._record.__tablename__, years.start, years.stop - 1)
+        )
+
+    @classmethod
+    def _delete(cls, coordinate: WeatherCoordinate) -> Delete:
+        cell_latitude, cell_longitude = cls._cell(coordinate)
+        location = select(col(LocationRecord.id)).where(
+            col(LocationRecord.cell_latitude) == cell_latitude,
+            col(LocationRecord.cell_longitude) == cell_longitude,
+        )
+        return delete(cls._record).where(
+            cls._record.location_id == location.scalar_subquery()  # type: ignore
+        )
+
+
+class CommandAdapter(CommandBase):
     """
     Implements WeatherCommandPort
     Handles writing weather data to db
+
+    Coordinates are snapped to their grid cell in `locations`; measurements only carry the
+    location id, the hour and one column per variable of `WEATHER_VARIABLES`.
+
+    On psycopg 3 rows are streamed from the series arrays with COPY into a staging table;
+    other drivers get multi-row INSERTs of `batch_size` rows. No ORM object is built per hour
+    either way. Writes are idempotent upserts on (location_id, timestamp): variables the series
+    doesn't carry keep their stored values, refetched hours only touch rows where a written
+    variable changed.
+    Missing yearly partitions are created before the first write into a year.
+
+    Only days the `archive` reports final are written, the others are left to the cache tier.
+    Committed days are added to the `coverage` index of each stored variable, invalidation drops
+    the location from it. Subclasses storing another layout override `_record` and `_variables`
+    of CommandBase, and `_write`.
     """
 
-    def __init__(self, session_factory: Callable[[], Session]):
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 5_000,
+        use_copy: bool = True,
+        coverage: Optional[CoveragePort] = None,
+        archive: Archive = archive,
+    ):
         self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._use_copy = use_copy
+        self._coverage = coverage
+        self._archive = archive
+        self._partition_years: set[int] = set()
+        self._location_ids: dict[tuple[int, int], int] = {}
 
-    def cache(self, data: WeatherData) -> None:
-        with self._session_factory() as session:
-            weather_records = []
-            for data_point in data.data:
-                record = WeatherDataRecord(
-                    latitude=data.coordinate.latitude,
-                    longitude=data.coordinate.longitude,
-                    temperature=data_point.temperature,
-                    timestamp=data_point.timestamp,
+    def _supports_copy(self, session: Session) -> bool:
+        return self._use_copy and session.get_bind().dialect.driver == "psycopg"
+
+    def _copy(self, session: Session, data: WeatherData, location_id: int) -> None:
+        session.execute(text(CREATE_STAGING))
+        driver_connection = session.connection().connection.driver_connection
+        if driver_connection is None:
+            raise ChangingweatherException("COPY needs an open psycopg connection")
+        with driver_connection.cursor() as cursor:
+            with cursor.copy(self._copy_sql()) as copy:
+                for row in self._tuples(data, location_id):
+                    copy.write_row(row)
+        session.execute(self._upsert_staged())
+
+    def _insert(self, session: Session, data: WeatherData, location_id: int) -> None:
+        rows = self._rows(data, location_id)
+        for offset in range(0, len(rows), self._batch_size):
+            session.execute(
+                self._upsert(
+                    insert(WeatherMeasurementRecord).values(
+                        rows[offset : offset + self._batch_size]
+                    )
                 )
-                weather_records.append(record)
+            )
+
+    def _write(self, session: Session, data: WeatherData, location_id: int) -> None:
+        if self._supports_copy(session):
+            self._copy(session, data, location_id)
+        else:
+            self._insert(session, data, location_id)
 
-            session.add_all(weather_records)
+    def cache(self, data: WeatherData) -> None:
+        final = self._final(data, self._archive)
+        if final is None:
+            return
+
+        years = self._years(final)
+        cell = self._cell(final.coordinate)
+        with self._session_factory() as session:
+            location_id = self._location_ids.get(cell)
+            if location_id is None:
+                location_id = session.execute(self._upsert_location(final.coordinate)).scalar_one()
+            if not self._partition_years.issuperset(years):
+                session.execute(self._ensure_partitions(years))
+            self._write(session, final, location_id)
             session.commit()
+        # only after the commit, a rollback would undo the location and partitions too
+        self._location_ids[cell] = location_id
+        self._partition_years.update(years)
+        if self._coverage is not None:
+            days = [day for day, _ in final.series.days()]
+            for variable in final.series.values:
+                self._coverage.mark(final.coordinate, days, variable)
 
     def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
         with self._session_factory() as session:
-            session.query(WeatherDataRecord).filter(
-                WeatherDataRecord.latitude == coordinate.latitude,
-                WeatherDataRecord.longitude == coordinate.longitude,
-            ).delete()
+            session.execute(self._delete(coordinate))
             session.commit()
+        if self._coverage is not None:
+            self._coverage.clear(coordinate)
@@ -1,64 +1,344 @@
+import contextvars
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Any, Optional
+
+import httpx
+import numpy as np
 import openmeteo_requests
 import pandas as pd
 import requests_cache
+from openmeteo_requests import OpenMeteoRequestsError
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
 from retry_requests import retry
 
+from src.core.config import settings
+from src.core.exceptions import UpstreamBudgetExhausted
 from src.domain.entities.weather import (
+    DEFAULT_VARIABLES,
+    WeatherCoordinate,
     WeatherData,
-    WeatherDataPoint,
     WeatherQueryOptions,
+    WeatherSeries,
 )
+from src.domain.ports.rate_budget_port import RateBudgetPort
+from src.domain.services.grid import archive_grid
+from src.domain.services.priority import current_priority
 
 
-class OpenMeteoAdapter:
-    """
-    Adapter for OpenMeteo historical weather api
-    Implements WeatherApiPort
+logger = logging.getLogger(__name__)
 
-    API description: https://open-meteo.com/en/docs/historical-weather-api
+# coordinates, date window and variables of one upstream call
+ChunkRequest = tuple[list[WeatherCoordinate], date, date, tuple[str, ...]]
+
+# series column -> Open-Meteo hourly variable
+HOURLY_VARIABLES = {
+    "temperature": "temperature_2m",
+    "relative_humidity": "relative_humidity_2m",
+    "precipitation": "precipitation",
+    "wind_speed": "wind_speed_10m",
+}
+
+
+def rate_limited(exc: Optional[BaseException]) -> bool:
+    """The client raises rate limits (429) and bad requests (400) alike, only the reason differs."""
+    while exc is not None:
+        if isinstance(exc, OpenMeteoRequestsError) and "limit exceeded" in str(exc):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+def transient(exc: Optional[BaseException]) -> bool:
     """
+    Worth retrying: rate limits, 5xx responses, timeouts and connection errors. Bad requests
+    and an exhausted budget fail the same way on every attempt.
+    """
+    if isinstance(exc, UpstreamBudgetExhausted):
+        return False
+    if rate_limited(exc):
+        return True
+    while exc is not None:
+        status: Optional[int] = getattr(getattr(exc, "response", None), "status_code", None)
+        if status is not None:
+            return status >= 500
+        # requests' and niquests' errors derive from OSError too
+        if isinstance(exc, (OSError, httpx.TransportError)):
+            return True
+        exc = exc.__cause__
+    return False
 
-    url = "https://archive-api.open-meteo.com/v1/archive"
 
-    def __init__(self):
-        cache_session = requests_cache.CachedSession(".cache", expire_after=3600)
-        retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-        self.openmeteo = openmeteo_requests.Client(session=retry_session)
+class OpenMeteoBase:
+    """Request planning and response mapping, shared by the sync and async adapters."""
 
-    def fetch(self, options: WeatherQueryOptions) -> pd.DataFrame:
-        params = {
-            "latitude": options.coordinate.latitude,
-            "longitude": options.coordinate.longitude,
-            "start_date": options.start.strftime("%Y-%m-%d"),
-            "end_date": options.end.strftime("%Y-%m-%d"),
-            "hourly": ["temperature_2m"],
-            # "current": ["temperature_2m", "relative_humidity_2m"],
+    url = settings.OPEN_METEO_URL
+
+    @staticmethod
+    def _chunks(start: date, end: date) -> list[tuple[date, date]]:
+        """Split the requested window at calendar year boundaries."""
+        chunks = []
+        while start <= end:
+            chunks.append((start, min(date(start.year, 12, 31), end)))
+            start = date(start.year + 1, 1, 1)
+        return chunks
+
+    @staticmethod
+    def _params(
+        coordinates: list[WeatherCoordinate],
+        start: date,
+        end: date,
+        variables: tuple[str, ...] = DEFAULT_VARIABLES,
+    ) -> dict[str, Any]:
+        return {
+            "latitude": ",".join(str(coordinate.latitude) for coordinate in coordinates),
+            "longitude": ",".join(str(coordinate.longitude) for coordinate in coordinates),
+            "start_date": start.strftime("%Y-%m-%d"),
+            "end_date": end.strftime("%Y-%m-%d"),
+            "hourly": [HOURLY_VARIABLES[variable] for variable in variables],
         }
-        locations = self.openmeteo.weather_api(self.url, params=params)
-        location = locations[0]
-        print(location)
+
+    @staticmethod
+    def _cost(params: dict[str, Any]) -> float:
+        """
+        Calls upstream counts for a request: one per location, more for over two weeks of data
+        or over ten variables. See https://open-meteo.com/en/pricing
+        """
+        locations: int = params["latitude"].count(",") + 1
+        days = (
+            date.fromisoformat(params["end_date"]) - date.fromisoformat(params["start_date"])
+        ).days + 1
+        variables = len(params["hourly"])
+        return locations * max(1.0, days / 14) * max(1.0, variables / 10)
+
+    @staticmethod
+    def _to_frame(
+        location: WeatherApiResponse, variables: tuple[str, ...] = DEFAULT_VARIABLES
+    ) -> pd.DataFrame:
+        """
+        Build the frame straight from the numpy buffers and the time axis metadata. Columns are
+        named as upstream names them, variables come back in the order they were requested.
+        """
         hourly = location.Hourly()
-        hourly_temperature_2m = hourly.Variables(0).ValuesAsNumpy()  # This gives you NumPy arrays
-        hourly_data = {
-            "date": pd.date_range(
-                start=pd.to_datetime(hourly.Time(), unit="s"),
-                end=pd.to_datetime(hourly.TimeEnd(), unit="s"),
-                freq=pd.Timedelta(seconds=hourly.Interval()),
-                inclusive="left",
-            ),
-            "temperature_2m": hourly_temperature_2m,
-        }
-        return pd.DataFrame(data=hourly_data)
+        timestamps = np.arange(
+            hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64
+        ).astype("datetime64[s]")
+        return pd.DataFrame(
+            {
+                "date": timestamps,
+                **{
+                    HOURLY_VARIABLES[variable]: hourly.Variables(index).ValuesAsNumpy()
+                    for index, variable in enumerate(variables)
+                },
+            }
+        )
 
-    def map(self, data: pd.DataFrame, options: WeatherQueryOptions) -> WeatherData:
-        weather_data_points = [
-            WeatherDataPoint(temperature=row["temperature_2m"], timestamp=row["date"])
-            for _, row in data.iterrows()
-        ]
+    @classmethod
+    def _plan(
+        cls, windows: list[ChunkRequest], batch_size: int
+    ) -> tuple[list[ChunkRequest], list[tuple[list[int], int]]]:
+        """
+        Expand (coordinates, start, end, variables) windows into upstream calls: one per
+        coordinate batch and yearly chunk. The layout records batch sizes and chunk count per
+        window.
+        """
+        requests: list[ChunkRequest] = []
+        layout: list[tuple[list[int], int]] = []
+        for coordinates, start, end, variables in windows:
+            batches = [
+                coordinates[offset : offset + batch_size]
+                for offset in range(0, len(coordinates), batch_size)
+            ]
+            chunks = cls._chunks(start, end)
+            layout.append(([len(batch) for batch in batches], len(chunks)))
+            requests.extend(
+                (batch, chunk_start, chunk_end, variables)
+                for batch in batches
+                for chunk_start, chunk_end in chunks
+            )
+        return requests, layout
+
+    @staticmethod
+    def _assemble(
+        layout: list[tuple[list[int], int]], results: list[list[pd.DataFrame]]
+    ) -> list[list[pd.DataFrame]]:
+        """Stitch per-call results back into one frame per coordinate, grouped per window."""
+        remaining = iter(results)
+        grouped: list[list[pd.DataFrame]] = []
+        for batch_sizes, chunk_count in layout:
+            frames: list[pd.DataFrame] = []
+            for batch_size in batch_sizes:
+                batch_results = [next(remaining) for _ in range(chunk_count)]
+                for position in range(batch_size):
+                    parts = [chunk_frames[position] for chunk_frames in batch_results]
+                    frames.append(
+                        parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+                    )
+            grouped.append(frames)
+        return grouped
+
+    @staticmethod
+    def _group_windows(
+        options: list[WeatherQueryOptions],
+    ) -> tuple[list[ChunkRequest], list[list[list[int]]]]:
+        """
+        Group options by date window and grid cell; returns the windows with one snapped
+        coordinate per cell and the variables of all their options, and per window and cell
+        the indices of the options it serves.
+        """
+        windows: dict[tuple[date, date], dict[str, list[int]]] = {}
+        variables: dict[tuple[date, date], dict[str, None]] = {}
+        cells: dict[str, WeatherCoordinate] = {}
+        for index, option in enumerate(options):
+            option = archive_grid.normalize(option)
+            cell = archive_grid.key(option.coordinate)
+            cells[cell] = option.coordinate
+            window = (option.start, option.end)
+            windows.setdefault(window, {}).setdefault(cell, []).append(index)
+            variables.setdefault(window, {}).update(dict.fromkeys(option.variables))
+
+        return [
+            ([cells[cell] for cell in window_cells], start, end, tuple(variables[(start, end)]))
+            for (start, end), window_cells in windows.items()
+        ], [list(window_cells.values()) for window_cells in windows.values()]
+
+    @staticmethod
+    def _ungroup(
+        indices: list[list[list[int]]], grouped: list[list[pd.DataFrame]]
+    ) -> list[pd.DataFrame]:
+        frames: dict[int, pd.DataFrame] = {}
+        for window_indices, window_frames in zip(indices, grouped, strict=True):
+            for option_indices, frame in zip(window_indices, window_frames, strict=True):
+                frames.update(dict.fromkeys(option_indices, frame))
+        return [frames[index] for index in range(len(frames))]
+
+    @staticmethod
+    def map(data: pd.DataFrame, options: WeatherQueryOptions) -> WeatherData:
         return WeatherData(
             coordinate=options.coordinate,
-            data=weather_data_points,
+            series=WeatherSeries(
+                timestamps=data["date"].to_numpy(dtype="datetime64[s]"),
+                values={
+                    variable: data[HOURLY_VARIABLES[variable]].to_numpy()
+                    for variable in options.variables
+                },
+            ),
+        )
+
+
+class OpenMeteoAdapter(OpenMeteoBase):
+    """
+    Adapter for OpenMeteo historical weather api
+    Implements WeatherApiPort
+
+    Long date ranges are split into calendar-year chunks which are fetched in parallel
+    on a bounded thread pool. Only chunks that failed transiently are retried.
+    Many locations sharing a date window are fetched with comma-separated coordinate lists, and
+    with every variable any of them asks for.
+    With a `budget` every call first draws its weighted cost from the shared rate budget, at
+    the priority of the calling context, and rate-limited responses make all workers back off.
+
+    API description: https://open-meteo.com/en/docs/historical-weather-api
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        chunk_retries: int = 2,
+        batch_size: int = 100,
+        budget: Optional[RateBudgetPort] = None,
+    ):
+        cache_session = requests_cache.CachedSession(".cache", expire_after=3600)
+        self._session = retry(cache_session, retries=5, backoff_factor=0.2)
+        self.openmeteo = openmeteo_requests.Client(session=self._session)
+        self._chunk_retries = chunk_retries
+        self._batch_size = batch_size
+        self._budget = budget
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="open-meteo"
         )
 
+    def _fetch_chunk(
+        self,
+        coordinates: list[WeatherCoordinate],
+        start: date,
+        end: date,
+        variables: tuple[str, ...] = DEFAULT_VARIABLES,
+    ) -> list[pd.DataFrame]:
+        """One upstream call; the response holds one location per requested coordinate."""
+        params = self._params(coordinates, start, end, variables)
+        if self._budget is not None:
+            self._budget.acquire(self._cost(params), current_priority())
+        try:
+            locations = self.openmeteo.weather_api(self.url, params=params)
+        except OpenMeteoRequestsError as exc:
+            if self._budget is not None and rate_limited(exc):
+                self._budget.throttle()
+            raise
+        return [self._to_frame(location, variables) for location in locations]
+
+    def _submit(self, request: ChunkRequest) -> Future[list[pd.DataFrame]]:
+        # the pool threads see the caller's context, its priority in particular
+        context = contextvars.copy_context()
+        return self._executor.submit(partial(context.run, self._fetch_chunk, *request))
+
+    def _fetch_chunks(self, requests: list[ChunkRequest]) -> list[list[pd.DataFrame]]:
+        """Fetch all chunks concurrently, resubmitting only the ones that failed transiently."""
+        frames: dict[int, list[pd.DataFrame]] = {}
+        pending = list(range(len(requests)))
+
+        for attempt in range(self._chunk_retries + 1):
+            futures = {index: self._submit(requests[index]) for index in pending}
+            errors: dict[int, Exception] = {}
+            for index, future in futures.items():
+                try:
+                    frames[index] = future.result()
+                except Exception as exc:
+                    if not transient(exc):
+                        for pending_future in futures.values():
+                            pending_future.cancel()
+                        raise
+                    _, start, end, _ = requests[index]
+                    logger.warning(f"chunk {start}:{end} failed (attempt {attempt + 1}): {exc}")
+                    errors[index] = exc
+
+            if not errors:
+                break
+            if attempt == self._chunk_retries:
+                raise next(iter(errors.values()))
+            pending = list(errors)
+
+        return [frames[index] for index in range(len(requests))]
+
+    def _fetch_windows(self, windows: list[ChunkRequest]) -> list[list[pd.DataFrame]]:
+        requests, layout = self._plan(windows, self._batch_size)
+        return self._assemble(layout, self._fetch_chunks(requests))
+
+    def fetch(self, options: WeatherQueryOptions) -> pd.DataFrame:
+        options = archive_grid.normalize(options)
+        windows = [([options.coordinate], options.start, options.end, options.variables)]
+        return self._fetch_windows(windows)[0][0]
+
+    def fetch_many(self, options: list[WeatherQueryOptions]) -> list[pd.DataFrame]:
+        """
+        Fetch many locations, one upstream request per date window chunk and batch of coordinates.
+        Options in the same grid cell share one fetched frame. Frames are returned in the order
+        of `options`.
+        """
+        windows, indices = self._group_windows(options)
+        return self._ungroup(indices, self._fetch_windows(windows))
+
     def get(self, options: WeatherQueryOptions) -> WeatherData:
         return self.map(self.fetch(options), options)
+
+    def get_many(self, options: list[WeatherQueryOptions]) -> list[WeatherData]:
+        return [
+            self.map(frame, option)
+            for frame, option in zip(self.fetch_many(options), options, strict=True)
+        ]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
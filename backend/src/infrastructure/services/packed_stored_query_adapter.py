@@ -0,0 +1,69 @@
+from typing import Any, Sequence
+
+from sqlalchemy import Select, select
+from sqlmodel import col
+
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.infrastructure.services import series_codec
+from src.infrastructure.services.stored_query_adapter import (
+    StoredQueryAdapter,
+    StoredQueryBase,
+)
+from src.models.location import LocationRecord
+from src.models.weather_day import WeatherDayRecord
+
+
+class PackedStoredQueryBase(StoredQueryBase):
+    """Statements and row decoding of `weather_days`, shared by the sync and async adapters."""
+
+    @staticmethod
+    def _stores(variable: str) -> bool:
+        return True
+
+    @classmethod
+    def _days_statement(
+        cls, coordinate: WeatherCoordinate, variable: str = "temperature"
+    ) -> Select[Any]:
+        return (
+            select(col(WeatherDayRecord.day))
+            .join(LocationRecord, col(LocationRecord.id) == col(WeatherDayRecord.location_id))
+            .where(*cls._in_cell(coordinate), col(WeatherDayRecord.variable) == variable)
+        )
+
+    @classmethod
+    def _statement(
+        cls,
+        coordinate: WeatherCoordinate,
+        ranges: list[WeatherQueryOptions],
+        variable: str = "temperature",
+    ) -> Select[Any]:
+        day = col(WeatherDayRecord.day)
+        return (
+            select(col(WeatherDayRecord.payload))
+            .join(LocationRecord, col(LocationRecord.id) == col(WeatherDayRecord.location_id))
+            .where(
+                *cls._in_cell(coordinate),
+                col(WeatherDayRecord.variable) == variable,
+                day >= ranges[0].start,
+                day <= ranges[-1].end,
+            )
+            .order_by(day)
+        )
+
+    @staticmethod
+    def _series(rows: Sequence[Any], variable: str = "temperature") -> WeatherSeries:
+        return series_codec.join([series_codec.decode_arrays(row[0]) for row in rows], variable)
+
+
+class PackedStoredQueryAdapter(PackedStoredQueryBase, StoredQueryAdapter):
+    """
+
+    Implements WeatherQueryPort
+    Reads `weather_days` rows written by PackedCommandAdapter: one packed row per stored day
+    and variable, decoded and joined in one pass. Day ranges come back whole, windows inside a day are
+    trimmed after decoding.
+    """
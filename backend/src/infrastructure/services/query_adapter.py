@@ -1,71 +1,186 @@
-import json
-from datetime import datetime, timezone
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence, Union
+
+import numpy as np
 
 from src.domain.entities.weather import (
+    DEFAULT_VARIABLES,
+    WeatherCoordinate,
     WeatherData,
-    WeatherDataPoint,
     WeatherQueryOptions,
+    WeatherSeries,
 )
 from src.domain.ports.cache_port import CachePort
+from src.domain.services.grid import archive_grid, as_date, variable_key
+from src.infrastructure.services import series_codec
 
 
-class QueryAdapter:
-    """
+logger = logging.getLogger(__name__)
 
-    Implements WeatherQueryPort
+
+def range_days(options: WeatherQueryOptions) -> list[date]:
+    """Every day of the range, in order."""
+    start, end = as_date(options.start), as_date(options.end)
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def gaps(
+    coordinate: WeatherCoordinate, missing: Sequence[tuple[date, Sequence[str]]]
+) -> list[WeatherQueryOptions]:
+    """
+    Collapse ordered (day, missing variables) into contiguous ranges. A range asks for every
+    variable missing on any of its days, one upstream call being cheaper than several.
     """
+    ranges: list[WeatherQueryOptions] = []
+    for day, variables in missing:
+        if ranges and ranges[-1].end + timedelta(days=1) == day:
+            last = ranges[-1]
+            last.end = day
+            last.variables = tuple(dict.fromkeys([*last.variables, *variables]))
+        else:
+            ranges.append(
+                WeatherQueryOptions(
+                    coordinate=coordinate, start=day, end=day, variables=tuple(variables)
+                )
+            )
+    return ranges
 
-    def __init__(self, cache: CachePort):
-        self._cache = cache
-        self._cache_ttl = 86_400  # weather data is valid at least one day
 
-    @staticmethod
-    def map_to_model(data: list[WeatherDataPoint], options: WeatherQueryOptions) -> WeatherData:
-        return WeatherData(coordinate=options.coordinate, data=data)
+def day_ranges(
+    coordinate: WeatherCoordinate,
+    days: list[date],
+    variables: Sequence[str] = DEFAULT_VARIABLES,
+) -> list[WeatherQueryOptions]:
+    """Collapse ordered days into contiguous ranges."""
+    return gaps(coordinate, [(day, variables) for day in days])
 
-    def get(self, options: WeatherQueryOptions) -> WeatherData:
-        cache_key = self._cache_key(options)
 
-        cached_data = self._cache.get(cache_key)
-        if cached_data:
-            return self.map_to_model(
-                data=self._deserialize(cached_data),
-                options=options,
-            )
+class QueryAdapterBase:
+    """Day segment keys and payloads, shared by QueryAdapter and AsyncQueryAdapter."""
 
-        return self.map_to_model([], options)
+    def __init__(self, compress: bool = True):
+        self._cache_ttl = 86_400  # weather data is valid at least one day
+        self._compress = compress
 
     @staticmethod
-    def _cache_key(options: WeatherQueryOptions) -> str:
-        lat = round(options.coordinate.latitude, 2)  # about 1_000m accuracy
-        lon = round(options.coordinate.longitude, 2)
-        date_range = f"{options.start}:{options.end}"
-        return f"{lat}:{lon}:{date_range}"
+    def map_to_model(data: WeatherSeries, options: WeatherQueryOptions) -> WeatherData:
+        return WeatherData(coordinate=options.coordinate, series=data)
 
     @staticmethod
-    def _deserialize(serialized_data: str) -> list[WeatherDataPoint]:
-        data_points = json.loads(serialized_data)
+    def _day_key(coordinate: WeatherCoordinate, day: date, variable: str = "temperature") -> str:
+        return variable_key(f"{archive_grid.key(coordinate)}:{day}", variable)
+
+    @classmethod
+    def _keys(cls, options: WeatherQueryOptions, days: list[date]) -> list[str]:
+        """One key per day and variable, day by day."""
         return [
-            WeatherDataPoint(
-                temperature=point["temperature"],
-                timestamp=datetime.fromtimestamp(point["timestamp"], tz=timezone.utc).replace(
-                    tzinfo=None
-                ),
-            )
-            for point in data_points
+            cls._day_key(options.coordinate, day, variable)
+            for day in days
+            for variable in options.variables
         ]
 
+    @classmethod
+    def _cache_keys(cls, options: WeatherQueryOptions) -> list[str]:
+        return cls._keys(options, range_days(options))
+
     @staticmethod
-    def _serialize(data: WeatherData) -> str:
-        return json.dumps(
-            [
-                {
-                    "temperature": point.temperature,
-                    "timestamp": point.timestamp.replace(tzinfo=timezone.utc).timestamp(),
-                }
-                for point in data.data
-            ]
+    def _decode(key: str, payload: Optional[bytes]) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        if payload:
+            try:
+                return series_codec.decode_arrays(payload)
+            except ValueError as exc:
+                # unreadable entry, e.g. written by a newer codec version: treat as a miss
+                logger.warning(f"discarding cache entry {key}: {exc}")
+        return None
+
+    @classmethod
+    def _assemble(
+        cls,
+        options: WeatherQueryOptions,
+        days: list[date],
+        keys: list[str],
+        payloads: list[Optional[bytes]],
+    ) -> tuple[WeatherData, list[WeatherQueryOptions]]:
+        variables = options.variables
+        decoded = map(cls._decode, keys, payloads)
+        parts = []
+        missing_days: list[tuple[date, list[str]]] = []
+        for day in days:
+            columns = dict(zip(variables, [next(decoded) for _ in variables], strict=True))
+            found = {name: arrays for name, arrays in columns.items() if arrays is not None}
+            epochs = next(iter(found.values()))[0] if found else None
+            if epochs is not None and any(
+                not np.array_equal(arrays[0], epochs) for arrays in found.values()
+            ):
+                # variables cached from fetches of different hours of today: refetch the day
+                found, epochs = {}, None
+            if epochs is not None:
+                filler = np.full(len(epochs), np.nan, dtype=np.float32)
+                parts.append(
+                    (
+                        epochs,
+                        {name: found[name][1] if name in found else filler for name in variables},
+                    )
+                )
+            if len(found) < len(variables):
+                missing_days.append((day, [name for name in variables if name not in found]))
+
+        return cls.map_to_model(series_codec.join_columns(parts, variables), options), gaps(
+            options.coordinate, missing_days
         )
 
+    @staticmethod
+    def _deserialize(serialized_data: Union[bytes, str]) -> WeatherSeries:
+        return series_codec.decode(serialized_data)
+
+    def _serialize(self, data: WeatherData) -> bytes:
+        return series_codec.encode(data.series, compress=self._compress)
+
+    def _segments(self, data: WeatherData, options: WeatherQueryOptions) -> dict[str, bytes]:
+        """One encoded payload per day of the requested range that has data, and variable."""
+        days = range_days(options)
+        series = data.series.between(
+            datetime.combine(days[0], datetime.min.time()),
+            datetime.combine(days[-1] + timedelta(days=1), datetime.min.time()),
+        )
+        return {
+            self._day_key(options.coordinate, day, variable): series_codec.encode(
+                part, compress=self._compress, variable=variable
+            )
+            for day, part in series.days()
+            for variable in part.values
+        }
+
+
+class QueryAdapter(QueryAdapterBase):
+    """
+
+    Implements WeatherQueryPort
+
+    Data is cached in one segment per location, day and variable, so overlapping or sliding
+    ranges and requests for other variables share entries. A range is assembled from a single
+    MGET; days without an entry are reported back as missing sub-ranges for the caller to
+    fetch, carrying only the variables that are missing. Days with some variables cached come
+    back with NaN in the others, to be overlaid by what gets fetched.
+    """
+
+    def __init__(self, cache: CachePort, compress: bool = True):
+        super().__init__(compress=compress)
+        self._cache = cache
+
+    def get(self, options: WeatherQueryOptions) -> WeatherData:
+        """Cached data if every day of the range is cached, empty otherwise."""
+        cached, missing = self.lookup(options)
+        if missing:
+            return self.map_to_model(WeatherSeries.empty(options.variables), options)
+        return cached
+
+    def lookup(self, options: WeatherQueryOptions) -> tuple[WeatherData, list[WeatherQueryOptions]]:
+        """Cached part of the range plus the sub-ranges that are not cached."""
+        days = range_days(options)
+        keys = self._keys(options, days)
+        return self._assemble(options, days, keys, self._cache.get_many(keys))
+
     def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None:
-        self._cache.set(self._cache_key(options), self._serialize(data), self._cache_ttl)
+        self._cache.set_many(self._segments(data, options), self._cache_ttl)
@@ -0,0 +1,119 @@
+"""
+Versioned binary cache payload for WeatherSeries.
+
+Layout (little endian):
+    magic     3s   b"CWS"
+    version   B    1
+    flags     B    FLAG_COMPRESSED | FLAG_TIMESTAMPS
+    count     I    number of points
+    start     q    epoch seconds of the first point
+    interval  i    seconds between points
+    payload        [int64 timestamps if FLAG_TIMESTAMPS] + float32 values, zlib'd if FLAG_COMPRESSED
+
+Regular series (everything Open-Meteo returns) only store start and interval. Irregular ones
+carry their timestamps explicitly. A payload holds one variable of the series, so variables can
+be cached and stored independently of each other. Payloads without the magic are read as the legacy JSON list
+of {"temperature", "timestamp"} points.
+"""
+
+import json
+import struct
+import zlib
+from typing import Sequence, Union
+
+import numpy as np
+
+from src.domain.entities.weather import WeatherSeries
+
+
+MAGIC = b"CWS"
+VERSION = 1
+FLAG_COMPRESSED = 0b01
+FLAG_TIMESTAMPS = 0b10
+
+_HEADER = struct.Struct("<3sBBIqi")
+
+# below this, zlib's own overhead outweighs what it saves
+COMPRESS_MIN_BYTES = 512
+
+
+def encode(series: WeatherSeries, compress: bool = True, variable: str = "temperature") -> bytes:
+    epochs = series.timestamps.astype(np.int64)
+    start = int(epochs[0]) if len(epochs) else 0
+    interval = int(epochs[1] - epochs[0]) if len(epochs) > 1 else 0
+
+    flags = 0
+    payload = b""
+    if len(epochs) > 2 and not np.all(np.diff(epochs) == interval):
+        flags |= FLAG_TIMESTAMPS
+        payload = epochs.astype("<i8").tobytes()
+    payload += series.values[variable].astype("<f4").tobytes()
+
+    if compress and len(payload) >= COMPRESS_MIN_BYTES:
+        flags |= FLAG_COMPRESSED
+        payload = zlib.compress(payload, level=1)
+
+    return _HEADER.pack(MAGIC, VERSION, flags, len(epochs), start, interval) + payload
+
+
+def decode(data: Union[bytes, str], variable: str = "temperature") -> WeatherSeries:
+    return join([decode_arrays(data)], variable)
+
+
+def decode_arrays(data: Union[bytes, str]) -> tuple[np.ndarray, np.ndarray]:
+    """Epoch seconds and values of one payload, without building a series."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data.startswith(MAGIC):
+        return _decode_json(data)
+
+    magic, version, flags, count, start, interval = _HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"unsupported series payload version {version}")
+
+    payload = memoryview(data)[_HEADER.size :]
+    if flags & FLAG_COMPRESSED:
+        payload = memoryview(zlib.decompress(payload))
+
+    if flags & FLAG_TIMESTAMPS:
+        epochs = np.frombuffer(payload, dtype="<i8", count=count)
+        payload = payload[count * 8 :]
+    else:
+        epochs = start + np.arange(count, dtype=np.int64) * interval
+
+    return epochs, np.frombuffer(payload, dtype="<f4", count=count)
+
+
+def join(
+    parts: list[tuple[np.ndarray, np.ndarray]], variable: str = "temperature"
+) -> WeatherSeries:
+    """Build one series from ordered `decode_arrays` results, concatenating once."""
+    return join_columns([(epochs, {variable: values}) for epochs, values in parts], [variable])
+
+
+def join_columns(
+    parts: list[tuple[np.ndarray, dict[str, np.ndarray]]], variables: Sequence[str]
+) -> WeatherSeries:
+    """Like `join` for parts that carry every one of `variables` on a shared time axis."""
+    if not parts:
+        return WeatherSeries.empty(variables)
+    if len(parts) == 1:
+        epochs, columns = parts[0]
+        values = {name: columns[name] for name in variables}
+    else:
+        epochs = np.concatenate([epochs for epochs, _ in parts])
+        values = {
+            name: np.concatenate([columns[name] for _, columns in parts]) for name in variables
+        }
+    return WeatherSeries(timestamps=epochs.astype("datetime64[s]"), values=values)
+
+
+def _decode_json(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    data_points = json.loads(data)
+    epochs = np.fromiter(
+        (point["timestamp"] for point in data_points), dtype=np.float64, count=len(data_points)
+    ).astype(np.int64)
+    values = np.fromiter(
+        (point["temperature"] for point in data_points), dtype=np.float64, count=len(data_points)
+    )
+    return epochs, values
@@ -0,0 +1,261 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import ColumnElement, Date, Select, cast, select
+from sqlalchemy.orm import Session
+from sqlmodel import col
+
+from src.domain.entities.weather import (
+    WEATHER_VARIABLES,
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.domain.ports.coverage_port import CoveragePort
+from src.domain.ports.weather_query_port import WeatherQueryPort
+from src.domain.services.archive import Archive, archive
+from src.infrastructure.services.query_adapter import day_ranges, gaps, range_days
+from src.models.location import LocationRecord
+from src.models.weather_data import WeatherMeasurementRecord
+
+
+class StoredQueryBase:
+    """Statements and row decoding, shared by StoredQueryAdapter and AsyncStoredQueryAdapter."""
+
+    @staticmethod
+    def map_to_model(data: WeatherSeries, options: WeatherQueryOptions) -> WeatherData:
+        return WeatherData(coordinate=options.coordinate, series=data)
+
+    @staticmethod
+    def _stores(variable: str) -> bool:
+        return variable in WEATHER_VARIABLES
+
+    @staticmethod
+    def _by_variable(missing: list[WeatherQueryOptions]) -> dict[str, list[WeatherQueryOptions]]:
+        """The missing ranges of each variable."""
+        ranges: dict[str, list[WeatherQueryOptions]] = {}
+        for part in missing:
+            for variable in part.variables:
+                ranges.setdefault(variable, []).append(part)
+        return ranges
+
+    @staticmethod
+    def _regroup(
+        coordinate: WeatherCoordinate, uncovered: dict[str, list[date]]
+    ) -> list[WeatherQueryOptions]:
+        """Ranges of the days some variable is still missing on."""
+        missing: dict[date, list[str]] = {}
+        for variable, days in uncovered.items():
+            for day in days:
+                missing.setdefault(day, []).append(variable)
+        return gaps(coordinate, sorted(missing.items()))
+
+    @staticmethod
+    def _covered_days(stored_days: list[date], start: date, end: date) -> list[bool]:
+        stored = set(stored_days)
+        return [
+            start + timedelta(days=offset) in stored for offset in range((end - start).days + 1)
+        ]
+
+    @staticmethod
+    def _covered_ranges(
+        coordinate: WeatherCoordinate, missing: list[WeatherQueryOptions], covered: list[bool]
+    ) -> list[WeatherQueryOptions]:
+        start = missing[0].start
+        days = [day for part in missing for day in range_days(part) if covered[(day - start).days]]
+        return day_ranges(coordinate, days)
+
+    @staticmethod
+    def _midnight(day: date) -> datetime:
+        return datetime.combine(day, time.min)
+
+    @staticmethod
+    def _span(ranges: list[WeatherQueryOptions]) -> WeatherQueryOptions:
+        return WeatherQueryOptions(
+            coordinate=ranges[0].coordinate, start=ranges[0].start, end=ranges[-1].end
+        )
+
+    @staticmethod
+    def _window(
+        coordinate: WeatherCoordinate, start: datetime, end: datetime
+    ) -> list[WeatherQueryOptions]:
+        """The days touched by [start, end), as one range."""
+        last = (end - timedelta(microseconds=1)).date()
+        return [WeatherQueryOptions(coordinate=coordinate, start=start.date(), end=last)]
+
+    @staticmethod
+    def _in_cell(coordinate: WeatherCoordinate) -> list[ColumnElement[bool]]:
+        cell_latitude, cell_longitude = LocationRecord.cell_of(coordinate)
+        return [
+            col(LocationRecord.cell_latitude) == cell_latitude,
+            col(LocationRecord.cell_longitude) == cell_longitude,
+        ]
+
+    @classmethod
+    def _days_statement(
+        cls, coordinate: WeatherCoordinate, variable: str = "temperature"
+    ) -> Select[Any]:
+        """Every day of the location with values of `variable`, to load the coverage index."""
+        return (
+            select(cast(col(WeatherMeasurementRecord.timestamp), Date))
+            .distinct()
+            .join(
+                LocationRecord,
+                col(LocationRecord.id) == col(WeatherMeasurementRecord.location_id),
+            )
+            .where(
+                *cls._in_cell(coordinate),
+                WeatherMeasurementRecord.column_of(variable).is_not(None),
+            )
+        )
+
+    @classmethod
+    def _statement(
+        cls,
+        coordinate: WeatherCoordinate,
+        ranges: list[WeatherQueryOptions],
+        variable: str = "temperature",
+    ) -> Select[Any]:
+        """One query over the span of all missing ranges, hours without `variable` are skipped."""
+        timestamp = col(WeatherMeasurementRecord.timestamp)
+        values = WeatherMeasurementRecord.column_of(variable)
+        return (
+            select(timestamp, values)
+            .join(
+                LocationRecord,
+                col(LocationRecord.id) == col(WeatherMeasurementRecord.location_id),
+            )
+            .where(
+                *cls._in_cell(coordinate),
+                values.is_not(None),
+                timestamp >= cls._midnight(ranges[0].start),
+                timestamp < cls._midnight(ranges[-1].end + timedelta(days=1)),
+            )
+            .order_by(timestamp)
+        )
+
+    @staticmethod
+    def _series(rows: Sequence[Any], variable: str = "temperature") -> WeatherSeries:
+        return WeatherSeries(
+            timestamps=np.array([row[0] for row in rows], dtype="datetime64[s]"),
+            values={variable: np.array([row[1] for row in rows], dtype=np.float64)},
+        )
+
+    @classmethod
+    def _split(
+        cls, missing: list[WeatherQueryOptions], rows: WeatherSeries, archive: Archive = archive
+    ) -> tuple[WeatherSeries, list[date]]:
+        """Final stored days inside the missing ranges, and the days still not covered."""
+        stored = WeatherSeries.concat(
+            [
+                rows.between(cls._midnight(part.start), cls._midnight(part.end + timedelta(days=1)))
+                for part in missing
+            ]
+        )
+        stored = archive.final(stored)
+        stored_days = set(np.unique(stored.timestamps.astype("datetime64[D]")).tolist())
+        uncovered = [day for part in missing for day in range_days(part) if day not in stored_days]
+        return stored, uncovered
+
+
+class StoredQueryAdapter(StoredQueryBase):
+    """
+
+    Implements WeatherQueryPort
+    Read-through tier between the cache and upstream: days the cache misses are looked up in
+    `weather_measurements` for the grid cell of the coordinate, found ones are written back to
+    the cache, and only days neither has are reported as missing. Each missing variable is
+    looked up on its own, in its column of the row.
+
+    A day counts as stored once it has all its hours, without NaN, outside the `archive` delay;
+    other rows are treated as missing and refetched. The primary key guarantees one row per
+    location and timestamp.
+    With a `coverage` index only the days it lists are queried, and nothing when it lists none;
+    a location missing from the index is loaded from the stored days first.
+    Subclasses reading another layout override `_stores`, `_statement`, `_days_statement` and
+    `_series` of StoredQueryBase.
+    """
+
+    def __init__(
+        self,
+        cache: WeatherQueryPort,
+        session_factory: Callable[[], Session],
+        coverage: Optional[CoveragePort] = None,
+        archive: Archive = archive,
+    ):
+        self._cache = cache
+        self._session_factory = session_factory
+        self._coverage = coverage
+        self._archive = archive
+
+    def get(self, options: WeatherQueryOptions) -> WeatherData:
+        """Available data if the whole range is cached or stored, empty otherwise."""
+        available, missing = self.lookup(options)
+        if missing:
+            return self.map_to_model(WeatherSeries.empty(options.variables), options)
+        return available
+
+    def lookup(self, options: WeatherQueryOptions) -> tuple[WeatherData, list[WeatherQueryOptions]]:
+        cached, missing = self._cache.lookup(options)
+        if not missing:
+            return cached, missing
+
+        found: list[WeatherSeries] = []
+        uncovered: dict[str, list[date]] = {}
+        with self._session_factory() as session:
+            for variable, ranges in self._by_variable(missing).items():
+                candidates = (
+                    self._stored_ranges(session, options.coordinate, ranges, variable)
+                    if self._stores(variable)
+                    else []
+                )
+                rows = (
+                    session.execute(self._statement(options.coordinate, candidates, variable)).all()
+                    if candidates
+                    else []
+                )
+                stored, uncovered[variable] = self._split(
+                    ranges, self._series(rows, variable), self._archive
+                )
+                if len(stored):
+                    self._cache.cache(self.map_to_model(stored, options), self._span(ranges))
+                    found.append(stored)
+
+        return (
+            self.map_to_model(WeatherSeries.overlay([cached.series, *found]), options),
+            self._regroup(options.coordinate, uncovered),
+        )
+
+    def read(self, coordinate: WeatherCoordinate, start: datetime, end: datetime) -> WeatherSeries:
+        """Stored points with start <= timestamp < end, bypassing the cache tier."""
+        with self._session_factory() as session:
+            rows = session.execute(
+                self._statement(coordinate, self._window(coordinate, start, end))
+            ).all()
+        return self._series(rows).between(start, end)
+
+    def cache(self, data: WeatherData, options: WeatherQueryOptions) -> None:
+        """Rows are written by the command side; only the cache tier is filled here."""
+        self._cache.cache(data, options)
+
+    def _stored_ranges(
+        self,
+        session: Session,
+        coordinate: WeatherCoordinate,
+        missing: list[WeatherQueryOptions],
+        variable: str = "temperature",
+    ) -> list[WeatherQueryOptions]:
+        """The missing ranges worth querying: all of them without an index, else the covered days."""
+        if self._coverage is None:
+            return missing
+
+        start, end = missing[0].start, missing[-1].end
+        covered = self._coverage.covered(coordinate, start, end, variable)
+        if covered is None:
+            statement = self._days_statement(coordinate, variable)
+            stored_days = list(session.execute(statement).scalars())
+            self._coverage.load(coordinate, stored_days, variable)
+            covered = self._covered_days(stored_days, start, end)
+        return self._covered_ranges(coordinate, missing, covered)
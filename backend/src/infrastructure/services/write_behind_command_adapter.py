@@ -0,0 +1,146 @@
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from src.domain.entities.weather import WeatherCoordinate, WeatherData, WeatherSeries
+from src.domain.ports.weather_command_port import WeatherCommandPort
+
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce(batch: list[WeatherData]) -> list[WeatherData]:
+    """One series per coordinate and set of variables; where queued writes overlap, the later one wins."""
+    grouped: dict[tuple[float, float, tuple[str, ...]], list[WeatherData]] = {}
+    for data in batch:
+        coordinate = data.coordinate
+        key = (coordinate.latitude, coordinate.longitude, tuple(data.series.values))
+        grouped.setdefault(key, []).append(data)
+
+    coalesced = []
+    for parts in grouped.values():
+        series = WeatherSeries.merge([part.series for part in parts])
+        # merge is stable, the last of equal timestamps came from the latest write
+        last = np.append(series.timestamps[1:] != series.timestamps[:-1], True)
+        series = WeatherSeries(
+            timestamps=series.timestamps[last],
+            values={name: column[last] for name, column in series.values.items()},
+        )
+        coalesced.append(WeatherData(coordinate=parts[0].coordinate, series=series))
+    return coalesced
+
+
+class WriteBehindCommandAdapter:
+    """
+    Implements WeatherCommandPort
+    Persists in the background: `cache` only enqueues, a worker thread drains the queue in
+    batches into the wrapped command port
+
+    The queue holds at most `max_pending` series. When it stays full for `put_timeout`, the
+    caller writes through itself, which slows requests down instead of dropping data. Failed
+    batches are retried `retries` times with exponential backoff, then logged and dropped; the
+    data is still served from the cache and gets refetched once that expires.
+    `close` flushes what is queued, afterwards writes go straight through.
+    """
+
+    def __init__(
+        self,
+        command_port: WeatherCommandPort,
+        max_pending: int = 1_000,
+        batch_size: int = 50,
+        put_timeout: float = 0.05,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+    ):
+        self._command_port = command_port
+        self._queue: queue.Queue[Optional[WeatherData]] = queue.Queue(maxsize=max_pending)
+        self._batch_size = batch_size
+        self._put_timeout = put_timeout
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._closed = False
+        self.failed = 0
+        self._worker = threading.Thread(target=self._drain, name="write-behind", daemon=True)
+        self._worker.start()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def cache(self, data: WeatherData) -> None:
+        if not self._closed:
+            try:
+                self._queue.put(data, timeout=self._put_timeout)
+                return
+            except queue.Full:
+                logger.warning("write-behind queue full, writing through")
+        self._command_port.cache(data)
+
+    def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
+        # queued writes must not resurrect what is deleted here
+        self.flush()
+        self._command_port.invalidate_cache(coordinate)
+
+    def flush(self) -> None:
+        """Block until everything queued so far is written or given up on."""
+        if self._worker.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+        # writers that saw the queue open while it was closing
+        while not self._worker.is_alive():
+            try:
+                data = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if data is not None:
+                self._write(data)
+
+    def _next_batch(self) -> tuple[list[WeatherData], bool]:
+        """Blocks for the first item, then takes what is already queued up to `batch_size`."""
+        items = [self._queue.get()]
+        while len(items) < self._batch_size:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        batch = [item for item in items if item is not None]
+        return batch, len(batch) < len(items)
+
+    def _drain(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            try:
+                for data in coalesce(batch):
+                    self._write(data)
+            except Exception as exc:
+                self.failed += len(batch)
+                logger.error(f"dropping write-behind batch of {len(batch)}: {exc}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+
+    def _write(self, data: WeatherData) -> None:
+        for attempt in range(self._retries + 1):
+            try:
+                self._command_port.cache(data)
+                return
+            except Exception as exc:
+                if attempt == self._retries:
+                    self.failed += 1
+                    logger.error(f"giving up persisting {data.coordinate}: {exc}")
+                    return
+                logger.warning(
+                    f"persisting {data.coordinate} failed (attempt {attempt + 1}): {exc}"
+                )
+                time.sleep(self._retry_delay * 2**attempt)
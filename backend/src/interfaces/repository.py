@@ -1,5 +1,9 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Optional, Sequence
+
+
+# position of a row in a keyset paginated listing: its sort key followed by its primary key
+Keyset = tuple[Any, ...]
 
 
 class IRepository(metaclass=ABCMeta):
@@ -41,6 +45,53 @@ class IRepository(metaclass=ABCMeta):
         """Filter instances"""
         raise NotImplementedError
 
+    @abstractmethod
+    def page(
+        self,
+        after: Optional[Keyset] = None,
+        limit: int = 100,
+        sort_field: Optional[str] = None,
+        sort_order: str = "asc",
+        **kwargs: Any,
+    ) -> tuple[List[Any], Optional[Keyset]]:
+        """Get the instances after a cursor, and the cursor of the next page"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream(self, batch_size: int = 1_000, **kwargs: Any) -> Iterator[Any]:
+        """Filter instances without loading all of them at once"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_many(
+        self, objs_in: Sequence[Any], batch_size: int = 1_000, commit: bool = True
+    ) -> int:
+        """Create many entities in bulk"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert_many(
+        self,
+        objs_in: Sequence[Any],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1_000,
+        commit: bool = True,
+    ) -> int:
+        """Create many entities in bulk, updating existing ones"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert(
+        self,
+        obj_in: Any,
+        index_elements: Sequence[str],
+        update_fields: Sequence[str],
+        commit: bool = True,
+    ) -> Any:
+        """Create an entity or update the existing one, returning it as saved"""
+        raise NotImplementedError
+
     @abstractmethod
     def get_or_create(self, obj_in: Any, **kwargs: Any) -> Any:
         """Get or create an instance"""
@@ -1,4 +1,6 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.api import routes
 from src.core.config import settings
 from src.db.session import add_postgresql_extension
+from src.infrastructure.di.weather_container import container
 
 
 logger = logging.getLogger(__name__)
@@ -18,7 +21,20 @@ tags_metadata = [
     }
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    add_postgresql_extension()
+    await container.startup()
+    logger.info("FastAPI app running...")
+    try:
+        yield
+    finally:
+        await container.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="changingweather",
     description="base project for fastapi backend",
     version=settings.VERSION,
@@ -27,14 +43,7 @@ app = FastAPI(
 )
 
 
-def on_startup() -> None:
-    add_postgresql_extension()
-    logger.info("FastAPI app running...")
-
-
 app.add_middleware(CORSMiddleware, allow_origins=["*"])
 
-app.add_event_handler("startup", on_startup)
-
 app.include_router(routes.home_router)
 app.include_router(routes.api_router, prefix=f"/{settings.VERSION}")
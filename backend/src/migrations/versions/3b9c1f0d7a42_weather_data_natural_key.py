@@ -0,0 +1,42 @@
+"""weather_data natural key
+
+Revision ID: 3b9c1f0d7a42
+Revises: 6ea2fc8554ff
+Create Date: 2026-10-18 09:12:41.204517
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3b9c1f0d7a42"
+down_revision = "6ea2fc8554ff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One-off deduplication: keep the most recently written row per location and hour
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM weather_data AS stale
+            USING weather_data AS newer
+            WHERE stale.latitude = newer.latitude
+              AND stale.longitude = newer.longitude
+              AND stale.timestamp = newer.timestamp
+              AND stale.id < newer.id
+            """
+        )
+    )
+    op.create_unique_constraint(
+        "uq_weather_data_location_timestamp",
+        "weather_data",
+        ["latitude", "longitude", "timestamp"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_weather_data_location_timestamp", "weather_data", type_="unique")
@@ -0,0 +1,112 @@
+"""locations on the archive grid
+
+Revision ID: 5f0f73f109d1
+Revises: f7d3a9c1e2b6
+Create Date: 2026-10-18 23:12:40.517093
+
+"""
+
+import math
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5f0f73f109d1"
+down_revision = "f7d3a9c1e2b6"
+branch_labels = None
+depends_on = None
+
+
+GRID_CELLS_PER_DEGREE = 100
+# ARCHIVE_GRID_DEGREES as of this revision; later changes of the setting must not alter it
+GRID_DEGREES = 0.1
+
+CREATE_MOVES = (
+    "CREATE TEMPORARY TABLE location_moves (old_id integer, new_id integer) ON COMMIT DROP"
+)
+
+UPSERT_LOCATION = """
+INSERT INTO locations (cell_latitude, cell_longitude, latitude, longitude)
+VALUES (:cell_latitude, :cell_longitude, :latitude, :longitude)
+ON CONFLICT ON CONSTRAINT uq_locations_cell
+DO UPDATE SET cell_latitude = excluded.cell_latitude
+RETURNING id
+"""
+
+# rows the grid cell already has win, between old cells the first one copied does
+MERGE_ROWS = """
+INSERT INTO {table} ({columns})
+SELECT location_moves.new_id, {values}
+FROM {table} JOIN location_moves ON {table}.location_id = location_moves.old_id
+ON CONFLICT DO NOTHING
+"""
+
+
+def centre(value: float, degrees: float) -> float:
+    """Grid.snap as of this revision, in degrees."""
+    return round(math.floor(round(value / degrees, 6) + 0.5) * degrees, 6) + 0.0
+
+
+def upgrade() -> None:
+    # locations used to be 0.01° cells of the requested coordinate; rows of every old cell move
+    # to the archive grid cell containing it, the old locations and their rows are dropped
+    degrees = GRID_DEGREES
+    connection = op.get_bind()
+    op.execute(sa.text(CREATE_MOVES))
+
+    locations = connection.execute(
+        sa.text("SELECT id, cell_latitude, cell_longitude, latitude, longitude FROM locations")
+    ).all()
+    for location_id, cell_latitude, cell_longitude, latitude, longitude in locations:
+        latitude, longitude = centre(latitude, degrees), centre(longitude, degrees)
+        if longitude >= 180:
+            longitude -= 360
+        cell = round(latitude * GRID_CELLS_PER_DEGREE), round(longitude * GRID_CELLS_PER_DEGREE)
+        if cell == (cell_latitude, cell_longitude):
+            continue
+        new_id = connection.execute(
+            sa.text(UPSERT_LOCATION),
+            {
+                "cell_latitude": cell[0],
+                "cell_longitude": cell[1],
+                "latitude": cell[0] / GRID_CELLS_PER_DEGREE,
+                "longitude": cell[1] / GRID_CELLS_PER_DEGREE,
+            },
+        ).scalar_one()
+        connection.execute(
+            sa.text("INSERT INTO location_moves VALUES (:old_id, :new_id)"),
+            {"old_id": location_id, "new_id": new_id},
+        )
+
+    op.execute(
+        sa.text(
+            MERGE_ROWS.format(
+                table="weather_measurements",
+                columns="location_id, timestamp, temperature",
+                values="weather_measurements.timestamp, weather_measurements.temperature",
+            )
+        )
+    )
+    op.execute(
+        sa.text(
+            MERGE_ROWS.format(
+                table="weather_days",
+                columns="location_id, day, variable, payload",
+                values="weather_days.day, weather_days.variable, weather_days.payload",
+            )
+        )
+    )
+    # measurements and days of the old cells go along, the foreign keys cascade
+    op.execute(sa.text("DELETE FROM locations WHERE id IN (SELECT old_id FROM location_moves)"))
+    # redis coverage bitmaps written before don't list the merged days; the index reads keys
+    # under a new prefix since, see COVERAGE_PREFIX
+
+
+def downgrade() -> None:
+    # which old cell a merged row came from is not recorded, the rows cannot be split again
+    raise NotImplementedError(
+        "5f0f73f109d1 merged locations into archive grid cells and cannot be reverted; "
+        "restore a backup taken before the upgrade instead"
+    )
@@ -0,0 +1,178 @@
+"""partition weather_data by year
+
+Revision ID: 8d4e2a6b1c93
+Revises: 3b9c1f0d7a42
+Create Date: 2026-10-18 11:40:07.518204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8d4e2a6b1c93"
+down_revision = "3b9c1f0d7a42"
+branch_labels = None
+depends_on = None
+
+
+# Creates the yearly partitions covering [first_year, last_year]; safe to call concurrently.
+# New partitions inherit the indexes of the parent.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION weather_data_ensure_partitions(first_year integer, last_year integer)
+RETURNS void AS $$
+DECLARE
+    partition_year integer;
+BEGIN
+    FOR partition_year IN first_year..last_year LOOP
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF weather_data FOR VALUES FROM (%L) TO (%L)',
+                'weather_data_y' || partition_year,
+                make_date(partition_year, 1, 1),
+                make_date(partition_year + 1, 1, 1)
+            );
+        EXCEPTION WHEN duplicate_table THEN
+            NULL;  -- created by a concurrent writer
+        END;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _set_identity_after_max_id() -> None:
+    op.execute(
+        sa.text(
+            """
+            SELECT setval(
+                pg_get_serial_sequence('weather_data', 'id'),
+                COALESCE((SELECT MAX(id) FROM weather_data), 0) + 1,
+                false
+            )
+            """
+        )
+    )
+
+
+def _retire(table: str, retired: str) -> None:
+    """Rename the old table and its constraints out of the way, their names are schema wide."""
+    op.rename_table(table, retired)
+    op.execute(sa.text(f"ALTER TABLE {retired} RENAME CONSTRAINT {table}_pkey TO {retired}_pkey"))
+    op.execute(
+        sa.text(
+            f"ALTER TABLE {retired} RENAME CONSTRAINT uq_weather_data_location_timestamp "
+            f"TO uq_{retired}_location_timestamp"
+        )
+    )
+
+
+def upgrade() -> None:
+    _retire("weather_data", "weather_data_unpartitioned")
+
+    # unique constraints on a partitioned table must include the partition key:
+    # the primary key becomes (id, timestamp), ref_id is indexed but no longer unique
+    op.execute(
+        sa.text(
+            """
+            CREATE TABLE weather_data (
+                id integer GENERATED BY DEFAULT AS IDENTITY,
+                ref_id uuid NOT NULL DEFAULT gen_random_uuid(),
+                created_at timestamptz DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+                updated_at timestamptz,
+                latitude double precision NOT NULL,
+                longitude double precision NOT NULL,
+                temperature double precision NOT NULL,
+                timestamp timestamp NOT NULL,
+                PRIMARY KEY (id, timestamp),
+                CONSTRAINT uq_weather_data_location_timestamp
+                    UNIQUE (latitude, longitude, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+            """
+        )
+    )
+    op.execute(sa.text(ENSURE_PARTITIONS))
+
+    op.execute(
+        sa.text(
+            """
+            SELECT weather_data_ensure_partitions(
+                COALESCE(EXTRACT(YEAR FROM MIN(timestamp))::integer, EXTRACT(YEAR FROM now())::integer),
+                GREATEST(
+                    COALESCE(EXTRACT(YEAR FROM MAX(timestamp))::integer, 0),
+                    EXTRACT(YEAR FROM now())::integer
+                )
+            )
+            FROM weather_data_unpartitioned
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO weather_data
+                (id, ref_id, created_at, updated_at, latitude, longitude, temperature, timestamp)
+            SELECT id, ref_id, created_at, updated_at, latitude, longitude, temperature, timestamp
+            FROM weather_data_unpartitioned
+            ORDER BY timestamp
+            """
+        )
+    )
+    _set_identity_after_max_id()
+    op.drop_table("weather_data_unpartitioned")
+
+    # built after the load; partitions created later inherit them
+    op.create_index("ix_weather_data_ref_id", "weather_data", ["ref_id"])
+    # the natural key doubles as the (location, timestamp) index, BRIN serves time-only scans
+    op.create_index(
+        "ix_weather_data_timestamp_brin", "weather_data", ["timestamp"], postgresql_using="brin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_weather_data_ref_id", table_name="weather_data")
+    op.drop_index("ix_weather_data_timestamp_brin", table_name="weather_data")
+    _retire("weather_data", "weather_data_partitioned")
+    op.create_table(
+        "weather_data",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("ref_id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("temperature", sa.Float(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("ref_id"),
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO weather_data
+                (id, ref_id, created_at, updated_at, latitude, longitude, temperature, timestamp)
+            SELECT id, ref_id, created_at, updated_at, latitude, longitude, temperature, timestamp
+            FROM weather_data_partitioned
+            """
+        )
+    )
+    _set_identity_after_max_id()
+    op.drop_table("weather_data_partitioned")
+    op.execute(sa.text("DROP FUNCTION weather_data_ensure_partitions(integer, integer)"))
+
+    op.create_index(op.f("ix_weather_data_id"), "weather_data", ["id"], unique=False)
+    op.create_index(op.f("ix_weather_data_ref_id"), "weather_data", ["ref_id"], unique=False)
+    op.create_index(op.f("ix_weather_data_latitude"), "weather_data", ["latitude"], unique=False)
+    op.create_index(op.f("ix_weather_data_longitude"), "weather_data", ["longitude"], unique=False)
+    op.create_index(op.f("ix_weather_data_timestamp"), "weather_data", ["timestamp"], unique=False)
+    op.create_unique_constraint(
+        "uq_weather_data_location_timestamp",
+        "weather_data",
+        ["latitude", "longitude", "timestamp"],
+    )
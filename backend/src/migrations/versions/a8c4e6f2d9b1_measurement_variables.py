@@ -0,0 +1,34 @@
+"""measurement variables
+
+Revision ID: a8c4e6f2d9b1
+Revises: 5f0f73f109d1
+Create Date: 2026-10-19 09:41:27.306518
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a8c4e6f2d9b1"
+down_revision = "5f0f73f109d1"
+branch_labels = None
+depends_on = None
+
+
+VARIABLES = ("relative_humidity", "precipitation", "wind_speed")
+
+
+def upgrade() -> None:
+    # one nullable column per variable; rows written for other variables leave temperature NULL
+    op.alter_column("weather_measurements", "temperature", existing_type=sa.REAL(), nullable=True)
+    for name in VARIABLES:
+        op.add_column("weather_measurements", sa.Column(name, sa.REAL(), nullable=True))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DELETE FROM weather_measurements WHERE temperature IS NULL"))
+    for name in reversed(VARIABLES):
+        op.drop_column("weather_measurements", name)
+    op.alter_column("weather_measurements", "temperature", existing_type=sa.REAL(), nullable=False)
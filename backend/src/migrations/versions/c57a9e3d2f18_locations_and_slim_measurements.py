@@ -0,0 +1,196 @@
+"""locations and slim weather_measurements
+
+Revision ID: c57a9e3d2f18
+Revises: 8d4e2a6b1c93
+Create Date: 2026-10-18 14:03:55.871630
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c57a9e3d2f18"
+down_revision = "8d4e2a6b1c93"
+branch_labels = None
+depends_on = None
+
+
+GRID_CELLS_PER_DEGREE = 100
+
+# Creates the yearly partitions of `parent` covering [first_year, last_year]; safe to call
+# concurrently. Replaces the weather_data specific function.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_yearly_partitions(
+    parent text, first_year integer, last_year integer
+) RETURNS void AS $$
+DECLARE
+    partition_year integer;
+BEGIN
+    FOR partition_year IN first_year..last_year LOOP
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                parent || '_y' || partition_year,
+                parent,
+                make_date(partition_year, 1, 1),
+                make_date(partition_year + 1, 1, 1)
+            );
+        EXCEPTION WHEN duplicate_table THEN
+            NULL;  -- created by a concurrent writer
+        END;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# the function as 8d4e2a6b1c93 created it, restored on downgrade
+ENSURE_DATA_PARTITIONS = """
+CREATE FUNCTION weather_data_ensure_partitions(first_year integer, last_year integer)
+RETURNS void AS $$
+DECLARE
+    partition_year integer;
+BEGIN
+    FOR partition_year IN first_year..last_year LOOP
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF weather_data FOR VALUES FROM (%L) TO (%L)',
+                'weather_data_y' || partition_year,
+                make_date(partition_year, 1, 1),
+                make_date(partition_year + 1, 1, 1)
+            );
+        EXCEPTION WHEN duplicate_table THEN
+            NULL;  -- created by a concurrent writer
+        END;
+    END LOOP;
+END
+$$ LANGUAGE plpgsql
+"""
+
+PARTITIONS_FOR_DATA = """
+SELECT ensure_yearly_partitions(
+    '{target}',
+    COALESCE(EXTRACT(YEAR FROM MIN(timestamp))::integer, EXTRACT(YEAR FROM now())::integer),
+    GREATEST(
+        COALESCE(EXTRACT(YEAR FROM MAX(timestamp))::integer, 0),
+        EXTRACT(YEAR FROM now())::integer
+    )
+)
+FROM {source}
+"""
+
+
+def upgrade() -> None:
+    op.execute(sa.text(ENSURE_PARTITIONS))
+
+    op.create_table(
+        "locations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cell_latitude", sa.Integer(), nullable=False),
+        sa.Column("cell_longitude", sa.Integer(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cell_latitude", "cell_longitude", name="uq_locations_cell"),
+    )
+    op.create_table(
+        "weather_measurements",
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("temperature", sa.REAL(), nullable=False),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("location_id", "timestamp"),
+        postgresql_partition_by="RANGE (timestamp)",
+    )
+
+    # move the data: coordinates snap to their grid cell, the newest row wins within a cell
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO locations (cell_latitude, cell_longitude, latitude, longitude)
+            SELECT DISTINCT
+                round(latitude * {GRID_CELLS_PER_DEGREE})::integer,
+                round(longitude * {GRID_CELLS_PER_DEGREE})::integer,
+                round(latitude * {GRID_CELLS_PER_DEGREE}) / {GRID_CELLS_PER_DEGREE},
+                round(longitude * {GRID_CELLS_PER_DEGREE}) / {GRID_CELLS_PER_DEGREE}
+            FROM weather_data
+            """
+        )
+    )
+    op.execute(
+        sa.text(PARTITIONS_FOR_DATA.format(target="weather_measurements", source="weather_data"))
+    )
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO weather_measurements (location_id, timestamp, temperature)
+            SELECT DISTINCT ON (locations.id, weather_data.timestamp)
+                locations.id, weather_data.timestamp, weather_data.temperature
+            FROM weather_data
+            JOIN locations
+              ON locations.cell_latitude =
+                    round(weather_data.latitude * {GRID_CELLS_PER_DEGREE})::integer
+             AND locations.cell_longitude =
+                    round(weather_data.longitude * {GRID_CELLS_PER_DEGREE})::integer
+            ORDER BY locations.id, weather_data.timestamp, weather_data.id DESC
+            """
+        )
+    )
+
+    op.drop_table("weather_data")
+    op.execute(sa.text("DROP FUNCTION weather_data_ensure_partitions(integer, integer)"))
+
+    # built after the load; partitions created later inherit it
+    op.create_index(
+        "ix_weather_measurements_timestamp_brin",
+        "weather_measurements",
+        ["timestamp"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        sa.text(
+            """
+            CREATE TABLE weather_data (
+                id integer GENERATED BY DEFAULT AS IDENTITY,
+                ref_id uuid NOT NULL DEFAULT gen_random_uuid(),
+                created_at timestamptz DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+                updated_at timestamptz,
+                latitude double precision NOT NULL,
+                longitude double precision NOT NULL,
+                temperature double precision NOT NULL,
+                timestamp timestamp NOT NULL,
+                PRIMARY KEY (id, timestamp),
+                CONSTRAINT uq_weather_data_location_timestamp
+                    UNIQUE (latitude, longitude, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+            """
+        )
+    )
+    op.execute(
+        sa.text(PARTITIONS_FOR_DATA.format(target="weather_data", source="weather_measurements"))
+    )
+    # coordinates come back as cell centres
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO weather_data (latitude, longitude, temperature, timestamp)
+            SELECT locations.latitude, locations.longitude, weather_measurements.temperature,
+                   weather_measurements.timestamp
+            FROM weather_measurements
+            JOIN locations ON locations.id = weather_measurements.location_id
+            """
+        )
+    )
+    op.drop_table("weather_measurements")
+    op.drop_table("locations")
+
+    op.create_index("ix_weather_data_ref_id", "weather_data", ["ref_id"])
+    op.create_index(
+        "ix_weather_data_timestamp_brin", "weather_data", ["timestamp"], postgresql_using="brin"
+    )
+    op.execute(sa.text(ENSURE_DATA_PARTITIONS))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS ensure_yearly_partitions(text, integer, integer)"))
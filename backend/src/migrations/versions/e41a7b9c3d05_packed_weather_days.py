@@ -0,0 +1,40 @@
+"""packed weather_days
+
+Revision ID: e41a7b9c3d05
+Revises: c57a9e3d2f18
+Create Date: 2026-10-18 16:21:09.442107
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e41a7b9c3d05"
+down_revision = "c57a9e3d2f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # alternative layout to weather_measurements, filled by PackedCommandAdapter only
+    op.create_table(
+        "weather_days",
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("location_id", "day"),
+        postgresql_partition_by="RANGE (day)",
+    )
+    op.execute(
+        sa.text(
+            "SELECT ensure_yearly_partitions('weather_days', "
+            "EXTRACT(YEAR FROM now())::integer, EXTRACT(YEAR FROM now())::integer)"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("weather_days")
@@ -0,0 +1,34 @@
+"""weather_days per variable
+
+Revision ID: f7d3a9c1e2b6
+Revises: e41a7b9c3d05
+Create Date: 2026-10-18 21:37:52.118304
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f7d3a9c1e2b6"
+down_revision = "e41a7b9c3d05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # existing rows all hold temperature, the only variable stored so far
+    op.add_column(
+        "weather_days",
+        sa.Column("variable", sa.String(32), nullable=False, server_default="temperature"),
+    )
+    op.drop_constraint("weather_days_pkey", "weather_days", type_="primary")
+    op.create_primary_key("weather_days_pkey", "weather_days", ["location_id", "day", "variable"])
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DELETE FROM weather_days WHERE variable <> 'temperature'"))
+    op.drop_constraint("weather_days_pkey", "weather_days", type_="primary")
+    op.create_primary_key("weather_days_pkey", "weather_days", ["location_id", "day"])
+    op.drop_column("weather_days", "variable")
@@ -1,4 +1,6 @@
-from .weather_data import WeatherDataRecord
+from .location import LocationRecord
+from .weather_data import WeatherMeasurementRecord
+from .weather_day import WeatherDayRecord
 
 
-__all__ = ["WeatherDataRecord"]
+__all__ = ["LocationRecord", "WeatherDayRecord", "WeatherMeasurementRecord"]
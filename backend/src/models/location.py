@@ -0,0 +1,41 @@
+from typing import Optional
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from src.domain.entities.weather import WeatherCoordinate
+from src.domain.services.grid import archive_grid
+
+
+# storage precision of cell centres, finer than any upstream grid
+GRID_CELLS_PER_DEGREE = 100
+
+
+class LocationRecord(SQLModel, table=True):
+    """
+    One row per upstream grid cell; measurements reference it instead of repeating coordinates.
+
+    `cell_latitude`/`cell_longitude` are the integer cell indices, `latitude`/`longitude` the
+    cell centre.
+    """
+
+    __tablename__ = "locations"
+    __table_args__ = (
+        UniqueConstraint("cell_latitude", "cell_longitude", name="uq_locations_cell"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    cell_latitude: int = Field()
+    cell_longitude: int = Field()
+    latitude: float = Field()
+    longitude: float = Field()
+
+    @staticmethod
+    def cell(latitude: float, longitude: float) -> tuple[int, int]:
+        return round(latitude * GRID_CELLS_PER_DEGREE), round(longitude * GRID_CELLS_PER_DEGREE)
+
+    @classmethod
+    def cell_of(cls, coordinate: WeatherCoordinate) -> tuple[int, int]:
+        """Cell of the upstream grid point serving the coordinate."""
+        snapped = archive_grid.snap(coordinate)
+        return cls.cell(snapped.latitude, snapped.longitude)
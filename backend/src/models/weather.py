@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
@@ -6,10 +7,30 @@ from src.domain.entities.weather import WeatherCoordinate
 
 
 class WeatherDataPoint(BaseModel):
+    """One hour; only the requested variables are present."""
+
+    timestamp: datetime
+    temperature: Optional[float] = Field(None, ge=-100, le=100)
+    relative_humidity: Optional[float] = Field(None, ge=0, le=100)
+    precipitation: Optional[float] = Field(None, ge=0)
+    wind_speed: Optional[float] = Field(None, ge=0)
+
+
+class WeatherDailyPoint(BaseModel):
+    """One UTC day, aggregated from the hours; only the requested variables are present."""
+
     timestamp: datetime
-    temperature: float = Field(ge=-100, le=100)
+    temperature_max: Optional[float] = None
+    temperature_min: Optional[float] = None
+    temperature_mean: Optional[float] = None
+    relative_humidity_mean: Optional[float] = None
+    precipitation_sum: Optional[float] = None
+    wind_speed_max: Optional[float] = None
 
 
 class WeatherResponse(BaseModel):
+    # as requested; the data is that of the upstream grid cell centred on `grid_coordinate`
     coordinate: WeatherCoordinate
+    grid_coordinate: Optional[WeatherCoordinate] = None
     data: list[WeatherDataPoint]
+    daily: Optional[list[WeatherDailyPoint]] = None
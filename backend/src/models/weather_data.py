@@ -1,19 +1,46 @@
 from datetime import datetime
+from typing import Any, Optional
 
-from sqlmodel import Field
+from sqlalchemy import REAL, Column, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped
+from sqlmodel import Field, SQLModel, col
 
-from src.models.base import BaseModel
+from src.domain.entities.weather import WEATHER_VARIABLES
 
 
-class WeatherDataRecord(BaseModel, table=True):
-    """SQLModel for persisting weather data in PostgreSQL"""
+# SQL function from the partitioning migrations, creates missing yearly partitions of a table
+ENSURE_PARTITIONS = "ensure_yearly_partitions"
 
-    __tablename__ = "weather_data"
 
-    latitude: float = Field(index=True)
-    longitude: float = Field(index=True)
-    temperature: float = Field()
-    timestamp: datetime = Field(index=True)
+class WeatherMeasurementRecord(SQLModel, table=True):
+    """
+    SQLModel for persisting hourly weather data in PostgreSQL
 
-    class Config:
-        arbitrary_types_allowed = True
+    Slim rows: location reference, hour and one float4 column per variable of
+    `WEATHER_VARIABLES` (upstream values are float32). A variable never written for an hour is
+    NULL there, so each variable is stored, and counted as stored, on its own.
+    (location_id, timestamp) is the primary and natural key. Range partitioned by year on
+    `timestamp`; a BRIN index serves time-only scans.
+    """
+
+    __tablename__ = "weather_measurements"
+    __table_args__ = (
+        Index("ix_weather_measurements_timestamp_brin", "timestamp", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+    location_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    )
+    timestamp: datetime = Field(primary_key=True)
+    temperature: Optional[float] = Field(default=None, sa_column=Column(REAL))
+    relative_humidity: Optional[float] = Field(default=None, sa_column=Column(REAL))
+    precipitation: Optional[float] = Field(default=None, sa_column=Column(REAL))
+    wind_speed: Optional[float] = Field(default=None, sa_column=Column(REAL))
+
+    @classmethod
+    def column_of(cls, name: str) -> Mapped[Any]:
+        """The column of a variable of `WEATHER_VARIABLES`."""
+        if name not in WEATHER_VARIABLES:
+            raise ValueError(f"unknown weather variable: {name}")
+        return col(getattr(cls, name))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String
+from sqlmodel import Field, SQLModel
+
+
+class WeatherDayRecord(SQLModel, table=True):
+    """
+    SQLModel for persisting weather data packed one row per location, day and variable
+
+    `payload` holds the hours of the day of one variable as a `series_codec` payload (start,
+    interval and float32 values), so a day costs one tuple instead of 24.
+    (location_id, day, variable) is the primary key. Range partitioned by year on `day`.
+    """
+
+    __tablename__ = "weather_days"
+    __table_args__ = ({"postgresql_partition_by": "RANGE (day)"},)
+
+    location_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    )
+    day: date = Field(primary_key=True)
+    variable: str = Field(
+        default="temperature",
+        sa_column=Column(String(32), primary_key=True, server_default="temperature"),
+    )
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
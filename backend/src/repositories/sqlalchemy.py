@@ -1,10 +1,12 @@
 import logging
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from typing import Any, Generic, Iterator, List, Optional, Sequence, Type, TypeVar
 
+from sqlalchemy import Column, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlmodel import SQLModel, select
 
-from src.interfaces.repository import IRepository
+from src.interfaces.repository import IRepository, Keyset
 
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
@@ -12,6 +14,9 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=SQLModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=SQLModel)
 logger: logging.Logger = logging.getLogger(__name__)
 
+# dialects with INSERT .. ON CONFLICT
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
 
 class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     _model: Type[ModelType]
@@ -38,6 +43,8 @@ class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType,
             except Exception as exc:
                 logger.error(exc)
                 self.db.rollback()
+                # the object was not persisted, callers must not carry on with it
+                raise
 
         elif add and flush:
             self.db.flush()
@@ -47,7 +54,7 @@ class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType,
     def get(self, **kwargs: Any) -> Optional[ModelType]:
         logger.info(f"Fetching [{self._model.__class__.__name__}] object by [{kwargs}]")
 
-        query = select(self._model).filter_by(**kwargs)  # type: ignore
+        query = select(self._model).filter_by(**kwargs)
         response = self.db.execute(query)
         scalar: Optional[ModelType] = response.scalar_one_or_none()
 
@@ -75,7 +82,7 @@ class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType,
     def delete(self, **kwargs: Any) -> None:
         obj = self.get(**kwargs)
 
-        self.db.delete(obj)  # type: ignore
+        self.db.delete(obj)
         self.db.commit()
 
     def all(
@@ -94,7 +101,7 @@ class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType,
             sort_order = "desc"
 
         order_by = getattr(columns[sort_field], sort_order)()
-        query = select(self._model).offset(skip).limit(limit).order_by(order_by)  # type: ignore
+        query = select(self._model).offset(skip).limit(limit).order_by(order_by)
 
         response = self.db.execute(query)
         return response.scalars().all()  # type: ignore
@@ -102,18 +109,170 @@ class BaseSQLAlchemyRepository(IRepository, Generic[ModelType, CreateSchemaType,
     def f(self, **kwargs: Any) -> List[ModelType]:
         logger.info(f"Fetching [{self._model.__class__.__name__}] object by [{kwargs}]")
 
-        query = select(self._model).filter_by(**kwargs)  # type: ignore
+        query = select(self._model).filter_by(**kwargs)
         response = self.db.execute(query)
         scalars: List[ModelType] = response.scalars().all()
 
         return scalars
 
-    def get_or_create(self, obj_in: CreateSchemaType, **kwargs: Any) -> ModelType:
-        get_instance: Optional[ModelType] = self.get(**kwargs)
-
-        if get_instance:
-            return get_instance
+    def page(
+        self,
+        after: Optional[Keyset] = None,
+        limit: int = 100,
+        sort_field: Optional[str] = None,
+        sort_order: str = "asc",
+        **kwargs: Any,
+    ) -> tuple[List[ModelType], Optional[Keyset]]:
+        """
+        Keyset pagination: rows after the cursor `after`, ordered by `sort_field` and the
+        primary key as tie breaker. Pass the returned cursor to get the next page, it is None
+        after the last one. Costs the same on every page, given an index on the sort key.
+        """
+        logger.info(f"Fetching [{self._model.__name__}] page after [{after}] by [{kwargs}]")
+
+        key = self._keyset_columns(sort_field)
+        order = [getattr(column, sort_order)() for column in key]
+        query = select(self._model).filter_by(**kwargs).order_by(*order).limit(limit)
+        if after is not None:
+            position = tuple_(*key)
+            query = query.where(position > after if sort_order == "asc" else position < after)
+
+        items: List[ModelType] = self.db.execute(query).scalars().all()  # type: ignore
+        if len(items) < limit:
+            return items, None
+        return items, tuple(getattr(items[-1], column.key) for column in key)
+
+    def stream(self, batch_size: int = 1_000, **kwargs: Any) -> Iterator[ModelType]:
+        """
+        Filter like `f`, but rows are fetched from a server-side cursor `batch_size` at a time
+        instead of being loaded into one list.
+        """
+        logger.info(f"Streaming [{self._model.__name__}] objects by [{kwargs}]")
+
+        query = select(self._model).filter_by(**kwargs)
+        # yield_per implies stream_results, i.e. a named cursor on postgres
+        yield from self.db.execute(query.execution_options(yield_per=batch_size)).scalars()
+
+    def create_many(
+        self, objs_in: Sequence[CreateSchemaType], batch_size: int = 1_000, commit: bool = True
+    ) -> int:
+        """Bulk INSERT without building ORM instances, returns the number of rows."""
+        logger.info(f"Inserting [{len(objs_in)}] objects[{self._model.__name__}]")
+
+        rows = [self._values(obj_in) for obj_in in objs_in]
+        for offset in range(0, len(rows), batch_size):
+            self.db.execute(insert(self._model), rows[offset : offset + batch_size])
+        if commit:
+            self.db.commit()
+        return len(rows)
+
+    def upsert_many(
+        self,
+        objs_in: Sequence[CreateSchemaType],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1_000,
+        commit: bool = True,
+    ) -> int:
+        """
+        Bulk INSERT .. ON CONFLICT on the unique `index_elements`. Conflicting rows get
+        `update_fields` overwritten, or are left alone when none are given.
+        """
+        logger.info(f"Upserting [{len(objs_in)}] objects[{self._model.__name__}]")
+
+        rows = [self._values(obj_in) for obj_in in objs_in]
+        for offset in range(0, len(rows), batch_size):
+            statement = self._upsert_insert()(self._model).values(
+                rows[offset : offset + batch_size]
+            )
+            if update_fields:
+                statement = statement.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={field: statement.excluded[field] for field in update_fields},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+            self.db.execute(statement)
+        if commit:
+            self.db.commit()
+        return len(rows)
+
+    def _upsert_insert(self) -> Any:
+        dialect = self.db.get_bind().dialect.name
+        if dialect not in _UPSERT_INSERTS:
+            raise NotImplementedError(f"INSERT .. ON CONFLICT is not supported on {dialect}")
+        return _UPSERT_INSERTS[dialect]
+
+    def _keyset_columns(self, sort_field: Optional[str]) -> List[Column]:
+        table = self._model.__table__  # type: ignore
+        key = [table.columns[sort_field]] if sort_field else []
+        return key + [column for column in table.primary_key.columns if column.key != sort_field]
+
+    def _values(self, obj_in: CreateSchemaType) -> dict[str, Any]:
+        """Column values with model defaults applied; unset primary keys are left to the db."""
+        values = self._model.model_validate(obj_in).model_dump()
+        primary_key = self._model.__table__.primary_key.columns  # type: ignore
+        return {
+            name: value
+            for name, value in values.items()
+            if not (value is None and name in primary_key)
+        }
+
+    def upsert(
+        self,
+        obj_in: CreateSchemaType,
+        index_elements: Sequence[str],
+        update_fields: Sequence[str],
+        commit: bool = True,
+    ) -> ModelType:
+        """
+        Insert, or on a conflict on the unique `index_elements` overwrite `update_fields` of the
+        existing row; one statement, returns the row as stored.
+        """
+        logger.info(f"Upserting object[{self._model.__name__}] on [{index_elements}]")
+
+        statement = self._upsert_insert()(self._model).values(self._values(obj_in))
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={field: statement.excluded[field] for field in update_fields},
+        )
+        return self._returning(statement, commit)
 
-        instance: ModelType = self.create(obj_in)
+    def get_or_create(self, obj_in: CreateSchemaType, **kwargs: Any) -> ModelType:
+        """
+        The row matching `kwargs`, created from `obj_in` if there is none. `kwargs` must name
+        the columns of a unique constraint, their values take precedence over those of `obj_in`.
+        An existing row is returned unchanged, concurrent callers all get the same row.
+        """
+        if not kwargs:
+            raise ValueError("get_or_create needs the columns of a unique constraint as kwargs")
+        logger.info(f"Fetching or inserting object[{self._model.__name__}] by [{kwargs}]")
+
+        statement = self._upsert_insert()(self._model).values({**self._values(obj_in), **kwargs})
+        statement = statement.on_conflict_do_nothing(index_elements=list(kwargs))
+        try:
+            instance: Optional[ModelType] = self.db.scalars(
+                statement.returning(self._model),
+                execution_options={"populate_existing": True},
+            ).one_or_none()
+            if instance is None:
+                # the conflicting insert has committed by now, DO NOTHING waits for it
+                instance = self.db.scalars(select(self._model).filter_by(**kwargs)).one()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return instance
 
+    def _returning(self, statement: Any, commit: bool) -> ModelType:
+        try:
+            instance: ModelType = self.db.scalars(
+                statement.returning(self._model),
+                execution_options={"populate_existing": True},
+            ).one()
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         return instance
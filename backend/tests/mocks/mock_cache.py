@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Union
 
 from src.domain.ports.cache_port import CachePort
 
@@ -7,16 +7,34 @@ class MockCache(CachePort):
     """In-memory mock cache for testing."""
 
     def __init__(self):
-        self._cache: dict[str, str] = {}
+        self._cache: dict[str, Union[str, bytes]] = {}
 
     def get(self, key: str) -> Optional[str]:
         """Retrieve value from cache by key."""
-        return self._cache.get(key)
+        value = self._cache.get(key)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
 
-    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Retrieve raw value from cache by key."""
+        value = self._cache.get(key)
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+    def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Retrieve raw values for all keys, in order."""
+        return [MockCache.get_bytes(self, key) for key in keys]
+
+    def get_many_with_ttl(self, keys: list[str]) -> list[tuple[Optional[bytes], Optional[float]]]:
+        """Retrieve raw values for all keys, in order; entries never expire here."""
+        return [(value, None) for value in MockCache.get_many(self, keys)]
+
+    def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
         """Store value in cache with optional TTL in seconds."""
         self._cache[key] = value
 
+    def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        """Store all items with optional TTL in seconds."""
+        self._cache.update(items)
+
     def delete(self, key: str) -> None:
         """Delete value from cache by key."""
         self._cache.pop(key, None)
@@ -24,3 +42,30 @@ class MockCache(CachePort):
     def clear(self) -> None:
         """Clear all cached values."""
         self._cache.clear()
+
+
+class MockAsyncCache(MockCache):
+    """In-memory mock of AsyncCachePort."""
+
+    async def get(self, key: str) -> Optional[str]:
+        return MockCache.get(self, key)
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        return MockCache.get_bytes(self, key)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        return MockCache.get_many(self, keys)
+
+    async def get_many_with_ttl(
+        self, keys: list[str]
+    ) -> list[tuple[Optional[bytes], Optional[float]]]:
+        return MockCache.get_many_with_ttl(self, keys)
+
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        self._cache[key] = value
+
+    async def set_many(self, items: dict[str, bytes], ttl: Optional[int] = None) -> None:
+        self._cache.update(items)
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
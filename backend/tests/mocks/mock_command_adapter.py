@@ -38,3 +38,15 @@ class MockCommandAdapter:
     def get_cache_count(self) -> int:
         """Get number of cached entries for testing."""
         return len(self._cached_data)
+
+
+class MockAsyncCommandAdapter(MockCommandAdapter):
+    """Mock implementation of AsyncWeatherCommandPort for testing."""
+
+    async def cache(self, data: WeatherData) -> None:
+        key = f"{data.coordinate.latitude},{data.coordinate.longitude}"
+        self._cached_data[key] = data
+
+    async def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
+        key = f"{coordinate.latitude},{coordinate.longitude}"
+        self._cached_data.pop(key, None)
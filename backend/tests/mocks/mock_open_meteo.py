@@ -0,0 +1,62 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+
+
+class FakeVariable:
+    def __init__(self, values: np.ndarray):
+        self._values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:
+        return self._values
+
+
+class FakeHourly:
+    def __init__(self, start: int, values: np.ndarray, interval: int = 3600):
+        self._start = start
+        self._values = values
+        self._interval = interval
+
+    def Time(self) -> int:
+        return self._start
+
+    def TimeEnd(self) -> int:
+        return self._start + len(self._values) * self._interval
+
+    def Interval(self) -> int:
+        return self._interval
+
+    def Variables(self, index: int) -> FakeVariable:
+        return FakeVariable(self._values)
+
+
+class FakeLocation:
+    def __init__(self, hourly: FakeHourly):
+        self._hourly = hourly
+
+    def Hourly(self) -> FakeHourly:
+        return self._hourly
+
+
+def fake_location(latitude: float, start: date, end: date) -> FakeLocation:
+    """Hourly series where every value equals the latitude."""
+    start_epoch = int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp())
+    hours = ((end - start) + timedelta(days=1)) // timedelta(hours=1)
+    return FakeLocation(FakeHourly(start_epoch, np.full(hours, latitude, dtype=np.float32)))
+
+
+class MockOpenMeteoClient:
+    """Stands in for openmeteo_requests.Client and records every call."""
+
+    def __init__(self):
+        self.calls: list[dict[str, Any]] = []
+
+    def weather_api(self, url: str, params: dict[str, Any]) -> list[FakeLocation]:
+        self.calls.append(params)
+        start = date.fromisoformat(params["start_date"])
+        end = date.fromisoformat(params["end_date"])
+        return [
+            fake_location(float(latitude), start, end)
+            for latitude in str(params["latitude"]).split(",")
+        ]
@@ -1,22 +1,35 @@
+from typing import get_args
+from unittest.mock import AsyncMock
+
+import httpx
+import numpy as np
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from src.api.v1.weather import router
-from src.application.services.weather_service import WeatherService
-from src.infrastructure.di.weather_container import weather_service
-from src.infrastructure.services.open_meteo import OpenMeteoAdapter
-from src.infrastructure.services.query_adapter import QueryAdapter
-from tests.mocks.mock_cache import MockCache
-from tests.mocks.mock_command_adapter import MockCommandAdapter
-
-
-def mock_weather_service() -> WeatherService:
-    mock_cache = MockCache()
-    query_adapter = QueryAdapter(cache=mock_cache)
-    command_adapter = MockCommandAdapter()
-    api_adapter = OpenMeteoAdapter()
-
-    return WeatherService(
+from src.api.v1.weather import DailyVariable, HourlyVariable, router, to_response
+from src.application.services.weather_service import AsyncWeatherService
+from src.core.exceptions import UpstreamBudgetExhausted
+from src.domain.entities.weather import (
+    DAILY_VARIABLES,
+    WEATHER_VARIABLES,
+    WeatherCoordinate,
+    WeatherData,
+    WeatherSeries,
+)
+from src.infrastructure.di.weather_container import async_weather_service
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+from src.infrastructure.services.async_query_adapter import AsyncQueryAdapter
+from tests.mocks.mock_cache import MockAsyncCache
+from tests.mocks.mock_command_adapter import MockAsyncCommandAdapter
+
+
+def mock_weather_service() -> AsyncWeatherService:
+    mock_cache = MockAsyncCache()
+    query_adapter = AsyncQueryAdapter(cache=mock_cache)
+    command_adapter = MockAsyncCommandAdapter()
+    api_adapter = AsyncOpenMeteoAdapter(client=httpx.AsyncClient())
+
+    return AsyncWeatherService(
         query_port=query_adapter, command_port=command_adapter, api_port=api_adapter
     )
 
@@ -25,7 +38,7 @@ test_app = FastAPI()
 test_app.include_router(router)
 
 # Override the dependency for testing
-test_app.dependency_overrides[weather_service] = mock_weather_service
+test_app.dependency_overrides[async_weather_service] = mock_weather_service
 
 client = TestClient(test_app)
 
@@ -90,3 +103,60 @@ class TestWeatherIntegration:
 
         # The fact that this test passes without Redis running
         # confirms MockCache is being used
+
+
+def test_to_response_emits_the_requested_columns_and_daily_aggregates():
+    series = WeatherSeries(
+        timestamps=np.datetime64("2020-01-01T00:00:00") + np.arange(48) * np.timedelta64(1, "h"),
+        values={
+            "temperature": np.arange(48, dtype=np.float64),
+            "precipitation": np.append(np.nan, np.ones(47)),
+        },
+    )
+    weather_data = WeatherData(WeatherCoordinate(latitude=1.0, longitude=2.0), series=series)
+
+    response = to_response(weather_data, ["precipitation"], ["temperature_max"])
+
+    assert response["data"][:2] == [
+        {"timestamp": "2020-01-01T00:00:00", "precipitation": None},
+        {"timestamp": "2020-01-01T01:00:00", "precipitation": 1.0},
+    ]
+    assert response["daily"] == [
+        {"timestamp": "2020-01-01T00:00:00", "temperature_max": 23.0},
+        {"timestamp": "2020-01-02T00:00:00", "temperature_max": 47.0},
+    ]
+    assert "daily" not in to_response(weather_data)
+
+
+def test_query_literals_match_the_domain_variables():
+    assert set(get_args(HourlyVariable)) == set(WEATHER_VARIABLES)
+    assert set(get_args(DailyVariable)) == set(DAILY_VARIABLES)
+
+
+def test_exhausted_upstream_budget_is_503_with_retry_after():
+    service = AsyncMock()
+    service.weather_for_location.side_effect = UpstreamBudgetExhausted("busy", retry_after=7.2)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[async_weather_service] = lambda: service
+
+    response = TestClient(app).get("/weather/1/1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "8"
+
+
+def test_response_echoes_the_requested_coordinate_next_to_the_grid_cell():
+    service = AsyncMock()
+    service.weather_for_location.return_value = WeatherData(
+        WeatherCoordinate(latitude=52.5, longitude=13.4), series=WeatherSeries()
+    )
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[async_weather_service] = lambda: service
+
+    response = TestClient(app).get("/weather/52.5213/13.4049")
+
+    assert response.status_code == 200
+    assert response.json()["coordinate"] == {"latitude": 52.5213, "longitude": 13.4049}
+    assert response.json()["grid_coordinate"] == {"latitude": 52.5, "longitude": 13.4}
@@ -0,0 +1,173 @@
+import asyncio
+import datetime
+
+import httpx
+
+from src.application.services.weather_service import AsyncWeatherService, WeatherService
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherDataPoint,
+    WeatherQueryOptions,
+)
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+from src.infrastructure.services.async_query_adapter import AsyncQueryAdapter
+from src.infrastructure.services.open_meteo import OpenMeteoAdapter
+from src.infrastructure.services.query_adapter import QueryAdapter
+from tests.mocks.mock_cache import MockAsyncCache, MockCache
+from tests.mocks.mock_command_adapter import MockAsyncCommandAdapter, MockCommandAdapter
+from tests.mocks.mock_open_meteo import MockOpenMeteoClient, fake_location
+
+
+def options_for(latitude: float) -> WeatherQueryOptions:
+    return WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=latitude, longitude=0.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 2),
+    )
+
+
+class TestWeatherService:
+    def setup_method(self):
+        self.query_adapter = QueryAdapter(cache=MockCache())
+        self.command_adapter = MockCommandAdapter()
+        self.api_adapter = OpenMeteoAdapter()
+        self.api_adapter.openmeteo = MockOpenMeteoClient()
+        self.service = WeatherService(
+            query_port=self.query_adapter,
+            command_port=self.command_adapter,
+            api_port=self.api_adapter,
+        )
+
+    def test_weather_for_locations_fetches_misses_in_one_call(self):
+        cached = options_for(10.0)
+        self.query_adapter.cache(
+            WeatherData(
+                coordinate=cached.coordinate,
+                data=[
+                    WeatherDataPoint(temperature=1.0, timestamp=datetime.datetime(2020, 1, day))
+                    for day in (1, 2)
+                ],
+            ),
+            cached,
+        )
+
+        results = self.service.weather_for_locations([cached, options_for(20.0), options_for(30.0)])
+
+        assert [call["latitude"] for call in self.api_adapter.openmeteo.calls] == ["20.0,30.0"]
+        assert len(results[0].data) == 2
+        assert results[1].data[0].temperature == 20.0
+        assert results[2].data[0].temperature == 30.0
+        assert self.command_adapter.get_cache_count() == 2
+        assert self.query_adapter.get(options_for(30.0)).data == results[2].data
+
+    def test_overlapping_range_only_fetches_missing_days(self):
+        self.service.weather_for_location(options_for(10.0))
+        sliding = WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=10.0, longitude=0.0),
+            start=datetime.date(2020, 1, 2),
+            end=datetime.date(2020, 1, 4),
+        )
+
+        result = self.service.weather_for_location(sliding)
+
+        calls = self.api_adapter.openmeteo.calls
+        assert [(call["start_date"], call["end_date"]) for call in calls] == [
+            ("2020-01-01", "2020-01-02"),
+            ("2020-01-03", "2020-01-04"),
+        ]
+        assert len(result.series) == 3 * 24
+        assert result.series.timestamps[0] == datetime.datetime(2020, 1, 2)
+        assert (result.series.timestamps[1:] > result.series.timestamps[:-1]).all()
+
+    def test_gap_in_cache_is_fetched_and_merged_in_order(self):
+        for day in (1, 3):
+            self.service.weather_for_location(
+                WeatherQueryOptions(
+                    coordinate=WeatherCoordinate(latitude=10.0, longitude=0.0),
+                    start=datetime.date(2020, 1, day),
+                    end=datetime.date(2020, 1, day),
+                )
+            )
+
+        result = self.service.weather_for_location(
+            WeatherQueryOptions(
+                coordinate=WeatherCoordinate(latitude=10.0, longitude=0.0),
+                start=datetime.date(2020, 1, 1),
+                end=datetime.date(2020, 1, 3),
+            )
+        )
+
+        assert self.api_adapter.openmeteo.calls[-1]["start_date"] == "2020-01-02"
+        assert len(self.api_adapter.openmeteo.calls) == 3
+        assert len(result.series) == 3 * 24
+        assert (result.series.timestamps[1:] > result.series.timestamps[:-1]).all()
+
+    def test_only_variables_missing_from_the_cache_are_fetched(self):
+        self.service.weather_for_location(options_for(10.0))
+        options = options_for(10.0)
+        options.variables = ("temperature", "precipitation", "wind_speed")
+
+        result = self.service.weather_for_location(options)
+        again = self.service.weather_for_location(options)
+
+        calls = self.api_adapter.openmeteo.calls
+        assert [call["hourly"] for call in calls] == [
+            ["temperature_2m"],
+            ["precipitation", "wind_speed_10m"],
+        ]
+        assert result.series.values.keys() == {"temperature", "precipitation", "wind_speed"}
+        assert len(result.series) == 2 * 24
+        assert result.series.values["wind_speed"].tolist() == [10.0] * 48
+        assert again.series == result.series
+
+    def test_misses_go_through_the_single_flight_hits_do_not(self):
+        flights = []
+
+        class RecordingFlight:
+            def do(self, key, call):
+                flights.append(key)
+                return call()
+
+        service = WeatherService(
+            query_port=self.query_adapter,
+            command_port=self.command_adapter,
+            api_port=self.api_adapter,
+            single_flight=RecordingFlight(),
+        )
+
+        first = service.weather_for_location(options_for(10.04))
+        second = service.weather_for_location(options_for(10.0))
+
+        assert flights == ["10:0:2020-01-01:2020-01-02:temperature"]
+        assert len(self.api_adapter.openmeteo.calls) == 1
+        assert first.data == second.data
+
+
+class TestAsyncWeatherService:
+    def test_weather_for_location_fetches_once_then_serves_cache(self, mocker):
+        api_adapter = AsyncOpenMeteoAdapter(client=httpx.AsyncClient())
+
+        async def fetch_chunk(coordinates, start, end, variables):
+            return [
+                OpenMeteoAdapter._to_frame(
+                    fake_location(coordinate.latitude, start, end), variables
+                )
+                for coordinate in coordinates
+            ]
+
+        fetch = mocker.patch.object(api_adapter, "_fetch_chunk", side_effect=fetch_chunk)
+        command_adapter = MockAsyncCommandAdapter()
+        service = AsyncWeatherService(
+            query_port=AsyncQueryAdapter(cache=MockAsyncCache()),
+            command_port=command_adapter,
+            api_port=api_adapter,
+        )
+
+        first = asyncio.run(service.weather_for_location(options_for(10.0)))
+        second = asyncio.run(service.weather_for_location(options_for(10.0)))
+
+        assert fetch.call_count == 1
+        assert first == second
+        assert len(first.series) == 2 * 24
+        assert command_adapter.get_cache_count() == 1
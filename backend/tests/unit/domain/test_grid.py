@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
+from src.domain.services.grid import Grid, archive_grid
+
+
+class TestGrid:
+    @pytest.mark.parametrize(
+        "latitude, longitude, expected",
+        [
+            (52.5213, 13.4049, (52.5, 13.4)),
+            (52.35, 13.45, (52.4, 13.5)),  # centre boundaries round up
+            (-0.04, -0.04, (0.0, 0.0)),
+            (-33.87, 151.21, (-33.9, 151.2)),
+            (10.0, 179.97, (10.0, -180.0)),
+        ],
+    )
+    def test_snaps_to_the_cell_centre(self, latitude, longitude, expected):
+        snapped = archive_grid.snap(WeatherCoordinate(latitude=latitude, longitude=longitude))
+
+        assert (snapped.latitude, snapped.longitude) == expected
+
+    def test_nearby_coordinates_share_a_key(self):
+        keys = {
+            archive_grid.key(WeatherCoordinate(latitude=52.52 + offset, longitude=13.41 - offset))
+            for offset in (0.0, 0.01, 0.02)
+        }
+
+        assert keys == {"52.5:13.4"}
+
+    def test_snapping_is_idempotent(self):
+        grid = Grid(resolution=0.25)
+        snapped = grid.snap(WeatherCoordinate(latitude=47.37, longitude=8.55))
+
+        assert (snapped.latitude, snapped.longitude) == (47.25, 8.5)
+        assert grid.snap(snapped) == snapped
+
+    def test_normalize_uses_whole_days(self):
+        normalized = archive_grid.normalize(
+            WeatherQueryOptions(
+                coordinate=WeatherCoordinate(latitude=1.04, longitude=2.06),
+                start=datetime(2020, 1, 1, 13, 30),
+                end=date(2020, 1, 3),
+            )
+        )
+
+        assert normalized == WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=1.0, longitude=2.1),
+            start=date(2020, 1, 1),
+            end=date(2020, 1, 3),
+        )
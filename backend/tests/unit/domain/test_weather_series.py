@@ -0,0 +1,140 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherDataPoint,
+    WeatherSeries,
+)
+
+
+def hourly_series(start: datetime.datetime, hours: int) -> WeatherSeries:
+    return WeatherSeries(
+        timestamps=np.datetime64(start, "s") + np.arange(hours) * np.timedelta64(1, "h"),
+        values={"temperature": np.arange(hours, dtype=np.float64)},
+    )
+
+
+class TestWeatherSeries:
+    def test_from_points_and_back(self):
+        points = [
+            WeatherDataPoint(temperature=20.5, timestamp=datetime.datetime(2020, 1, 1, 12)),
+            WeatherDataPoint(temperature=22.0, timestamp=datetime.datetime(2020, 1, 1, 13)),
+        ]
+
+        series = WeatherSeries.from_points(points)
+
+        assert len(series) == 2
+        assert series.points() == points
+        assert series[1] == points[1]
+
+    def test_slice_is_a_series(self):
+        series = hourly_series(datetime.datetime(2020, 1, 1), 24)
+
+        part = series[2:5]
+
+        assert isinstance(part, WeatherSeries)
+        assert part.temperature.tolist() == [2.0, 3.0, 4.0]
+        assert part.timestamps[0] == np.datetime64("2020-01-01T02:00:00")
+
+    def test_between_is_half_open(self):
+        series = hourly_series(datetime.datetime(2020, 1, 1), 48)
+
+        part = series.between(datetime.datetime(2020, 1, 1, 23), datetime.date(2020, 1, 2))
+
+        assert part.points() == [
+            WeatherDataPoint(temperature=23.0, timestamp=datetime.datetime(2020, 1, 1, 23))
+        ]
+
+    def test_concat_keeps_order(self):
+        first = hourly_series(datetime.datetime(2020, 1, 1), 2)
+        second = hourly_series(datetime.datetime(2020, 1, 1, 2), 2)
+
+        combined = WeatherSeries.concat([first, WeatherSeries(), second])
+
+        assert len(combined) == 4
+        assert combined.timestamps[-1] == np.datetime64("2020-01-01T03:00:00")
+
+    def test_concat_without_points_keeps_the_columns_of_the_parts(self):
+        combined = WeatherSeries.concat([WeatherSeries.empty(["wind_speed", "precipitation"])])
+
+        assert list(combined.values) == ["wind_speed", "precipitation"]
+        assert WeatherSeries.concat([]).values == {}
+
+    def test_points_of_a_series_without_temperature(self):
+        series = WeatherSeries(
+            timestamps=hourly_series(datetime.datetime(2020, 1, 1), 2).timestamps,
+            values={"wind_speed": np.array([3.0, 4.0])},
+        )
+
+        assert [point.timestamp.hour for point in series.points()] == [0, 1]
+        assert all(np.isnan(point.temperature) for point in series.points())
+        assert np.isnan(series[1].temperature)
+
+    def test_overlay_fills_the_columns_each_part_carries(self):
+        cached = WeatherSeries(
+            timestamps=hourly_series(datetime.datetime(2020, 1, 1), 3).timestamps,
+            values={
+                "temperature": np.array([1.0, 2.0, 3.0]),
+                "precipitation": np.array([0.1, np.nan, np.nan]),
+            },
+        )
+        fetched = WeatherSeries(
+            timestamps=hourly_series(datetime.datetime(2020, 1, 1, 1), 3).timestamps,
+            values={"precipitation": np.array([0.2, 0.3, 0.4])},
+        )
+
+        combined = WeatherSeries.overlay([cached, fetched])
+
+        assert len(combined) == 4
+        assert combined.values["precipitation"].tolist() == [0.1, 0.2, 0.3, 0.4]
+        assert combined.temperature[:3].tolist() == [1.0, 2.0, 3.0]
+        assert np.isnan(combined.temperature[3])
+
+    def test_overlay_of_disjoint_parts_is_a_merge(self):
+        first = hourly_series(datetime.datetime(2020, 1, 1, 2), 2)
+        second = hourly_series(datetime.datetime(2020, 1, 1), 2)
+
+        assert WeatherSeries.overlay([first, second]) == WeatherSeries.merge([first, second])
+        assert WeatherSeries.overlay([WeatherSeries.empty(["wind_speed"])]).values.keys() == {
+            "wind_speed"
+        }
+
+    def test_daily_aggregates_per_utc_day(self):
+        series = hourly_series(datetime.datetime(2020, 1, 1), 48)
+        series = WeatherSeries(
+            timestamps=series.timestamps,
+            values={"temperature": series.temperature, "precipitation": np.ones(48)},
+        )
+
+        daily = series.daily(["temperature_max", "temperature_mean", "precipitation_sum"])
+
+        assert daily.timestamps.tolist() == [
+            datetime.datetime(2020, 1, 1),
+            datetime.datetime(2020, 1, 2),
+        ]
+        assert daily.values["temperature_max"].tolist() == [23.0, 47.0]
+        assert daily.values["temperature_mean"].tolist() == [11.5, 35.5]
+        assert daily.values["precipitation_sum"].tolist() == [24.0, 24.0]
+        assert len(WeatherSeries.empty().daily(["temperature_min"])) == 0
+
+    def test_mismatched_columns_are_rejected(self):
+        with pytest.raises(ValueError):
+            WeatherSeries(
+                timestamps=np.array(["2020-01-01T00:00:00"], dtype="datetime64[s]"),
+                values={"temperature": np.array([], dtype=np.float64)},
+            )
+
+    def test_weather_data_equality_compares_series(self):
+        coordinate = WeatherCoordinate(latitude=1.0, longitude=2.0)
+        points = [WeatherDataPoint(temperature=1.0, timestamp=datetime.datetime(2020, 1, 1))]
+
+        assert WeatherData(coordinate=coordinate, data=points) == WeatherData(
+            coordinate=coordinate, series=WeatherSeries.from_points(points)
+        )
+        assert WeatherData(coordinate=coordinate, data=points) != WeatherData(
+            coordinate=coordinate, data=[]
+        )
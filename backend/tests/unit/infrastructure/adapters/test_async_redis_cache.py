@@ -0,0 +1,51 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import redis
+
+from src.infrastructure.adapters.async_redis_cache import AsyncRedisCache
+
+
+class TestAsyncRedisCache:
+    def test_get_success(self):
+        mock_redis = AsyncMock()
+        mock_redis.get.return_value = b"test_value"
+
+        cache = AsyncRedisCache(mock_redis)
+        result = asyncio.run(cache.get("test_key"))
+
+        assert result == "test_value"
+        mock_redis.get.assert_awaited_once_with("test_key")
+
+    def test_get_handles_redis_error_gracefully(self):
+        mock_redis = AsyncMock()
+        mock_redis.get.side_effect = redis.RedisError("Connection failed")
+
+        cache = AsyncRedisCache(mock_redis)
+
+        assert asyncio.run(cache.get("test_key")) is None
+
+    def test_set_with_ttl(self):
+        mock_redis = AsyncMock()
+
+        cache = AsyncRedisCache(mock_redis)
+        asyncio.run(cache.set("test_key", "test_value", ttl=3600))
+
+        mock_redis.setex.assert_awaited_once_with("test_key", 3600, "test_value")
+
+    def test_set_handles_redis_error_gracefully(self):
+        mock_redis = AsyncMock()
+        mock_redis.set.side_effect = redis.RedisError("Connection failed")
+
+        cache = AsyncRedisCache(mock_redis)
+
+        # Should not raise exception
+        asyncio.run(cache.set("test_key", "test_value"))
+
+    def test_delete_success(self):
+        mock_redis = AsyncMock()
+
+        cache = AsyncRedisCache(mock_redis)
+        asyncio.run(cache.delete("test_key"))
+
+        mock_redis.delete.assert_awaited_once_with("test_key")
@@ -0,0 +1,115 @@
+import asyncio
+
+from src.infrastructure.adapters.memory_cache import AsyncMemoryCache, MemoryCache
+from tests.mocks.mock_cache import MockAsyncCache, MockCache
+
+
+class TestMemoryCache:
+    def test_hit_is_served_locally(self, mocker):
+        backend = MockCache()
+        cache = MemoryCache(backend=backend)
+        cache.set("key", b"value", ttl=60)
+        backend_get = mocker.spy(backend, "get_bytes")
+
+        assert cache.get_bytes("key") == b"value"
+        assert cache.get("key") == "value"
+        backend_get.assert_not_called()
+        assert cache.stats.hits == 2
+
+    def test_miss_reads_through_and_populates(self):
+        backend = MockCache()
+        backend.set("key", b"value")
+        cache = MemoryCache(backend=backend)
+
+        assert cache.get_bytes("key") == b"value"
+        backend.clear()
+        assert cache.get_bytes("key") == b"value"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_get_many_only_asks_backend_for_local_misses(self, mocker):
+        backend = MockCache()
+        backend.set_many({"a": b"1", "b": b"2"})
+        cache = MemoryCache(backend=backend)
+        cache.set("a", b"1")
+        backend_get_many = mocker.spy(backend, "get_many_with_ttl")
+
+        assert cache.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+        backend_get_many.assert_called_once_with(["b", "c"])
+
+    def test_read_through_entry_expires_with_the_backend(self, mocker):
+        clock = mocker.patch("src.infrastructure.adapters.memory_cache.time.monotonic")
+        clock.return_value = 0.0
+        backend = mocker.Mock()
+        backend.get_many_with_ttl.return_value = [(b"1", 10.0), (b"2", 0.0), (b"3", 3600.0)]
+        cache = MemoryCache(backend=backend, local_ttl=300)
+
+        assert cache.get_many(["short", "gone", "long"]) == [b"1", b"2", b"3"]
+
+        clock.return_value = 11.0
+        backend.get_many_with_ttl.return_value = [(None, None)]
+        assert cache.get_bytes("short") is None
+        assert cache.get_bytes("gone") is None
+        assert cache.get_bytes("long") == b"3"
+        assert cache.stats.hits == 1
+
+    def test_evicts_least_recently_used_beyond_byte_budget(self):
+        cache = MemoryCache(max_bytes=25)
+        cache.set("a", b"x" * 9)
+        cache.set("b", b"x" * 9)
+        cache.get_bytes("a")
+        cache.set("c", b"x" * 9)
+
+        assert cache.get_bytes("b") is None
+        assert cache.get_bytes("a") is not None
+        assert cache.get_bytes("c") is not None
+        assert cache.stats.evictions == 1
+        assert cache.size == 20
+
+    def test_oversized_entry_is_not_kept_locally(self):
+        backend = MockCache()
+        cache = MemoryCache(backend=backend, max_bytes=10)
+
+        cache.set("key", b"x" * 100)
+
+        assert cache.size == 0
+        assert backend.get_bytes("key") == b"x" * 100
+
+    def test_entry_expires_with_its_ttl(self, mocker):
+        clock = mocker.patch("src.infrastructure.adapters.memory_cache.time.monotonic")
+        clock.return_value = 0.0
+        cache = MemoryCache(local_ttl=300)
+        cache.set("short", b"1", ttl=10)
+        cache.set("long", b"2", ttl=3600)
+
+        clock.return_value = 11.0
+        assert cache.get_bytes("short") is None
+        assert cache.get_bytes("long") == b"2"
+
+        clock.return_value = 301.0
+        assert cache.get_bytes("long") is None
+        assert cache.size == 0
+
+    def test_delete_removes_both_tiers(self):
+        backend = MockCache()
+        cache = MemoryCache(backend=backend)
+        cache.set("key", b"value")
+
+        cache.delete("key")
+
+        assert cache.get_bytes("key") is None
+        assert backend.get_bytes("key") is None
+
+
+class TestAsyncMemoryCache:
+    def test_reads_through_once(self, mocker):
+        backend = MockAsyncCache()
+        asyncio.run(backend.set_many({"a": b"1", "b": b"2"}))
+        cache = AsyncMemoryCache(backend=backend)
+        backend_get_many = mocker.spy(backend, "get_many_with_ttl")
+
+        first = asyncio.run(cache.get_many(["a", "b"]))
+        second = asyncio.run(cache.get_many(["a", "b"]))
+
+        assert first == second == [b"1", b"2"]
+        assert backend_get_many.call_count == 1
+        assert cache.stats.hits == 2
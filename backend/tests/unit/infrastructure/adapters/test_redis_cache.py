@@ -102,3 +102,60 @@ class TestRedisCache:
         result = cache.get("json_key")
 
         assert result == '{"temperature": 25.5}'
+
+    def test_get_bytes_returns_raw_value(self):
+        mock_redis = Mock()
+        mock_redis.get.return_value = b"CWS\x01\xff"
+
+        cache = RedisCache(mock_redis)
+        result = cache.get_bytes("binary_key")
+
+        assert result == b"CWS\x01\xff"
+
+    def test_get_bytes_handles_redis_error_gracefully(self):
+        mock_redis = Mock()
+        mock_redis.get.side_effect = redis.RedisError("Connection failed")
+
+        cache = RedisCache(mock_redis)
+
+        assert cache.get_bytes("binary_key") is None
+
+    def test_get_many_uses_single_mget(self):
+        mock_redis = Mock()
+        mock_redis.mget.return_value = [b"a", None]
+
+        cache = RedisCache(mock_redis)
+
+        assert cache.get_many(["k1", "k2"]) == [b"a", None]
+        mock_redis.mget.assert_called_once_with(["k1", "k2"])
+
+    def test_get_many_handles_redis_error_gracefully(self):
+        mock_redis = Mock()
+        mock_redis.mget.side_effect = redis.RedisError("Connection failed")
+
+        cache = RedisCache(mock_redis)
+
+        assert cache.get_many(["k1", "k2"]) == [None, None]
+
+    def test_get_many_with_ttl_pipelines_mget_and_pttl(self):
+        mock_redis = Mock()
+        pipeline = mock_redis.pipeline.return_value
+        pipeline.execute.return_value = [[b"a", b"b", None], 1500, -1, -2]
+
+        cache = RedisCache(mock_redis)
+
+        assert cache.get_many_with_ttl(["k1", "k2", "k3"]) == [(b"a", 1.5), (b"b", None), (None, 0)]
+        pipeline.mget.assert_called_once_with(["k1", "k2", "k3"])
+        assert pipeline.pttl.call_count == 3
+        pipeline.execute.assert_called_once()
+
+    def test_set_many_pipelines_setex(self):
+        mock_redis = Mock()
+        pipeline = mock_redis.pipeline.return_value
+
+        cache = RedisCache(mock_redis)
+        cache.set_many({"k1": b"a", "k2": b"b"}, ttl=60)
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert pipeline.setex.call_count == 2
+        pipeline.execute.assert_called_once()
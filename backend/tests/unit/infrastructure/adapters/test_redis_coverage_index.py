@@ -0,0 +1,133 @@
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import redis
+
+from src.domain.entities.weather import WeatherCoordinate
+from src.infrastructure.adapters.async_redis_coverage_index import (
+    AsyncRedisCoverageIndex,
+)
+from src.infrastructure.adapters.redis_coverage_index import (
+    ARCHIVE_EPOCH,
+    RedisCoverageIndex,
+)
+
+
+COORDINATE = WeatherCoordinate(latitude=52.52, longitude=13.41)
+
+
+def bitmap(*days: date) -> bytes:
+    """What redis holds after SETBIT for each day."""
+    offsets = [(day - ARCHIVE_EPOCH).days for day in days]
+    data = bytearray(max(offsets) // 8 + 1)
+    for offset in offsets:
+        data[offset // 8] |= 0x80 >> (offset % 8)
+    return bytes(data)
+
+
+def fetched(data: bytes, start: date, end: date) -> bytes:
+    first, last = RedisCoverageIndex._byte_range(start, end)
+    return data[first : last + 1]
+
+
+def redis_with(exists: bool, data: bytes = b"") -> Mock:
+    client = Mock()
+    client.pipeline.return_value.execute.return_value = [int(exists), data]
+    return client
+
+
+class TestRedisCoverageIndex:
+    def test_key_is_shared_by_the_grid_cell(self):
+        nearby = WeatherCoordinate(latitude=52.54, longitude=13.38)
+
+        assert RedisCoverageIndex.key(COORDINATE) == "coverage:v2:52.5:13.4"
+        assert RedisCoverageIndex.key(nearby) == RedisCoverageIndex.key(COORDINATE)
+
+    def test_decode_reads_the_days_of_the_range(self):
+        data = bitmap(date(2020, 1, 2), date(2020, 1, 9), date(2020, 1, 10))
+        start, end = date(2020, 1, 1), date(2020, 1, 12)
+
+        covered = RedisCoverageIndex._decode(fetched(data, start, end), start, end)
+
+        assert covered == [False, True] + [False] * 6 + [True, True, False, False]
+
+    def test_decode_pads_days_before_the_epoch_and_after_the_bitmap(self):
+        data = bitmap(ARCHIVE_EPOCH)
+        start, end = date(1939, 12, 30), date(1940, 1, 2)
+
+        covered = RedisCoverageIndex._decode(fetched(data, start, end), start, end)
+
+        assert covered == [False, False, True, False]
+
+    def test_covered_is_none_for_unindexed_locations(self):
+        index = RedisCoverageIndex(redis_with(exists=False))
+
+        assert index.covered(COORDINATE, date(2020, 1, 1), date(2020, 1, 3)) is None
+
+    def test_covered_is_none_on_redis_errors(self):
+        client = Mock()
+        client.pipeline.return_value.execute.side_effect = redis.RedisError("Connection failed")
+        index = RedisCoverageIndex(client)
+
+        assert index.covered(COORDINATE, date(2020, 1, 1), date(2020, 1, 3)) is None
+
+    def test_covered_decodes_the_fetched_range(self):
+        start, end = date(2020, 1, 1), date(2020, 1, 3)
+        client = redis_with(exists=True, data=fetched(bitmap(date(2020, 1, 3)), start, end))
+        index = RedisCoverageIndex(client)
+
+        assert index.covered(COORDINATE, start, end) == [False, False, True]
+        client.pipeline.return_value.getrange.assert_called_once_with(
+            "coverage:v2:52.5:13.4", *RedisCoverageIndex._byte_range(start, end)
+        )
+
+    def test_load_creates_the_key_even_without_days(self):
+        client = Mock()
+        index = RedisCoverageIndex(client)
+
+        index.load(COORDINATE, [])
+
+        client.pipeline.return_value.append.assert_called_once_with("coverage:v2:52.5:13.4", b"")
+        client.pipeline.return_value.setbit.assert_not_called()
+        client.pipeline.return_value.execute.assert_called_once()
+
+    def test_mark_only_extends_indexed_locations_through_the_script(self):
+        client = Mock()
+        index = RedisCoverageIndex(client)
+
+        index.mark(COORDINATE, [date(1940, 1, 3), date(1939, 1, 1)])
+
+        client.register_script.return_value.assert_called_once_with(
+            keys=["coverage:v2:52.5:13.4"], args=[2]
+        )
+
+    def test_clear_deletes_the_bitmap_of_every_variable(self):
+        client = Mock()
+
+        RedisCoverageIndex(client).clear(COORDINATE)
+
+        client.delete.assert_called_once_with(
+            "coverage:v2:52.5:13.4",
+            "coverage:v2:52.5:13.4:relative_humidity",
+            "coverage:v2:52.5:13.4:precipitation",
+            "coverage:v2:52.5:13.4:wind_speed",
+        )
+
+
+class TestAsyncRedisCoverageIndex:
+    def test_covered_and_mark(self):
+        start, end = date(2020, 1, 1), date(2020, 1, 2)
+        client = MagicMock()
+        client.pipeline.return_value.execute = AsyncMock(
+            return_value=[1, fetched(bitmap(start), start, end)]
+        )
+        client.register_script.return_value = AsyncMock()
+        index = AsyncRedisCoverageIndex(client)
+
+        assert asyncio.run(index.covered(COORDINATE, start, end)) == [True, False]
+
+        asyncio.run(index.mark(COORDINATE, [end]))
+        client.register_script.return_value.assert_awaited_once_with(
+            keys=["coverage:v2:52.5:13.4"], args=[(end - ARCHIVE_EPOCH).days]
+        )
@@ -0,0 +1,102 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+import redis
+
+from src.core.exceptions import UpstreamBudgetExhausted
+from src.domain.services.priority import Priority
+from src.infrastructure.adapters.async_redis_rate_budget import AsyncRedisRateBudget
+from src.infrastructure.adapters.redis_rate_budget import (
+    RateBudgetPolicy,
+    RateLimit,
+    RedisRateBudget,
+)
+
+
+POLICY = RateBudgetPolicy(limits=(RateLimit(600, 60), RateLimit(10_000, 86_400)), reserve=0.25)
+
+
+def budget_answering(*waits: int) -> tuple[RedisRateBudget, Mock]:
+    client = Mock()
+    acquire, throttle = Mock(side_effect=list(waits)), Mock(return_value=2_000)
+    client.register_script.side_effect = [acquire, throttle]
+    return RedisRateBudget(client, POLICY), client
+
+
+class TestRateBudgetPolicy:
+    def test_backfills_keep_the_reserve_free(self):
+        keys, interactive = POLICY.acquire_args(1.5, Priority.INTERACTIVE)
+        _, backfill = POLICY.acquire_args(1.5, Priority.BACKFILL)
+
+        assert keys == [
+            "budget:open-meteo:pause",
+            "budget:open-meteo:60s",
+            "budget:open-meteo:86400s",
+        ]
+        assert interactive == [1.5, 0.0, 600, 60_000, 10_000, 86_400_000]
+        assert backfill[1] == 0.25
+
+    def test_throttle_args_are_whole_milliseconds(self):
+        keys, args = POLICY.throttle_args(retry_after=2.5)
+
+        assert keys == ["budget:open-meteo:pause", "budget:open-meteo:strikes"]
+        assert args == [1_000, 300_000, 2_500, 600_000]
+
+
+class TestRedisRateBudget:
+    def test_waits_until_the_budget_grants_the_call(self, mocker):
+        sleep = mocker.patch("src.infrastructure.adapters.redis_rate_budget.time.sleep")
+        budget, _ = budget_answering(250, 0)
+
+        budget.acquire(2.0)
+
+        assert sleep.call_count == 1
+        assert 0.25 <= sleep.call_args.args[0] <= 0.275
+
+    def test_interactive_calls_give_up_after_interactive_wait(self, mocker):
+        sleep = mocker.patch("src.infrastructure.adapters.redis_rate_budget.time.sleep")
+        budget, _ = budget_answering(60_000)
+
+        with pytest.raises(UpstreamBudgetExhausted):
+            budget.acquire(1.0, Priority.INTERACTIVE)
+        sleep.assert_not_called()
+
+    def test_backfills_wait_as_long_as_it_takes(self, mocker):
+        sleep = mocker.patch("src.infrastructure.adapters.redis_rate_budget.time.sleep")
+        budget, _ = budget_answering(60_000, 60_000, 0)
+
+        budget.acquire(1.0, Priority.BACKFILL)
+
+        assert sleep.call_count == 2
+
+    def test_calls_are_not_held_back_without_redis(self):
+        budget, _ = budget_answering(redis.RedisError("Connection failed"))
+
+        budget.acquire(1.0)
+
+    def test_throttle_runs_the_script_with_retry_after(self):
+        client = Mock()
+        client.register_script.return_value.return_value = 30_000
+        budget = RedisRateBudget(client, POLICY)
+
+        budget.throttle(retry_after=30)
+
+        client.register_script.return_value.assert_called_with(
+            keys=["budget:open-meteo:pause", "budget:open-meteo:strikes"],
+            args=[1_000, 300_000, 30_000, 600_000],
+        )
+
+
+class TestAsyncRedisRateBudget:
+    def test_waits_until_the_budget_grants_the_call(self, mocker):
+        sleep = mocker.patch(
+            "src.infrastructure.adapters.async_redis_rate_budget.asyncio.sleep", new=AsyncMock()
+        )
+        client = MagicMock()
+        client.register_script.return_value = AsyncMock(side_effect=[100, 0])
+        budget = AsyncRedisRateBudget(client, POLICY)
+
+        asyncio.run(budget.acquire(1.0, Priority.BACKFILL))
+
+        assert sleep.await_count == 1
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+import redis
+
+from src.infrastructure.adapters.async_redis_single_flight import AsyncRedisSingleFlight
+from src.infrastructure.adapters.redis_single_flight import (
+    EXTEND_SCRIPT,
+    RedisSingleFlight,
+)
+
+
+def lock_holder() -> Mock:
+    """Redis in which this process gets the lock."""
+    client = Mock()
+    client.set.return_value = True
+    return client
+
+
+def extended_by(client: Mock, extend: Mock) -> Mock:
+    """Hands out `extend` for the extend script, the release script stays a plain mock."""
+    release = client.register_script.return_value
+    client.register_script.side_effect = lambda script: (
+        extend if script == EXTEND_SCRIPT else release
+    )
+    return extend
+
+
+def lock_taken(released_after: int) -> Mock:
+    """Redis in which another worker holds the lock and announces its release."""
+    client = Mock()
+    client.set.return_value = None
+    client.exists.return_value = 1
+    messages = [None] * (released_after - 1) + [{"type": "message"}]
+    client.pubsub.return_value.get_message.side_effect = messages
+    return client
+
+
+class TestRedisSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        client = lock_holder()
+        flights = RedisSingleFlight(client)
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "weather"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.do("cell", fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+        assert results == ["weather"] * 8
+        client.set.assert_called_once()
+        lock, token = client.set.call_args.args
+        assert lock == "flight:cell"
+        client.register_script.return_value.assert_called_once_with(
+            keys=["flight:cell", "flight:cell:done"], args=[token]
+        )
+
+    def test_errors_reach_every_waiter_and_the_next_call_starts_over(self):
+        flights = RedisSingleFlight(lock_holder())
+
+        def fail():
+            raise ValueError("upstream down")
+
+        with pytest.raises(ValueError):
+            flights.do("cell", fail)
+
+        assert flights.do("cell", lambda: "weather") == "weather"
+
+    def test_waits_for_the_other_worker_then_calls(self):
+        client = lock_taken(released_after=2)
+        flights = RedisSingleFlight(client, poll_interval=0.01)
+
+        assert flights.do("cell", lambda: "cached by now") == "cached by now"
+
+        pubsub = client.pubsub.return_value
+        pubsub.subscribe.assert_called_once_with("flight:cell:done")
+        assert pubsub.get_message.call_count == 2
+        pubsub.close.assert_called_once()
+        client.register_script.return_value.assert_not_called()
+
+    def test_stops_waiting_when_the_lock_expired(self):
+        client = lock_taken(released_after=10)
+        client.exists.side_effect = [1, 0]
+        flights = RedisSingleFlight(client, poll_interval=0.01)
+
+        assert flights.do("cell", lambda: "weather") == "weather"
+        assert client.pubsub.return_value.get_message.call_count == 1
+
+    def test_lock_is_extended_while_the_fetch_outlives_its_ttl(self):
+        client = lock_holder()
+        extend = extended_by(client, Mock(return_value=1))
+        flights = RedisSingleFlight(client, lock_ttl=0.03)
+
+        def fetch():
+            time.sleep(0.1)
+            return "weather"
+
+        assert flights.do("cell", fetch) == "weather"
+
+        token = client.set.call_args.args[1]
+        assert extend.call_count >= 2
+        extend.assert_called_with(keys=["flight:cell"], args=[token, 30])
+        extensions = extend.call_count
+        time.sleep(0.05)
+        assert extend.call_count == extensions
+
+    def test_watchdog_stops_once_the_lock_is_lost(self):
+        client = lock_holder()
+        extend = extended_by(client, Mock(return_value=0))
+        flights = RedisSingleFlight(client, lock_ttl=0.03)
+
+        assert flights.do("cell", lambda: time.sleep(0.1) or "weather") == "weather"
+        assert extend.call_count == 1
+
+    def test_runs_the_call_without_redis(self):
+        client = Mock()
+        client.set.side_effect = redis.RedisError("Connection failed")
+
+        assert RedisSingleFlight(client).do("cell", lambda: "weather") == "weather"
+
+
+class TestAsyncRedisSingleFlight:
+    @staticmethod
+    def client() -> MagicMock:
+        client = MagicMock()
+        client.set = AsyncMock(return_value=True)
+        client.register_script.return_value = AsyncMock()
+        return client
+
+    def test_concurrent_tasks_share_one_call(self):
+        flights = AsyncRedisSingleFlight(self.client())
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "weather"
+
+        async def main():
+            return await asyncio.gather(*(flights.do("cell", fetch) for _ in range(8)))
+
+        assert asyncio.run(main()) == ["weather"] * 8
+        assert calls == [1]
+
+    def test_waiters_take_over_when_the_leader_is_cancelled(self):
+        flights = AsyncRedisSingleFlight(self.client())
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "weather"
+
+        async def main():
+            leader = asyncio.create_task(flights.do("cell", fetch))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(flights.do("cell", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await waiter
+
+        assert asyncio.run(main()) == "weather"
+        assert calls == [1, 1]
+
+    def test_lock_is_extended_while_the_fetch_outlives_its_ttl(self):
+        client = self.client()
+        extend = extended_by(client, AsyncMock(return_value=1))
+        flights = AsyncRedisSingleFlight(client, lock_ttl=0.03)
+
+        async def fetch():
+            await asyncio.sleep(0.1)
+            return "weather"
+
+        async def main():
+            result = await flights.do("cell", fetch)
+            extensions = extend.await_count
+            await asyncio.sleep(0.05)
+            return result, extensions
+
+        result, extensions = asyncio.run(main())
+
+        assert result == "weather"
+        assert extensions >= 2
+        assert extend.await_count == extensions
+        token = client.set.call_args.args[1]
+        extend.assert_awaited_with(keys=["flight:cell"], args=[token, 30])
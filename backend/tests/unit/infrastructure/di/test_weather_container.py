@@ -0,0 +1,123 @@
+import asyncio
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.exceptions import ChangingweatherException
+from src.infrastructure.di.weather_container import WeatherContainer
+from src.infrastructure.services.async_packed_command_adapter import (
+    AsyncPackedCommandAdapter,
+)
+from src.infrastructure.services.packed_command_adapter import PackedCommandAdapter
+from src.infrastructure.services.packed_stored_query_adapter import (
+    PackedStoredQueryAdapter,
+)
+from src.infrastructure.services.write_behind_command_adapter import (
+    WriteBehindCommandAdapter,
+)
+
+
+@pytest.fixture
+def db_session(mocker):
+    """Stand-in for src.db.session, which would connect to postgres on import."""
+    module = types.ModuleType("src.db.session")
+    module.SessionLocal = MagicMock()
+    module.AsyncSessionLocal = MagicMock()
+    module.ReadSessionLocal = MagicMock()
+    module.AsyncReadSessionLocal = MagicMock()
+    module.engine = module.read_engine = MagicMock()
+    module.async_engine = module.async_read_engine = MagicMock()
+    module.async_engine.dispose = AsyncMock()
+    module.async_engine.connect.return_value.__aenter__.return_value.execute = AsyncMock()
+    mocker.patch.dict(sys.modules, {"src.db.session": module})
+    return module
+
+
+@pytest.fixture
+def redis_config():
+    config = MagicMock()
+    config.async_client.return_value = AsyncMock()
+    # redis.asyncio registers scripts and builds pipelines synchronously
+    config.async_client.return_value.register_script = MagicMock()
+    config.async_client.return_value.pipeline = MagicMock()
+    return config
+
+
+class TestWeatherContainer:
+    def test_services_require_startup(self):
+        container = WeatherContainer(redis_config=MagicMock())
+
+        with pytest.raises(ChangingweatherException):
+            container.weather_service()
+
+    def test_startup_creates_clients_once_and_warms_them(self, db_session, redis_config):
+        container = WeatherContainer(redis_config=redis_config)
+
+        asyncio.run(container.startup())
+
+        assert container.async_weather_service() is container.async_weather_service()
+        redis_config.async_client.assert_called_once()
+        redis_config.async_client.return_value.ping.assert_awaited_once()
+        db_session.async_engine.connect.assert_called_once()
+        assert set(container.cache_stats()) == {"async"}
+
+        asyncio.run(container.shutdown())
+
+    def test_sync_stack_is_built_on_first_use(self, db_session, redis_config, mocker):
+        adapter = mocker.patch("src.infrastructure.di.weather_container.OpenMeteoAdapter")
+        container = WeatherContainer(redis_config=redis_config)
+        asyncio.run(container.startup())
+
+        redis_config.client.assert_not_called()
+        adapter.assert_not_called()
+
+        assert container.weather_service() is container.weather_service()
+        redis_config.client.assert_called_once()
+        adapter.assert_called_once()
+        assert set(container.cache_stats()) == {"sync", "async"}
+
+        asyncio.run(container.shutdown())
+        adapter.return_value.close.assert_called_once()
+
+    def test_packed_storage_selects_daily_rows(self, db_session, redis_config):
+        container = WeatherContainer(redis_config=redis_config, packed_storage=True)
+
+        asyncio.run(container.startup())
+
+        assert isinstance(container.weather_service()._query_port, PackedStoredQueryAdapter)
+        assert isinstance(container.weather_service()._command_port, PackedCommandAdapter)
+        assert isinstance(
+            container.async_weather_service()._command_port, AsyncPackedCommandAdapter
+        )
+
+        asyncio.run(container.shutdown())
+
+    def test_write_behind_is_flushed_on_shutdown(self, db_session, redis_config):
+        container = WeatherContainer(redis_config=redis_config, write_behind=True)
+
+        async def run() -> WriteBehindCommandAdapter:
+            await container.startup()
+            command_port = container.weather_service()._command_port
+            await container.shutdown()
+            return command_port
+
+        command_port = asyncio.run(run())
+
+        assert isinstance(command_port, WriteBehindCommandAdapter)
+        assert not command_port._worker.is_alive()
+
+    def test_shutdown_closes_pools(self, db_session, redis_config):
+        container = WeatherContainer(redis_config=redis_config)
+        asyncio.run(container.startup())
+        container.weather_service()
+
+        asyncio.run(container.shutdown())
+
+        redis_config.client.return_value.close.assert_called_once()
+        redis_config.async_client.return_value.aclose.assert_awaited_once()
+        db_session.engine.dispose.assert_called_once()
+        db_session.async_engine.dispose.assert_awaited_once()
+        with pytest.raises(ChangingweatherException):
+            container.async_weather_service()
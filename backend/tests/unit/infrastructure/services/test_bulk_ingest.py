@@ -0,0 +1,230 @@
+import asyncio
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.core.exceptions import ChangingweatherException
+from src.domain.entities.weather import WeatherCoordinate, WeatherData, WeatherSeries
+from src.domain.services.archive import Archive
+from src.infrastructure.services.async_command_adapter import AsyncCommandAdapter
+from src.infrastructure.services.command_adapter import CommandAdapter
+
+
+LOCATION_ID = 7
+
+
+def hourly_data(hours: int) -> WeatherData:
+    return WeatherData(
+        coordinate=WeatherCoordinate(latitude=1.5, longitude=2.5),
+        series=WeatherSeries(
+            timestamps=np.datetime64("2020-01-01T00:00:00")
+            + np.arange(hours) * np.timedelta64(1, "h"),
+            values={"temperature": np.arange(hours, dtype=np.float32)},
+        ),
+    )
+
+
+def compiled(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def session_factory_for(driver: str) -> MagicMock:
+    factory = MagicMock()
+    session = factory.return_value.__enter__.return_value
+    session.get_bind.return_value.dialect.driver = driver
+    session.execute.return_value.scalar_one.return_value = LOCATION_ID
+    return factory
+
+
+def executed(session: MagicMock) -> list[str]:
+    return [str(compiled(call.args[0])) for call in session.execute.call_args_list]
+
+
+def inserted_rows(session: MagicMock) -> list[int]:
+    """Row count of each measurement upsert."""
+    statements = [compiled(call.args[0]) for call in session.execute.call_args_list]
+    return [
+        sum(name.startswith("timestamp") for name in statement.params)
+        for statement in statements
+        if "INSERT INTO weather_measurements" in str(statement)
+    ]
+
+
+class TestCommandAdapterBulkIngest:
+    def test_psycopg_streams_rows_with_copy(self):
+        factory = session_factory_for("psycopg")
+        session = factory.return_value.__enter__.return_value
+        cursor = session.connection.return_value.connection.driver_connection.cursor.return_value
+        copy = cursor.__enter__.return_value.copy
+
+        CommandAdapter(session_factory=factory).cache(hourly_data(24))
+
+        copy.assert_called_once_with(
+            "COPY weather_measurements_staging (location_id, timestamp, temperature, "
+            "relative_humidity, precipitation, wind_speed) FROM STDIN"
+        )
+        write_row = copy.return_value.__enter__.return_value.write_row
+        assert [call.args[0] for call in write_row.call_args_list] == [
+            (LOCATION_ID, datetime(2020, 1, 1, hour), float(hour), None, None, None)
+            for hour in range(24)
+        ]
+        location, partitions, create_staging, upsert = executed(session)
+        assert "INSERT INTO locations" in location
+        assert "ensure_yearly_partitions" in partitions
+        assert "CREATE TEMPORARY TABLE weather_measurements_staging" in create_staging
+        assert "FROM weather_measurements_staging ON CONFLICT" in upsert
+        session.commit.assert_called_once()
+
+    def test_copy_without_a_driver_connection_fails_before_committing(self):
+        factory = session_factory_for("psycopg")
+        session = factory.return_value.__enter__.return_value
+        session.connection.return_value.connection.driver_connection = None
+
+        with pytest.raises(ChangingweatherException):
+            CommandAdapter(session_factory=factory).cache(hourly_data(24))
+
+        session.commit.assert_not_called()
+
+    def test_other_drivers_use_batched_multi_row_inserts(self):
+        factory = session_factory_for("psycopg2")
+        session = factory.return_value.__enter__.return_value
+
+        CommandAdapter(session_factory=factory, batch_size=10).cache(hourly_data(24))
+
+        upserts = executed(session)[2:]
+        assert len(upserts) == 3
+        assert all("ON CONFLICT (location_id, timestamp) DO UPDATE" in upsert for upsert in upserts)
+        session.connection.assert_not_called()
+        session.commit.assert_called_once()
+
+    def test_location_and_partitions_are_resolved_once(self):
+        factory = session_factory_for("psycopg2")
+        session = factory.return_value.__enter__.return_value
+        adapter = CommandAdapter(session_factory=factory)
+
+        adapter.cache(hourly_data(24))
+        adapter.cache(hourly_data(24))
+
+        statements = executed(session)
+        assert sum("INSERT INTO locations" in sql for sql in statements) == 1
+        assert sum("ensure_yearly_partitions" in sql for sql in statements) == 1
+
+    def test_location_is_snapped_to_grid_cell(self):
+        statement = compiled(
+            CommandAdapter._upsert_location(WeatherCoordinate(latitude=52.5213, longitude=13.4049))
+        )
+
+        assert statement.params["cell_latitude"] == 5250
+        assert statement.params["cell_longitude"] == 1340
+        assert statement.params["latitude"] == 52.5
+        assert "RETURNING locations.id" in str(statement)
+
+    def test_partition_span_covers_every_year(self):
+        data = hourly_data(2)
+        data.series.timestamps[-1] = np.datetime64("2022-06-01T00:00:00")
+
+        assert CommandAdapter._years(data) == range(2020, 2023)
+
+    def test_empty_series_does_not_open_a_session(self):
+        factory = session_factory_for("psycopg")
+
+        CommandAdapter(session_factory=factory).cache(hourly_data(0))
+
+        factory.assert_not_called()
+
+    def test_upsert_only_rewrites_changed_rows(self):
+        sql = str(compiled(CommandAdapter._upsert_staged()))
+
+        assert (
+            "DO UPDATE SET temperature = coalesce(excluded.temperature, "
+            "weather_measurements.temperature)" in sql
+        )
+        assert (
+            "WHERE excluded.temperature IS NOT NULL AND weather_measurements.temperature "
+            "IS DISTINCT FROM excluded.temperature OR" in sql
+        )
+
+    def test_invalidate_deletes_by_grid_cell(self):
+        factory = session_factory_for("psycopg")
+        session = factory.return_value.__enter__.return_value
+
+        CommandAdapter(session_factory=factory).invalidate_cache(hourly_data(1).coordinate)
+
+        (statement,) = executed(session)
+        assert statement.startswith("DELETE FROM weather_measurements")
+        assert "locations.cell_latitude" in statement
+
+    def test_incomplete_or_nan_days_are_not_written(self):
+        factory = session_factory_for("psycopg2")
+        coverage = MagicMock()
+        data = hourly_data(48)
+        data.series.temperature[30] = np.nan
+
+        CommandAdapter(session_factory=factory, coverage=coverage).cache(data)
+        CommandAdapter(session_factory=factory, coverage=coverage).cache(hourly_data(23))
+
+        assert inserted_rows(factory.return_value.__enter__.return_value) == [24]
+        coverage.mark.assert_called_once_with(data.coordinate, [date(2020, 1, 1)], "temperature")
+
+    def test_days_within_the_archive_delay_are_not_written(self):
+        factory = session_factory_for("psycopg2")
+        today = np.datetime64(datetime.now(timezone.utc).date(), "s")
+        data = hourly_data(24)
+        data.series.timestamps[:] = today + np.arange(24) * np.timedelta64(1, "h")
+
+        CommandAdapter(session_factory=factory, archive=Archive(delay_days=5)).cache(data)
+
+        factory.assert_not_called()
+
+    def test_committed_days_are_marked_and_invalidation_clears_them(self):
+        factory = session_factory_for("psycopg2")
+        coverage = MagicMock()
+        adapter = CommandAdapter(session_factory=factory, coverage=coverage)
+        data = hourly_data(30)
+
+        adapter.cache(data)
+        adapter.invalidate_cache(data.coordinate)
+
+        # the second day is still short of hours
+        coverage.mark.assert_called_once_with(data.coordinate, [date(2020, 1, 1)], "temperature")
+        coverage.clear.assert_called_once_with(data.coordinate)
+
+    def test_failed_writes_are_not_marked(self):
+        factory = session_factory_for("psycopg2")
+        factory.return_value.__enter__.return_value.commit.side_effect = RuntimeError("gone")
+        coverage = MagicMock()
+
+        with pytest.raises(RuntimeError):
+            CommandAdapter(session_factory=factory, coverage=coverage).cache(hourly_data(24))
+
+        coverage.mark.assert_not_called()
+
+
+class TestAsyncCommandAdapterBulkIngest:
+    def test_psycopg_streams_rows_with_copy(self):
+        copy = MagicMock()
+        copy.write_row = AsyncMock()
+        cursor = MagicMock()
+        cursor.copy.return_value.__aenter__.return_value = copy
+        raw_connection = MagicMock()
+        raw_connection.driver_connection.cursor.return_value.__aenter__.return_value = cursor
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw_connection)
+        session = MagicMock()
+        session.connection = AsyncMock(return_value=connection)
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.scalar_one.return_value = LOCATION_ID
+        session.commit = AsyncMock()
+        session.get_bind.return_value.dialect.driver = "psycopg"
+        factory = MagicMock()
+        factory.return_value.__aenter__.return_value = session
+
+        asyncio.run(AsyncCommandAdapter(session_factory=factory).cache(hourly_data(26)))
+
+        assert copy.write_row.await_count == 24
+        assert copy.write_row.await_args.args[0][0] == LOCATION_ID
+        assert session.execute.await_count == 4
+        session.commit.assert_awaited_once()
@@ -0,0 +1,217 @@
+import asyncio
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.infrastructure.services import series_codec
+from src.infrastructure.services.async_packed_command_adapter import (
+    AsyncPackedCommandAdapter,
+)
+from src.infrastructure.services.async_packed_stored_query_adapter import (
+    AsyncPackedStoredQueryAdapter,
+)
+from src.infrastructure.services.async_query_adapter import AsyncQueryAdapter
+from src.infrastructure.services.packed_command_adapter import PackedCommandAdapter
+from src.infrastructure.services.packed_stored_query_adapter import (
+    PackedStoredQueryAdapter,
+)
+from src.infrastructure.services.query_adapter import QueryAdapter
+from tests.mocks.mock_cache import MockAsyncCache, MockCache
+
+
+COORDINATE = WeatherCoordinate(latitude=1.5, longitude=2.5)
+LOCATION_ID = 7
+
+
+def hourly_data(hours: int, start: str = "2020-01-01T00:00:00") -> WeatherData:
+    return WeatherData(
+        coordinate=COORDINATE,
+        series=WeatherSeries(
+            timestamps=np.datetime64(start) + np.arange(hours) * np.timedelta64(1, "h"),
+            values={"temperature": np.arange(hours, dtype=np.float32)},
+        ),
+    )
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def stored_rows(data: WeatherData) -> list[tuple[bytes]]:
+    """Rows as the reader gets them back for what the writer produced."""
+    return [(row["payload"],) for row in PackedCommandAdapter._day_rows(data, LOCATION_ID)]
+
+
+def session_factory_returning(rows) -> MagicMock:
+    factory = MagicMock()
+    session = factory.return_value.__enter__.return_value
+    session.execute.return_value.scalar_one.return_value = LOCATION_ID
+    session.execute.return_value.all.return_value = rows
+    return factory
+
+
+class TestPackedCommandAdapter:
+    def test_one_row_per_day(self):
+        rows = PackedCommandAdapter._day_rows(hourly_data(40, "2020-01-01T12:00:00"), LOCATION_ID)
+
+        assert [(row["location_id"], row["day"]) for row in rows] == [
+            (LOCATION_ID, date(2020, 1, 1)),
+            (LOCATION_ID, date(2020, 1, 2)),
+            (LOCATION_ID, date(2020, 1, 3)),
+        ]
+
+    def test_one_row_per_day_and_variable(self):
+        data = hourly_data(24)
+        data.series = WeatherSeries(
+            timestamps=data.series.timestamps,
+            values={"temperature": data.series.temperature, "wind_speed": np.ones(24)},
+        )
+
+        rows = PackedCommandAdapter._day_rows(data, LOCATION_ID)
+
+        assert [(row["day"], row["variable"]) for row in rows] == [
+            (date(2020, 1, 1), "temperature"),
+            (date(2020, 1, 1), "wind_speed"),
+        ]
+        assert (
+            series_codec.decode(rows[1]["payload"], "wind_speed").values["wind_speed"].tolist()
+            == [1.0] * 24
+        )
+
+    def test_days_are_upserted_in_batches(self):
+        factory = session_factory_returning([])
+        session = factory.return_value.__enter__.return_value
+
+        PackedCommandAdapter(session_factory=factory, batch_size=2).cache(hourly_data(24 * 5))
+
+        location, partitions, *upserts = [
+            compiled(call.args[0]) for call in session.execute.call_args_list
+        ]
+        assert "INSERT INTO locations" in location
+        assert "ensure_yearly_partitions" in partitions
+        assert "weather_days" in session.execute.call_args_list[1].args[0].compile().params.values()
+        assert len(upserts) == 3
+        assert all(
+            "ON CONFLICT (location_id, day, variable) DO UPDATE" in upsert for upsert in upserts
+        )
+        assert all("IS DISTINCT FROM" in upsert for upsert in upserts)
+        session.connection.assert_not_called()
+        session.commit.assert_called_once()
+
+    def test_invalidate_deletes_days_of_the_cell(self):
+        factory = session_factory_returning([])
+        session = factory.return_value.__enter__.return_value
+
+        PackedCommandAdapter(session_factory=factory).invalidate_cache(COORDINATE)
+
+        assert "DELETE FROM weather_days" in compiled(session.execute.call_args.args[0])
+
+    def test_async_writes_day_rows(self):
+        factory = MagicMock()
+        session = factory.return_value.__aenter__.return_value
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.scalar_one.return_value = LOCATION_ID
+        session.commit = AsyncMock()
+
+        asyncio.run(AsyncPackedCommandAdapter(session_factory=factory).cache(hourly_data(48)))
+
+        upsert = compiled(session.execute.call_args_list[-1].args[0])
+        assert "INSERT INTO weather_days" in upsert
+        session.commit.assert_awaited_once()
+
+
+class TestPackedStoredQueryAdapter:
+    def test_statement_reads_days_of_the_cell(self):
+        statement = compiled(
+            PackedStoredQueryAdapter._statement(
+                COORDINATE,
+                [WeatherQueryOptions(COORDINATE, start=date(2020, 1, 1), end=date(2020, 1, 3))],
+            )
+        )
+
+        assert "SELECT weather_days.payload" in statement
+        assert "weather_days.day >=" in statement
+        assert "ORDER BY weather_days.day" in statement
+
+    def test_lookup_decodes_stored_days_and_reports_the_rest(self):
+        data = hourly_data(48)
+        adapter = PackedStoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory_returning(stored_rows(data)),
+        )
+
+        available, missing = adapter.lookup(
+            WeatherQueryOptions(COORDINATE, start=date(2020, 1, 1), end=date(2020, 1, 3))
+        )
+
+        assert available.series == data.series
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 3), date(2020, 1, 3))
+        ]
+
+    def test_each_missing_variable_is_read_from_its_own_rows(self):
+        data = hourly_data(24)
+        factory = session_factory_returning(stored_rows(data))
+        session = factory.return_value.__enter__.return_value
+        adapter = PackedStoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()), session_factory=factory
+        )
+
+        available, missing = adapter.lookup(
+            WeatherQueryOptions(
+                COORDINATE,
+                start=date(2020, 1, 1),
+                end=date(2020, 1, 1),
+                variables=("temperature", "precipitation"),
+            )
+        )
+
+        statements = [compiled(call.args[0]) for call in session.execute.call_args_list]
+        assert len(statements) == 2
+        assert all(
+            "weather_days.variable = %(variable_1)s" in statement for statement in statements
+        )
+        assert [
+            call.args[0].compile().params["variable_1"] for call in session.execute.call_args_list
+        ] == ["temperature", "precipitation"]
+        assert missing == []
+        assert available.series.values.keys() == {"temperature", "precipitation"}
+
+    def test_read_trims_partial_days(self):
+        adapter = PackedStoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory_returning(stored_rows(hourly_data(48))),
+        )
+
+        series = adapter.read(COORDINATE, datetime(2020, 1, 1, 22), datetime(2020, 1, 2, 3))
+
+        assert series.timestamps.tolist() == [
+            datetime(2020, 1, 1, 22),
+            datetime(2020, 1, 1, 23),
+            *(datetime(2020, 1, 2, hour) for hour in range(3)),
+        ]
+        assert series.temperature.tolist() == [22.0, 23.0, 24.0, 25.0, 26.0]
+
+    def test_async_read_trims_partial_days(self):
+        factory = MagicMock()
+        session = factory.return_value.__aenter__.return_value
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.all.return_value = stored_rows(hourly_data(48))
+        adapter = AsyncPackedStoredQueryAdapter(
+            cache=AsyncQueryAdapter(cache=MockAsyncCache()), session_factory=factory
+        )
+
+        series = asyncio.run(
+            adapter.read(COORDINATE, datetime(2020, 1, 2, 12), datetime(2020, 1, 3))
+        )
+
+        assert len(series) == 12
+        assert series[0].timestamp == datetime(2020, 1, 2, 12)
@@ -2,6 +2,7 @@ import datetime
 import json
 from datetime import date
 
+import numpy as np
 import pytest
 
 from src.domain.entities.weather import (
@@ -10,6 +11,7 @@ from src.domain.entities.weather import (
     WeatherDataPoint,
     WeatherQueryOptions,
 )
+from src.infrastructure.services import series_codec
 from src.infrastructure.services.query_adapter import QueryAdapter
 from tests.mocks.mock_cache import MockCache
 
@@ -20,15 +22,15 @@ def mock_cache():
 
 
 class TestQueryAdapter:
-    def test__cache_key(self):
+    def test__cache_keys(self):
         options = WeatherQueryOptions(
             coordinate=WeatherCoordinate(latitude=-10, longitude=10),
             start=datetime.date(2020, 1, 1),
             end=datetime.date(2020, 1, 2),
         )
 
-        cached_key = QueryAdapter._cache_key(options)
-        assert cached_key == "-10:10:2020-01-01:2020-01-02"
+        cached_keys = QueryAdapter._cache_keys(options)
+        assert cached_keys == ["-10:10:2020-01-01", "-10:10:2020-01-02"]
 
     @pytest.mark.parametrize(
         "data, expected",
@@ -48,61 +50,114 @@ class TestQueryAdapter:
         ],
     )
     def test__deserialize(self, data, expected):
-        assert QueryAdapter._deserialize(data) == expected
+        assert QueryAdapter._deserialize(data).points() == expected
 
-    @pytest.mark.parametrize(
-        "data, expected",
-        [
-            ([], "[]"),
-            (
-                [WeatherDataPoint(temperature=273.15, timestamp=datetime.datetime(2020, 1, 1))],
-                '[{"temperature": 273.15, "timestamp": 1577836800.0}]',
-            ),
-            (
-                [
-                    WeatherDataPoint(temperature=273.15, timestamp=datetime.datetime(2020, 1, 1)),
-                    WeatherDataPoint(temperature=274.15, timestamp=datetime.datetime(2021, 1, 1)),
-                ],
-                '[{"temperature": 273.15, "timestamp": 1577836800.0}, {"temperature": 274.15, "timestamp": 1609459200.0}]',
-            ),
-        ],
-    )
-    def test__serialize(self, data, expected):
-        test_data = WeatherData(coordinate=WeatherCoordinate(latitude=-10, longitude=10), data=data)
-        serialized = QueryAdapter._serialize(test_data)
-        assert serialized == expected
+    def test__serialize_writes_binary_payload(self, mock_cache):
+        test_data = WeatherData(
+            coordinate=WeatherCoordinate(latitude=-10, longitude=10),
+            data=[
+                WeatherDataPoint(temperature=273.25, timestamp=datetime.datetime(2020, 1, 1, hour))
+                for hour in range(3)
+            ],
+        )
+
+        serialized = QueryAdapter(cache=mock_cache)._serialize(test_data)
+
+        assert serialized.startswith(series_codec.MAGIC)
+        assert len(serialized) == series_codec._HEADER.size + 3 * 4
 
-    def test_serialize_deserialize(self):
+    def test_serialize_deserialize(self, mock_cache):
         coordinate = WeatherCoordinate(latitude=-10, longitude=10)
         data = WeatherData(
             coordinate=coordinate,
             data=[
-                WeatherDataPoint(temperature=273.15, timestamp=datetime.datetime(2020, 1, 1)),
-                WeatherDataPoint(temperature=274.15, timestamp=datetime.datetime(2021, 1, 1)),
+                WeatherDataPoint(temperature=273.25, timestamp=datetime.datetime(2020, 1, 1)),
+                WeatherDataPoint(temperature=274.5, timestamp=datetime.datetime(2021, 1, 1)),
             ],
         )
-        assert QueryAdapter._deserialize(serialized_data=QueryAdapter._serialize(data)) == data.data
+        serialized = QueryAdapter(cache=mock_cache)._serialize(data)
+        assert QueryAdapter._deserialize(serialized_data=serialized) == data.series
 
-    def test_roundtrip_serialize_deserialize(self):
+    def test_roundtrip_serialize_deserialize(self, mock_cache):
         coordinate = WeatherCoordinate(latitude=-10, longitude=10)
         data = WeatherData(
             coordinate=coordinate,
             data=[
-                WeatherDataPoint(temperature=273.15, timestamp=datetime.datetime(2020, 1, 1)),
-                WeatherDataPoint(temperature=274.15, timestamp=datetime.datetime(2021, 1, 1)),
+                WeatherDataPoint(temperature=273.25, timestamp=datetime.datetime(2020, 1, 1)),
+                WeatherDataPoint(temperature=274.5, timestamp=datetime.datetime(2021, 1, 1)),
             ],
         )
         options = WeatherQueryOptions(
             coordinate=coordinate, start=datetime.date(2020, 1, 1), end=datetime.date(2020, 1, 2)
         )
+        serialized = QueryAdapter(cache=mock_cache)._serialize(data)
         assert (
             QueryAdapter.map_to_model(
-                data=QueryAdapter._deserialize(serialized_data=QueryAdapter._serialize(data)),
+                data=QueryAdapter._deserialize(serialized_data=serialized),
                 options=options,
             )
             == data
         )
 
+    def test_variables_are_cached_apart_and_only_missing_ones_reported(self, mock_cache):
+        adapter = QueryAdapter(cache=mock_cache)
+        coordinate = WeatherCoordinate(latitude=1.0, longitude=2.0)
+        temperature = WeatherData(
+            coordinate=coordinate,
+            data=[
+                WeatherDataPoint(temperature=1.0, timestamp=datetime.datetime(2020, 1, day, hour))
+                for day in (1, 2)
+                for hour in range(24)
+            ],
+        )
+        adapter.cache(
+            temperature,
+            WeatherQueryOptions(coordinate, start=date(2020, 1, 1), end=date(2020, 1, 2)),
+        )
+        options = WeatherQueryOptions(
+            coordinate,
+            start=date(2020, 1, 1),
+            end=date(2020, 1, 3),
+            variables=("temperature", "precipitation"),
+        )
+
+        cached, missing = adapter.lookup(options)
+
+        assert adapter._cache_keys(options)[:2] == [
+            "1:2:2020-01-01",
+            "1:2:2020-01-01:precipitation",
+        ]
+        assert [(part.start, part.end, part.variables) for part in missing] == [
+            (date(2020, 1, 1), date(2020, 1, 3), ("precipitation", "temperature"))
+        ]
+        assert len(cached.series) == 48
+        assert cached.series.temperature.tolist() == [1.0] * 48
+        assert np.isnan(cached.series.values["precipitation"]).all()
+
+        adapter.cache(
+            WeatherData(coordinate, series=cached.series.select(["precipitation"])), options
+        )
+        assert [(part.start, part.end, part.variables) for part in adapter.lookup(options)[1]] == [
+            (date(2020, 1, 3), date(2020, 1, 3), ("temperature", "precipitation"))
+        ]
+
+    def test_unreadable_entry_is_a_miss(self, mock_cache):
+        adapter = QueryAdapter(cache=mock_cache)
+        options = WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=1.0, longitude=2.0),
+            start=date(2020, 1, 1),
+            end=date(2020, 1, 2),
+        )
+        mock_cache.set(
+            adapter._cache_keys(options)[0], series_codec.MAGIC + bytes([99]) + bytes(18)
+        )
+
+        cached, missing = adapter.lookup(options)
+        assert cached.data == []
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 1), date(2020, 1, 2))
+        ]
+
     def test_cache_miss_returns_empty_weather_data(self, mock_cache):
         adapter = QueryAdapter(cache=mock_cache)
 
@@ -124,7 +179,7 @@ class TestQueryAdapter:
         options = WeatherQueryOptions(
             coordinate=WeatherCoordinate(latitude=1.0, longitude=2.0),
             start=date(2020, 1, 1),
-            end=date(2020, 1, 2),
+            end=date(2020, 1, 1),
         )
 
         test_timestamp = datetime.datetime(2020, 1, 1, 12, 0)
@@ -137,7 +192,7 @@ class TestQueryAdapter:
             ]
         )
 
-        cache_key = adapter._cache_key(options)
+        cache_key = adapter._cache_keys(options)[0]
         mock_cache.set(cache_key, cached_data)
 
         result = adapter.get(options)
@@ -156,23 +211,23 @@ class TestQueryAdapter:
             end=date(2020, 1, 2),
         )
 
-        key1 = adapter._cache_key(options)
-        key2 = adapter._cache_key(options)
+        key1 = adapter._cache_keys(options)
+        key2 = adapter._cache_keys(options)
 
         assert key1 == key2
-        assert key1 == "1.12:2.68:2020-01-01:2020-01-02"
+        assert key1 == ["1.1:2.7:2020-01-01", "1.1:2.7:2020-01-02"]
 
-    def test_cache_key_rounds_coordinates(self, mock_cache):
+    def test_cache_key_snaps_coordinates_to_grid_cell(self, mock_cache):
         adapter = QueryAdapter(cache=mock_cache)
 
         options = WeatherQueryOptions(
             coordinate=WeatherCoordinate(latitude=1.126, longitude=2.674),
-            start=date(2020, 1, 1),
+            start=datetime.datetime(2020, 1, 1, 13),
             end=date(2020, 1, 2),
         )
 
-        key = adapter._cache_key(options)
-        assert key == "1.13:2.67:2020-01-01:2020-01-02"
+        key = adapter._cache_keys(options)[0]
+        assert key == "1.1:2.7:2020-01-01"
 
     def test_serialization_round_trip(self, mock_cache):
         adapter = QueryAdapter(cache=mock_cache)
@@ -212,10 +267,65 @@ class TestQueryAdapter:
 
         adapter.cache(weather_data, options)
 
-        cache_key = adapter._cache_key(options)
-        cached_value = mock_cache.get(cache_key)
+        cache_key = adapter._cache_keys(options)[0]
+        cached_value = mock_cache.get_bytes(cache_key)
 
         assert cached_value is not None
         deserialized = adapter._deserialize(cached_value)
         assert len(deserialized) == 1
         assert deserialized[0].temperature == 25.0
+
+    def test_cache_writes_one_segment_per_day(self, mock_cache):
+        adapter = QueryAdapter(cache=mock_cache)
+        options = WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=1.0, longitude=2.0),
+            start=date(2020, 1, 1),
+            end=date(2020, 1, 2),
+        )
+        weather_data = WeatherData(
+            coordinate=options.coordinate,
+            data=[
+                WeatherDataPoint(
+                    temperature=float(hour),
+                    timestamp=datetime.datetime(2020, 1, 1) + datetime.timedelta(hours=hour),
+                )
+                for hour in range(48)
+            ],
+        )
+
+        adapter.cache(weather_data, options)
+
+        first_day, second_day = mock_cache.get_many(adapter._cache_keys(options))
+        assert adapter._deserialize(first_day).temperature.tolist() == list(range(24))
+        assert adapter._deserialize(second_day).temperature.tolist() == list(range(24, 48))
+        assert adapter.get(options) == weather_data
+
+    def test_lookup_reports_missing_days_as_ranges(self, mock_cache):
+        adapter = QueryAdapter(cache=mock_cache)
+        coordinate = WeatherCoordinate(latitude=1.0, longitude=2.0)
+        for day in (2, 5):
+            cached_day = WeatherQueryOptions(
+                coordinate=coordinate, start=date(2020, 1, day), end=date(2020, 1, day)
+            )
+            adapter.cache(
+                WeatherData(
+                    coordinate=coordinate,
+                    data=[
+                        WeatherDataPoint(
+                            temperature=float(day), timestamp=datetime.datetime(2020, 1, day)
+                        )
+                    ],
+                ),
+                cached_day,
+            )
+
+        cached, missing = adapter.lookup(
+            WeatherQueryOptions(coordinate=coordinate, start=date(2020, 1, 1), end=date(2020, 1, 6))
+        )
+
+        assert cached.series.temperature.tolist() == [2.0, 5.0]
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 1), date(2020, 1, 1)),
+            (date(2020, 1, 3), date(2020, 1, 4)),
+            (date(2020, 1, 6), date(2020, 1, 6)),
+        ]
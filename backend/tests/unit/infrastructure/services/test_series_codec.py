@@ -0,0 +1,79 @@
+import datetime
+import json
+
+import numpy as np
+import pytest
+
+from src.domain.entities.weather import WeatherSeries
+from src.infrastructure.services import series_codec
+
+
+def hourly_series(hours: int) -> WeatherSeries:
+    start = np.datetime64(datetime.datetime(2020, 1, 1), "s")
+    return WeatherSeries(
+        timestamps=start + np.arange(hours) * np.timedelta64(1, "h"),
+        values={"temperature": np.linspace(-10, 30, hours, dtype=np.float32)},
+    )
+
+
+class TestSeriesCodec:
+    @pytest.mark.parametrize("hours", [0, 1, 2, 24, 24 * 365])
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_regular_roundtrip(self, hours, compress):
+        series = hourly_series(hours)
+
+        assert series_codec.decode(series_codec.encode(series, compress=compress)) == series
+
+    def test_regular_series_stores_no_timestamps(self):
+        encoded = series_codec.encode(hourly_series(24), compress=False)
+
+        assert len(encoded) == series_codec._HEADER.size + 24 * 4
+
+    def test_irregular_roundtrip(self):
+        series = WeatherSeries(
+            timestamps=np.array(
+                ["2020-01-01T00:00", "2020-01-01T01:00", "2020-01-01T05:00"], dtype="datetime64[s]"
+            ),
+            values={"temperature": np.array([1.0, 2.0, np.nan], dtype=np.float32)},
+        )
+
+        decoded = series_codec.decode(series_codec.encode(series))
+
+        assert np.array_equal(decoded.timestamps, series.timestamps)
+        assert np.array_equal(decoded.temperature, series.temperature, equal_nan=True)
+
+    def test_large_payload_is_compressed(self):
+        encoded = series_codec.encode(hourly_series(24 * 365))
+        _, _, flags, *_ = series_codec._HEADER.unpack_from(encoded)
+
+        assert flags & series_codec.FLAG_COMPRESSED
+
+    def test_an_order_of_magnitude_smaller_than_json(self):
+        series = hourly_series(24 * 365)
+        legacy = json.dumps(
+            [
+                {"temperature": temperature, "timestamp": float(epoch)}
+                for temperature, epoch in zip(
+                    series.temperature.tolist(),
+                    series.timestamps.astype(np.int64).tolist(),
+                    strict=True,
+                )
+            ]
+        )
+
+        assert len(series_codec.encode(series)) * 10 < len(legacy)
+
+    def test_decodes_legacy_json(self):
+        legacy = '[{"temperature": 273.15, "timestamp": 1577836800.0}]'
+
+        decoded = series_codec.decode(legacy)
+
+        assert decoded.points()[0].temperature == 273.15
+        assert decoded.points()[0].timestamp == datetime.datetime(2020, 1, 1)
+
+    def test_unknown_version_is_rejected(self):
+        encoded = bytearray(series_codec.encode(hourly_series(2)))
+        encoded[3] = series_codec.VERSION + 1
+
+        with pytest.raises(ValueError):
+            series_codec.decode(bytes(encoded))
@@ -0,0 +1,272 @@
+import asyncio
+import datetime
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.domain.entities.weather import (
+    WeatherCoordinate,
+    WeatherData,
+    WeatherQueryOptions,
+    WeatherSeries,
+)
+from src.domain.services.archive import Archive
+from src.infrastructure.services.async_query_adapter import AsyncQueryAdapter
+from src.infrastructure.services.async_stored_query_adapter import (
+    AsyncStoredQueryAdapter,
+)
+from src.infrastructure.services.command_adapter import CommandAdapter
+from src.infrastructure.services.query_adapter import QueryAdapter
+from src.infrastructure.services.stored_query_adapter import StoredQueryAdapter
+from tests.mocks.mock_cache import MockAsyncCache, MockCache
+
+
+COORDINATE = WeatherCoordinate(latitude=1.0, longitude=2.0)
+
+
+def options(start: int, end: int) -> WeatherQueryOptions:
+    return WeatherQueryOptions(
+        coordinate=COORDINATE, start=date(2020, 1, start), end=date(2020, 1, end)
+    )
+
+
+def rows_for(*days: int) -> list[tuple[datetime.datetime, float]]:
+    return [
+        (datetime.datetime(2020, 1, day, hour), float(day)) for day in days for hour in range(24)
+    ]
+
+
+@pytest.fixture
+def session_factory():
+    factory = MagicMock()
+    factory.return_value.__enter__.return_value.execute.return_value.all.return_value = []
+    return factory
+
+
+def stored(session_factory, rows):
+    session_factory.return_value.__enter__.return_value.execute.return_value.all.return_value = rows
+
+
+class TestStoredQueryAdapter:
+    def test_cache_hit_does_not_touch_database(self, session_factory):
+        cache = QueryAdapter(cache=MockCache())
+        cache.cache(
+            WeatherData(coordinate=COORDINATE, series=StoredQueryAdapter._series(rows_for(1))),
+            options(1, 1),
+        )
+        adapter = StoredQueryAdapter(cache=cache, session_factory=session_factory)
+
+        available, missing = adapter.lookup(options(1, 1))
+
+        assert missing == []
+        assert len(available.series) == 24
+        session_factory.assert_not_called()
+
+    def test_stored_days_fill_the_cache_and_only_gaps_remain(self, session_factory):
+        cache = QueryAdapter(cache=MockCache())
+        adapter = StoredQueryAdapter(cache=cache, session_factory=session_factory)
+        stored(session_factory, rows_for(1, 2))
+
+        available, missing = adapter.lookup(options(1, 3))
+
+        assert len(available.series) == 48
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 3), date(2020, 1, 3))
+        ]
+        assert cache.get(options(1, 2)).series == available.series
+
+    def test_merges_cached_and_stored_days_in_order(self, session_factory):
+        cache = QueryAdapter(cache=MockCache())
+        cache.cache(
+            WeatherData(coordinate=COORDINATE, series=StoredQueryAdapter._series(rows_for(2))),
+            options(2, 2),
+        )
+        adapter = StoredQueryAdapter(cache=cache, session_factory=session_factory)
+        # the query spans day 1 to 3; day 2 rows are not part of the gaps
+        stored(session_factory, rows_for(1, 2, 3))
+
+        available = adapter.get(options(1, 3))
+
+        assert available.series.temperature.tolist() == [1.0] * 24 + [2.0] * 24 + [3.0] * 24
+
+    def test_days_with_nan_or_missing_hours_count_as_missing(self, session_factory):
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()), session_factory=session_factory
+        )
+        rows = rows_for(1, 2, 3)
+        rows[30] = (rows[30][0], float("nan"))
+        stored(session_factory, rows[:-1])
+
+        available, missing = adapter.lookup(options(1, 3))
+
+        assert available.series.temperature.tolist() == [1.0] * 24
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 2), date(2020, 1, 3))
+        ]
+
+    def test_days_within_the_archive_delay_count_as_missing(self, session_factory):
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        recent = WeatherQueryOptions(
+            coordinate=COORDINATE, start=today - datetime.timedelta(days=6), end=today
+        )
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory,
+            archive=Archive(delay_days=5),
+        )
+        stored(
+            session_factory,
+            [
+                (
+                    datetime.datetime.combine(
+                        recent.start + datetime.timedelta(days=day), datetime.time(hour)
+                    ),
+                    1.0,
+                )
+                for day in range(7)
+                for hour in range(24)
+            ],
+        )
+
+        available, missing = adapter.lookup(recent)
+
+        assert len(available.series) == 48
+        assert [(part.start, part.end) for part in missing] == [
+            (today - datetime.timedelta(days=4), today)
+        ]
+
+    def test_statement_filters_grid_cell_and_window(self):
+        statement = StoredQueryAdapter._statement(
+            WeatherCoordinate(latitude=1.004, longitude=-2.006), [options(1, 1), options(3, 4)]
+        )
+        compiled = statement.compile(dialect=postgresql.dialect())
+
+        assert "JOIN locations ON locations.id = weather_measurements.location_id" in str(compiled)
+        assert "ORDER BY weather_measurements.timestamp" in str(compiled)
+        assert compiled.params["cell_latitude_1"] == 100
+        assert compiled.params["cell_longitude_1"] == -200
+        assert compiled.params["timestamp_1"] == datetime.datetime(2020, 1, 1)
+        assert compiled.params["timestamp_2"] == datetime.datetime(2020, 1, 5)
+
+
+class TestStoredQueryAdapterCoverage:
+    def test_uncovered_days_skip_the_database(self, session_factory):
+        coverage = MagicMock()
+        coverage.covered.return_value = [False, False, False]
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory,
+            coverage=coverage,
+        )
+
+        available, missing = adapter.lookup(options(1, 3))
+
+        assert len(available.series) == 0
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 1), date(2020, 1, 3))
+        ]
+        session_factory.return_value.__enter__.return_value.execute.assert_not_called()
+
+    def test_queries_only_the_covered_days(self, session_factory):
+        coverage = MagicMock()
+        coverage.covered.return_value = [False, True, True, False]
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory,
+            coverage=coverage,
+        )
+        stored(session_factory, rows_for(2, 3))
+
+        available, missing = adapter.lookup(options(1, 4))
+
+        statement = session_factory.return_value.__enter__.return_value.execute.call_args.args[0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params["timestamp_1"] == datetime.datetime(2020, 1, 2)
+        assert params["timestamp_2"] == datetime.datetime(2020, 1, 4)
+        assert len(available.series) == 48
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 1), date(2020, 1, 1)),
+            (date(2020, 1, 4), date(2020, 1, 4)),
+        ]
+
+    def test_unindexed_location_is_loaded_from_the_stored_days(self, session_factory):
+        coverage = MagicMock()
+        coverage.covered.return_value = None
+        session = session_factory.return_value.__enter__.return_value
+        session.execute.return_value.scalars.return_value = [date(2020, 1, 2)]
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()),
+            session_factory=session_factory,
+            coverage=coverage,
+        )
+        stored(session_factory, rows_for(2))
+
+        available, _ = adapter.lookup(options(1, 3))
+
+        coverage.load.assert_called_once_with(COORDINATE, [date(2020, 1, 2)], "temperature")
+        days_statement = str(session.execute.call_args_list[0].args[0])
+        assert "SELECT DISTINCT CAST(weather_measurements.timestamp AS DATE)" in days_statement
+        assert len(available.series) == 24
+
+    def test_other_variables_round_trip_through_their_column(self, session_factory):
+        wind_speed = np.arange(24, dtype=np.float64)
+        data = WeatherData(
+            coordinate=COORDINATE,
+            series=WeatherSeries(
+                timestamps=np.datetime64("2020-01-01T00:00:00")
+                + np.arange(24) * np.timedelta64(1, "h"),
+                values={"wind_speed": wind_speed},
+            ),
+        )
+        write_factory = MagicMock()
+        write_session = write_factory.return_value.__enter__.return_value
+        write_session.get_bind.return_value.dialect.driver = "psycopg2"
+        write_session.execute.return_value.scalar_one.return_value = 7
+
+        CommandAdapter(session_factory=write_factory).cache(data)
+
+        upsert = write_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "wind_speed = coalesce(excluded.wind_speed" in str(upsert)
+        assert upsert.params["temperature_m0"] is None
+        rows = [
+            (upsert.params[f"timestamp_m{row}"], upsert.params[f"wind_speed_m{row}"])
+            for row in range(24)
+        ]
+        stored(session_factory, rows)
+        request = options(1, 1)
+        request.variables = ("wind_speed",)
+        adapter = StoredQueryAdapter(
+            cache=QueryAdapter(cache=MockCache()), session_factory=session_factory
+        )
+
+        available, missing = adapter.lookup(request)
+
+        statement = session_factory.return_value.__enter__.return_value.execute.call_args.args[0]
+        assert "SELECT weather_measurements.timestamp, weather_measurements.wind_speed" in str(
+            statement
+        )
+        assert "weather_measurements.wind_speed IS NOT NULL" in str(statement)
+        assert missing == []
+        assert available.series == data.series
+
+
+class TestAsyncStoredQueryAdapter:
+    def test_stored_days_are_served_and_cached(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.all.return_value = rows_for(1)
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+        cache = AsyncQueryAdapter(cache=MockAsyncCache())
+        adapter = AsyncStoredQueryAdapter(cache=cache, session_factory=session_factory)
+
+        available, missing = asyncio.run(adapter.lookup(options(1, 2)))
+
+        assert len(available.series) == 24
+        assert [(part.start, part.end) for part in missing] == [
+            (date(2020, 1, 2), date(2020, 1, 2))
+        ]
+        assert len(asyncio.run(cache.get(options(1, 1))).series) == 24
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from src.domain.entities.weather import WeatherCoordinate, WeatherData, WeatherSeries
+from src.infrastructure.services.async_write_behind_command_adapter import (
+    AsyncWriteBehindCommandAdapter,
+)
+from src.infrastructure.services.write_behind_command_adapter import (
+    WriteBehindCommandAdapter,
+    coalesce,
+)
+
+
+COORDINATE = WeatherCoordinate(latitude=1.0, longitude=2.0)
+
+
+def hourly(start_hour: int, hours: int, value: float = 0.0) -> WeatherData:
+    return WeatherData(
+        coordinate=COORDINATE,
+        series=WeatherSeries(
+            timestamps=np.datetime64("2020-01-01T00:00:00")
+            + np.arange(start_hour, start_hour + hours) * np.timedelta64(1, "h"),
+            values={"temperature": np.full(hours, value)},
+        ),
+    )
+
+
+class BlockingPort:
+    """Command port whose writes wait for `release`."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written: list[WeatherData] = []
+
+    def cache(self, data: WeatherData) -> None:
+        self.release.wait(timeout=5)
+        self.written.append(data)
+
+    def invalidate_cache(self, coordinate: WeatherCoordinate) -> None:
+        self.written.clear()
+
+
+class TestCoalesce:
+    def test_overlapping_writes_of_a_coordinate_become_one_with_the_latest_values(self):
+        (merged,) = coalesce([hourly(0, 3, value=1.0), hourly(2, 3, value=2.0)])
+
+        assert len(merged.series) == 5
+        assert merged.series.temperature.tolist() == [1.0, 1.0, 2.0, 2.0, 2.0]
+
+    def test_coordinates_stay_apart(self):
+        other = WeatherData(coordinate=WeatherCoordinate(3.0, 4.0), series=hourly(0, 1).series)
+
+        assert len(coalesce([hourly(0, 1), other])) == 2
+
+
+class TestWriteBehindCommandAdapter:
+    def test_cache_returns_before_the_write(self):
+        port = BlockingPort()
+        adapter = WriteBehindCommandAdapter(port)
+
+        adapter.cache(hourly(0, 24))
+
+        assert port.written == []
+        port.release.set()
+        adapter.flush()
+        assert len(port.written) == 1
+        adapter.close()
+
+    def test_full_queue_writes_through(self):
+        port = BlockingPort()
+        adapter = WriteBehindCommandAdapter(port, max_pending=1, put_timeout=0.01)
+        adapter.cache(hourly(0, 1))  # taken by the worker, which blocks
+        while adapter.pending:
+            pass
+        adapter.cache(hourly(1, 1))  # fills the queue
+
+        writer = threading.Thread(target=adapter.cache, args=(hourly(2, 1),))
+        writer.start()
+        port.release.set()
+        writer.join(timeout=5)
+        adapter.close()
+
+        assert sorted(len(data.series) for data in port.written) == [1, 1, 1]
+
+    def test_failed_writes_are_retried(self):
+        port = MagicMock()
+        port.cache.side_effect = [ConnectionError, ConnectionError, None]
+        adapter = WriteBehindCommandAdapter(port, retry_delay=0)
+
+        adapter.cache(hourly(0, 1))
+        adapter.flush()
+
+        assert port.cache.call_count == 3
+        assert adapter.failed == 0
+        adapter.close()
+
+    def test_writes_are_dropped_after_the_last_retry(self):
+        port = MagicMock()
+        port.cache.side_effect = ConnectionError
+        adapter = WriteBehindCommandAdapter(port, retries=1, retry_delay=0)
+
+        adapter.cache(hourly(0, 1))
+        adapter.flush()
+
+        assert port.cache.call_count == 2
+        assert adapter.failed == 1
+        adapter.close()
+
+    def test_close_flushes_and_later_writes_go_through(self):
+        port = BlockingPort()
+        port.release.set()
+        adapter = WriteBehindCommandAdapter(port)
+        adapter.cache(hourly(0, 1))
+
+        adapter.close()
+        assert len(port.written) == 1
+
+        adapter.cache(hourly(1, 1))
+        assert len(port.written) == 2
+
+    def test_invalidate_runs_after_queued_writes(self):
+        port = BlockingPort()
+        port.release.set()
+        adapter = WriteBehindCommandAdapter(port)
+        adapter.cache(hourly(0, 1))
+
+        adapter.invalidate_cache(COORDINATE)
+
+        assert port.written == []
+        adapter.close()
+
+
+class TestAsyncWriteBehindCommandAdapter:
+    def test_close_flushes_queued_writes(self):
+        port = AsyncMock()
+
+        async def run() -> None:
+            adapter = AsyncWriteBehindCommandAdapter(port)
+            await adapter.cache(hourly(0, 24))
+            await adapter.cache(hourly(24, 24))
+            await adapter.close()
+
+        asyncio.run(run())
+
+        assert sum(len(call.args[0].series) for call in port.cache.await_args_list) == 48
+
+    def test_failed_writes_are_retried(self):
+        port = AsyncMock()
+        port.cache.side_effect = [ConnectionError, None]
+
+        async def run() -> AsyncWriteBehindCommandAdapter:
+            adapter = AsyncWriteBehindCommandAdapter(port, retry_delay=0)
+            await adapter.cache(hourly(0, 1))
+            await adapter.flush()
+            await adapter.close()
+            return adapter
+
+        assert asyncio.run(run()).failed == 0
+        assert port.cache.await_count == 2
+
+    def test_close_timeout_cancels_the_worker_and_counts_the_dropped_writes(self, caplog):
+        async def hang(data: WeatherData) -> None:
+            await asyncio.Event().wait()
+
+        port = AsyncMock()
+        port.cache.side_effect = hang
+
+        async def run() -> AsyncWriteBehindCommandAdapter:
+            adapter = AsyncWriteBehindCommandAdapter(port, batch_size=1)
+            for start in (0, 24, 48):
+                await adapter.cache(hourly(start, 24))
+            await adapter.close(timeout=0.05)
+            return adapter
+
+        adapter = asyncio.run(run())
+
+        assert adapter._worker.cancelled()
+        assert adapter.failed == 3
+        assert adapter.pending == 0
+        assert "dropped 3 writes" in caplog.text
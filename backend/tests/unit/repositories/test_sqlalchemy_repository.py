@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlmodel import Field, SQLModel
+
+from src.repositories.sqlalchemy import BaseSQLAlchemyRepository
+
+
+class Reading(SQLModel, table=True):
+    __tablename__ = "test_repository_readings"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    station: str = Field(unique=True)
+    value: float = Field(index=True)
+
+
+class ReadingRepository(BaseSQLAlchemyRepository[Reading, Reading, Reading]):
+    _model = Reading
+
+
+@pytest.fixture
+def repository():
+    engine = create_engine("sqlite://")
+    Reading.__table__.create(engine)
+    with Session(engine) as session:
+        yield ReadingRepository(session)
+
+
+def readings(count: int) -> list[Reading]:
+    return [Reading(station=f"s{index:03}", value=float(index % 5)) for index in range(count)]
+
+
+class TestBaseSQLAlchemyRepository:
+    def test_create_many_inserts_in_batches(self, repository):
+        assert repository.create_many(readings(25), batch_size=10) == 25
+
+        assert len(repository.f()) == 25
+        assert repository.get(station="s024").value == 4.0
+
+    def test_upsert_many_updates_conflicting_rows(self, repository):
+        repository.create_many(readings(3))
+
+        repository.upsert_many(
+            [Reading(station="s001", value=9.0), Reading(station="s100", value=1.0)],
+            index_elements=["station"],
+            update_fields=["value"],
+        )
+
+        assert len(repository.f()) == 4
+        assert repository.get(station="s001").value == 9.0
+
+    def test_upsert_many_without_update_fields_keeps_existing_rows(self, repository):
+        repository.create_many(readings(1))
+
+        repository.upsert_many([Reading(station="s000", value=9.0)], index_elements=["station"])
+
+        assert repository.get(station="s000").value == 0.0
+
+    def test_page_walks_all_rows_once_in_key_order(self, repository):
+        repository.create_many(readings(23))
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = repository.page(after=cursor, limit=5, sort_field="value")
+            seen.extend(items)
+            if cursor is None:
+                break
+
+        assert len({item.id for item in seen}) == 23
+        assert [item.value for item in seen] == sorted(item.value for item in seen)
+
+    def test_page_descending_with_filter(self, repository):
+        repository.create_many(readings(20))
+
+        items, cursor = repository.page(limit=3, sort_order="desc", value=1.0)
+        rest, last = repository.page(after=cursor, limit=3, sort_order="desc", value=1.0)
+
+        assert [item.id for item in items + rest] == [17, 12, 7, 2]
+        assert last is None
+
+    def test_stream_yields_every_match(self, repository):
+        repository.create_many(readings(30))
+
+        streamed = list(repository.stream(batch_size=4, value=2.0))
+
+        assert [item.station for item in streamed] == [
+            f"s{index:03}" for index in (2, 7, 12, 17, 22, 27)
+        ]
+
+    def test_create_raises_when_the_commit_fails(self, repository):
+        repository.create(Reading(station="s000", value=1.0))
+
+        with pytest.raises(IntegrityError):
+            repository.create(Reading(station="s000", value=2.0))
+
+        assert repository.get(station="s000").value == 1.0
+
+    def test_get_or_create_returns_the_existing_row_unchanged(self, repository):
+        created = repository.get_or_create(Reading(station="ignored", value=1.0), station="s000")
+        existing = repository.get_or_create(Reading(station="s000", value=2.0), station="s000")
+
+        assert existing.id == created.id
+        assert existing.value == 1.0
+        assert len(repository.f()) == 1
+
+    def test_get_or_create_needs_the_unique_columns(self, repository):
+        with pytest.raises(ValueError):
+            repository.get_or_create(Reading(station="s000", value=1.0))
+
+    def test_upsert_returns_the_stored_row(self, repository):
+        first = repository.upsert(
+            Reading(station="s000", value=1.0), index_elements=["station"], update_fields=["value"]
+        )
+        second = repository.upsert(
+            Reading(station="s000", value=2.0), index_elements=["station"], update_fields=["value"]
+        )
+
+        assert second.id == first.id
+        assert second.value == 2.0
+
+
+def test_get_or_create_is_race_free_across_threads(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"timeout": 30})
+    Reading.__table__.create(engine)
+
+    def get_or_create(attempt: int) -> tuple[str, int]:
+        station = f"s{attempt % 5}"
+        with Session(engine) as session:
+            reading = ReadingRepository(session).get_or_create(
+                Reading(station=station, value=float(attempt)), station=station
+            )
+            return station, reading.id
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(get_or_create, range(400)))
+
+    ids_per_station: dict[str, set[int]] = {}
+    for station, reading_id in results:
+        ids_per_station.setdefault(station, set()).add(reading_id)
+    assert all(len(ids) == 1 for ids in ids_per_station.values())
+    with Session(engine) as session:
+        assert len(ReadingRepository(session).f()) == 5
+    engine.dispose()
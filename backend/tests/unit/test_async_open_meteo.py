@@ -0,0 +1,133 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from openmeteo_requests import OpenMeteoRequestsError
+
+from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
+from src.domain.services.priority import Priority
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+from src.infrastructure.services.open_meteo import OpenMeteoAdapter
+from tests.mocks.mock_open_meteo import fake_location
+
+
+def adapter_with_fake_upstream(
+    mocker, fail_once: set[datetime.date]
+) -> tuple[AsyncOpenMeteoAdapter, list[dict]]:
+    adapter = AsyncOpenMeteoAdapter(client=httpx.AsyncClient(), retry_backoff=0)
+    calls: list[dict] = []
+
+    async def fetch_chunk(coordinates, start, end, variables):
+        calls.append(OpenMeteoAdapter._params(coordinates, start, end, variables))
+        if start in fail_once:
+            fail_once.discard(start)
+            raise httpx.ConnectError("flaky")
+        return [
+            OpenMeteoAdapter._to_frame(fake_location(coordinate.latitude, start, end), variables)
+            for coordinate in coordinates
+        ]
+
+    mocker.patch.object(adapter, "_fetch_chunk", side_effect=fetch_chunk)
+    return adapter, calls
+
+
+def test_get_stitches_chunks_and_retries_only_failed(mocker):
+    adapter, calls = adapter_with_fake_upstream(mocker, fail_once={datetime.date(2020, 1, 1)})
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.datetime(2019, 12, 31),
+        end=datetime.datetime(2020, 1, 1),
+    )
+
+    result = asyncio.run(adapter.get(options))
+
+    assert len(result.series) == 2 * 24
+    assert result.data[0].timestamp == datetime.datetime(2019, 12, 31)
+    assert sorted(call["start_date"] for call in calls) == [
+        "2019-12-31",
+        "2020-01-01",
+        "2020-01-01",
+    ]
+
+
+def test_get_many_groups_locations_by_date_window(mocker):
+    adapter, calls = adapter_with_fake_upstream(mocker, fail_once=set())
+    options = [
+        WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=latitude, longitude=0.0),
+            start=datetime.date(2020, 1, 1),
+            end=datetime.date(2020, 1, 2),
+        )
+        for latitude in (10.0, 20.0)
+    ]
+
+    results = asyncio.run(adapter.get_many(options))
+
+    assert [call["latitude"] for call in calls] == ["10.0,20.0"]
+    assert [result.data[0].temperature for result in results] == [10.0, 20.0]
+
+
+def test_get_raises_when_chunk_keeps_failing(mocker):
+    adapter = AsyncOpenMeteoAdapter(client=httpx.AsyncClient(), chunk_retries=1, retry_backoff=0)
+    mocker.patch.object(adapter, "_fetch_chunk", side_effect=httpx.ConnectError("down"))
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 2),
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(adapter.get(options))
+
+
+def test_rate_limited_responses_throttle_with_retry_after():
+    def upstream(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            429,
+            headers={"Retry-After": "30"},
+            json={"error": True, "reason": "Minutely API request limit exceeded"},
+        )
+
+    budget = AsyncMock()
+    adapter = AsyncOpenMeteoAdapter(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)),
+        chunk_retries=0,
+        budget=budget,
+    )
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 2),
+    )
+
+    with pytest.raises(OpenMeteoRequestsError):
+        asyncio.run(adapter.get(options))
+
+    budget.acquire.assert_awaited_once_with(1.0, Priority.INTERACTIVE)
+    budget.throttle.assert_awaited_once_with(30.0)
+
+
+@pytest.mark.parametrize("status, calls", [(503, 2), (400, 1)])
+def test_only_server_errors_are_retried(status, calls):
+    requests = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status, json={"error": True, "reason": "nope"})
+
+    adapter = AsyncOpenMeteoAdapter(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)),
+        chunk_retries=1,
+        retry_backoff=0,
+    )
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 2),
+    )
+
+    with pytest.raises((httpx.HTTPStatusError, OpenMeteoRequestsError)):
+        asyncio.run(adapter.get(options))
+    assert len(requests) == calls
@@ -0,0 +1,108 @@
+import asyncio
+import datetime
+from unittest.mock import AsyncMock
+
+import httpx
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from openmeteo_requests import OpenMeteoRequestsError
+from openmeteo_sdk.Variable import Variable
+
+from benchmarks.fake_open_meteo import FakeArchiveConfig, create_app
+from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
+from src.infrastructure.services.async_open_meteo import AsyncOpenMeteoAdapter
+
+
+def adapter_for(config: FakeArchiveConfig, **kwargs) -> AsyncOpenMeteoAdapter:
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(config)), base_url="http://fake"
+    )
+    adapter = AsyncOpenMeteoAdapter(client=client, retry_backoff=0, **kwargs)
+    adapter.url = "http://fake/v1/archive"
+    return adapter
+
+
+def options(start: int, end: int, latitude: float = 52.52) -> WeatherQueryOptions:
+    return WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=latitude, longitude=13.41),
+        start=datetime.date(2020, 1, start),
+        end=datetime.date(2020, 1, end),
+    )
+
+
+def test_responses_parse_like_upstream():
+    client = TestClient(create_app())
+
+    response = client.get(
+        "/v1/archive",
+        params={
+            "latitude": "52.52,48.14",
+            "longitude": "13.41,11.58",
+            "start_date": "2020-01-01",
+            "end_date": "2020-01-02",
+            "hourly": ["temperature_2m", "precipitation"],
+            "format": "flatbuffers",
+        },
+    )
+
+    first, second = AsyncOpenMeteoAdapter._parse(response.content)
+    hourly = first.Hourly()
+    assert (round(first.Latitude(), 4), round(second.Latitude(), 4)) == (52.5, 48.1)
+    assert hourly.Time() == int(datetime.datetime(2020, 1, 1, tzinfo=datetime.UTC).timestamp())
+    assert (hourly.TimeEnd() - hourly.Time()) // hourly.Interval() == 48
+    assert [hourly.Variables(index).Variable() for index in range(2)] == [
+        Variable.temperature,
+        Variable.precipitation,
+    ]
+    assert hourly.Variables(0).ValuesAsNumpy().shape == (48,)
+
+
+def test_series_are_deterministic_and_independent_of_the_window():
+    adapter = adapter_for(FakeArchiveConfig())
+
+    whole = asyncio.run(adapter.get(options(1, 4)))
+    part = asyncio.run(adapter.get(options(3, 4)))
+
+    assert len(whole.series) == 4 * 24
+    assert np.array_equal(whole.series.temperature[48:], part.series.temperature)
+    assert whole.series.timestamps[0] == np.datetime64("2020-01-01T00:00:00")
+
+
+def test_full_adapter_batches_locations_through_the_fake():
+    adapter = adapter_for(FakeArchiveConfig(latency=0.01))
+
+    results = asyncio.run(adapter.get_many([options(1, 2, 10.0), options(1, 2, -40.0)]))
+
+    assert [len(result.series) for result in results] == [48, 48]
+    assert results[0].series.temperature.mean() > results[1].series.temperature.mean()
+
+
+def test_injected_rate_limits_throttle_the_budget():
+    budget = AsyncMock()
+    adapter = adapter_for(
+        FakeArchiveConfig(rate_limit_rate=1.0, retry_after=7), chunk_retries=0, budget=budget
+    )
+
+    with pytest.raises(OpenMeteoRequestsError):
+        asyncio.run(adapter.get(options(1, 1)))
+
+    budget.throttle.assert_awaited_once_with(7.0)
+
+
+def test_calls_beyond_the_minute_limit_are_rejected(mocker):
+    mocker.patch("benchmarks.fake_open_meteo.time.time", return_value=600.0)
+    client = TestClient(create_app(FakeArchiveConfig(calls_per_minute=2)))
+    params = {
+        "latitude": "52.52",
+        "longitude": "13.41",
+        "start_date": "2020-01-01",
+        "end_date": "2020-01-01",
+        "hourly": "temperature_2m",
+        "format": "flatbuffers",
+    }
+
+    statuses = [client.get("/v1/archive", params=params).status_code for _ in range(3)]
+
+    assert statuses[2] == 429
+    assert client.get("/v1/archive", params={**params, "hourly": "snow"}).status_code == 400
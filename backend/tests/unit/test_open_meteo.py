@@ -1,7 +1,16 @@
 import datetime
+from unittest.mock import Mock
 
+import numpy as np
+import pandas as pd
+import pytest
+from openmeteo_requests import OpenMeteoRequestsError
+
+from src.core.exceptions import UpstreamBudgetExhausted
 from src.domain.entities.weather import WeatherCoordinate, WeatherQueryOptions
-from src.infrastructure.services.open_meteo import OpenMeteoAdapter
+from src.domain.services.priority import Priority, backfill
+from src.infrastructure.services.open_meteo import OpenMeteoAdapter, transient
+from tests.mocks.mock_open_meteo import FakeHourly, FakeLocation, MockOpenMeteoClient
 
 
 def test_get_data():
@@ -20,4 +29,231 @@ def test_get_data():
     assert abs(response.data[0].temperature - 3.67) < 0.1
 
 
-# def
+def test_chunks_split_at_year_boundaries():
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.datetime(2019, 6, 1),
+        end=datetime.datetime(2021, 3, 1),
+    )
+
+    chunks = OpenMeteoAdapter._chunks(options.start.date(), options.end.date())
+
+    assert chunks == [
+        (datetime.date(2019, 6, 1), datetime.date(2019, 12, 31)),
+        (datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)),
+        (datetime.date(2021, 1, 1), datetime.date(2021, 3, 1)),
+    ]
+
+
+def test_fetch_stitches_chunks_in_order_and_retries_only_failed(mocker):
+    adapter = OpenMeteoAdapter(max_workers=3, chunk_retries=1)
+    calls: list[datetime.date] = []
+    failed_once: set[datetime.date] = set()
+
+    def fetch_chunk(coordinates, start, end, variables):
+        calls.append(start)
+        if start.year == 2020 and start not in failed_once:
+            failed_once.add(start)
+            raise ConnectionError("flaky")
+        return [pd.DataFrame({"date": [pd.Timestamp(start)], "temperature_2m": [start.year]})]
+
+    mocker.patch.object(adapter, "_fetch_chunk", side_effect=fetch_chunk)
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2019, 1, 1),
+        end=datetime.date(2021, 12, 31),
+    )
+
+    frame = adapter.fetch(options)
+
+    assert frame["temperature_2m"].tolist() == [2019, 2020, 2021]
+    assert sorted(calls) == [
+        datetime.date(2019, 1, 1),
+        datetime.date(2020, 1, 1),
+        datetime.date(2020, 1, 1),
+        datetime.date(2021, 1, 1),
+    ]
+
+
+def test_fetch_raises_when_chunk_keeps_failing(mocker):
+    adapter = OpenMeteoAdapter(max_workers=2, chunk_retries=1)
+    mocker.patch.object(adapter, "_fetch_chunk", side_effect=ConnectionError("down"))
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2019, 1, 1),
+        end=datetime.date(2020, 12, 31),
+    )
+
+    with pytest.raises(ConnectionError):
+        adapter.fetch(options)
+
+
+def test_fetch_many_groups_locations_by_date_window():
+    adapter = OpenMeteoAdapter(max_workers=2, batch_size=2)
+    adapter.openmeteo = MockOpenMeteoClient()
+    january = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 31))
+    february = (datetime.date(2020, 2, 1), datetime.date(2020, 2, 2))
+    options = [
+        WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=latitude, longitude=0.0), start=start, end=end
+        )
+        for latitude, (start, end) in [
+            (10.0, january),
+            (20.0, february),
+            (30.0, january),
+            (40.0, january),
+        ]
+    ]
+
+    results = adapter.get_many(options)
+
+    # january: two batches (10,30) and (40); february: one batch (20)
+    assert sorted(call["latitude"] for call in adapter.openmeteo.calls) == [
+        "10.0,30.0",
+        "20.0",
+        "40.0",
+    ]
+    assert [result.coordinate.latitude for result in results] == [10.0, 20.0, 30.0, 40.0]
+    assert [result.data[0].temperature for result in results] == [10.0, 20.0, 30.0, 40.0]
+    assert [len(result.data) for result in results] == [31 * 24, 2 * 24, 31 * 24, 31 * 24]
+
+
+def test_map_builds_points_from_response_arrays():
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 1),
+    )
+    values = np.array([1.5, 2.5, 3.5], dtype=np.float32)
+    location = FakeLocation(FakeHourly(start=1577836800, values=values))
+
+    result = OpenMeteoAdapter.map(OpenMeteoAdapter._to_frame(location), options)
+
+    assert result.coordinate == options.coordinate
+    assert [point.timestamp for point in result.data] == [
+        datetime.datetime(2020, 1, 1, hour) for hour in range(3)
+    ]
+    assert [point.temperature for point in result.data] == [1.5, 2.5, 3.5]
+
+
+def test_a_window_fetches_the_variables_of_all_its_options_at_once():
+    adapter = OpenMeteoAdapter(max_workers=2)
+    adapter.openmeteo = MockOpenMeteoClient()
+    options = [
+        WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=latitude, longitude=0.0),
+            start=datetime.date(2020, 1, 1),
+            end=datetime.date(2020, 1, 1),
+            variables=variables,
+        )
+        for latitude, variables in [
+            (10.0, ("temperature",)),
+            (20.0, ("precipitation", "relative_humidity")),
+        ]
+    ]
+
+    results = adapter.get_many(options)
+
+    assert [call["hourly"] for call in adapter.openmeteo.calls] == [
+        ["temperature_2m", "precipitation", "relative_humidity_2m"]
+    ]
+    assert list(results[0].series.values) == ["temperature"]
+    assert list(results[1].series.values) == ["precipitation", "relative_humidity"]
+    assert results[1].series.values["precipitation"][0] == 20.0
+
+
+def test_fetch_many_requests_each_grid_cell_once():
+    adapter = OpenMeteoAdapter(max_workers=2)
+    adapter.openmeteo = MockOpenMeteoClient()
+    options = [
+        WeatherQueryOptions(
+            coordinate=WeatherCoordinate(latitude=latitude, longitude=0.02),
+            start=datetime.datetime(2020, 1, 1, 6),
+            end=datetime.date(2020, 1, 1),
+        )
+        for latitude in (10.01, 9.98, 20.0)
+    ]
+
+    results = adapter.get_many(options)
+
+    assert [(call["latitude"], call["longitude"]) for call in adapter.openmeteo.calls] == [
+        ("10.0,20.0", "0.0,0.0")
+    ]
+    assert [len(result.data) for result in results] == [24, 24, 24]
+
+
+def test_cost_weights_locations_days_and_variables():
+    def params(locations: int, days: int) -> dict:
+        start = datetime.date(2020, 1, 1)
+        coordinates = [WeatherCoordinate(latitude=1.0, longitude=2.0)] * locations
+        return OpenMeteoAdapter._params(coordinates, start, start + datetime.timedelta(days - 1))
+
+    assert OpenMeteoAdapter._cost(params(1, 7)) == 1.0
+    assert OpenMeteoAdapter._cost(params(1, 28)) == 2.0
+    assert OpenMeteoAdapter._cost(params(3, 21)) == 4.5
+
+
+def test_budget_is_drawn_at_the_callers_priority_and_throttled_on_rate_limits():
+    budget = Mock()
+    adapter = OpenMeteoAdapter(max_workers=2, chunk_retries=0, budget=budget)
+    adapter.openmeteo = MockOpenMeteoClient()
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 28),
+    )
+
+    with backfill():
+        adapter.get(options)
+
+    budget.acquire.assert_called_once_with(2.0, Priority.BACKFILL)
+    budget.throttle.assert_not_called()
+
+    limited = OpenMeteoRequestsError(
+        {"error": True, "reason": "Minutely API request limit exceeded"}
+    )
+    adapter.openmeteo.weather_api = Mock(side_effect=OpenMeteoRequestsError("failed to request"))
+    adapter.openmeteo.weather_api.side_effect.__cause__ = limited
+    with pytest.raises(OpenMeteoRequestsError):
+        adapter.get(options)
+
+    assert budget.acquire.call_args.args == (2.0, Priority.INTERACTIVE)
+    budget.throttle.assert_called_once_with()
+
+
+def test_exhausted_budget_and_bad_requests_are_not_retried():
+    budget = Mock()
+    budget.acquire.side_effect = UpstreamBudgetExhausted("busy", retry_after=12.0)
+    adapter = OpenMeteoAdapter(max_workers=2, chunk_retries=2, budget=budget)
+    adapter.openmeteo = MockOpenMeteoClient()
+    options = WeatherQueryOptions(
+        coordinate=WeatherCoordinate(latitude=45.0, longitude=-122.0),
+        start=datetime.date(2020, 1, 1),
+        end=datetime.date(2020, 1, 2),
+    )
+
+    with pytest.raises(UpstreamBudgetExhausted):
+        adapter.get(options)
+    assert budget.acquire.call_count == 1
+
+    adapter = OpenMeteoAdapter(max_workers=2, chunk_retries=2)
+    adapter.openmeteo.weather_api = Mock(
+        side_effect=OpenMeteoRequestsError({"error": True, "reason": "Invalid date"})
+    )
+    with pytest.raises(OpenMeteoRequestsError):
+        adapter.get(options)
+    assert adapter.openmeteo.weather_api.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (ConnectionError("reset"), True),
+        (TimeoutError(), True),
+        (OpenMeteoRequestsError({"reason": "Hourly API request limit exceeded"}), True),
+        (OpenMeteoRequestsError({"reason": "Parameter 'hourly' is invalid"}), False),
+        (UpstreamBudgetExhausted("busy", retry_after=1.0), False),
+    ],
+)
+def test_transient_errors(error, retried):
+    assert transient(error) is retried